@@ -1,27 +1,84 @@
 """Common API dependencies."""
-from typing import Optional
-from fastapi import Depends, Query
+import time
+from typing import Dict, Optional
+from fastapi import Depends, HTTPException, Query
+from fastapi.concurrency import run_in_threadpool
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError, jwt
-from sqlalchemy.orm import Session
-from app.database import get_db
+from app.database import get_session_factory
 from app.config import settings
 from app.models.user import User
+from app.services.user_cache import CachedUser, user_cache
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl=f"{settings.API_V1_PREFIX}/auth/login", auto_error=False)
 
 
-async def get_current_user(token: Optional[str] = Depends(oauth2_scheme), db: Session = Depends(get_db)):
+def get_token_claims(token: Optional[str] = Depends(oauth2_scheme)) -> Optional[Dict]:
+    """Verified JWT claims, or None for anonymous requests and invalid tokens."""
     if not token:
         return None
     try:
-        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
-        email = payload.get("sub")
-        if email is None:
-            return None
-        return db.query(User).filter(User.email == email).first()
+        claims = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
     except JWTError:
         return None
+    return claims if claims.get("sub") else None
+
+
+def _load_user(session_factory, email: str) -> Optional[CachedUser]:
+    db = session_factory()
+    try:
+        user = db.query(User).filter(User.email == email).first()
+        return CachedUser.from_user(user) if user else None
+    finally:
+        db.close()
+
+
+async def resolve_user(claims: Dict, session_factory) -> Optional[CachedUser]:
+    user = user_cache.get(claims.get("jti"), claims["sub"])
+    if user is None:
+        user = await run_in_threadpool(_load_user, session_factory, claims["sub"])
+        if user is None:
+            return None
+        user_cache.put(claims.get("jti"), user)
+    return user if user.is_active else None
+
+
+async def get_current_user(claims: Optional[Dict] = Depends(get_token_claims),
+                           session_factory=Depends(get_session_factory)) -> Optional[CachedUser]:
+    # Anonymous requests never open a session; cached users skip the database entirely.
+    if claims is None:
+        return None
+    return await resolve_user(claims, session_factory)
+
+
+def _claims_fresh(claims: Dict) -> bool:
+    """Whether the token was issued within ``AUTH_CACHE_TTL_SECONDS``, the staleness the user cache allows anyway."""
+    issued_at = claims.get("iat")
+    return issued_at is not None and time.time() - issued_at < settings.AUTH_CACHE_TTL_SECONDS
+
+
+def require_role(*roles: str):
+    """Dependency allowing only the given roles.
+
+    The role is taken from the signed claims only within ``AUTH_CACHE_TTL_SECONDS``
+    of issue and while this process has seen no change to the user; otherwise
+    the user is resolved like ``get_current_user``, so role changes and
+    disabled accounts take effect within the cache TTL on every worker.
+    """
+    async def check(claims: Optional[Dict] = Depends(get_token_claims),
+                    session_factory=Depends(get_session_factory)) -> Dict:
+        if claims is None:
+            raise HTTPException(status_code=401, detail="Not authenticated")
+        role = claims.get("role")
+        if role is None or not _claims_fresh(claims) or user_cache.changed_since(claims["sub"], claims.get("iat")):
+            user = await resolve_user(claims, session_factory)
+            if user is None:
+                raise HTTPException(status_code=401, detail="Not authenticated")
+            role = user.role
+        if role not in roles:
+            raise HTTPException(status_code=403, detail="Insufficient permissions")
+        return claims
+    return check
 
 
 class PaginationParams:
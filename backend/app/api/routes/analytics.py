@@ -1,89 +1,237 @@
 """Predictive analytics endpoints."""
-from typing import Optional
-from fastapi import APIRouter, Depends, Query
+from datetime import date
+from typing import List, Optional
+import numpy as np
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from app.database import get_db
+from app.database import get_async_read_db, get_db, get_read_db, get_session_factory
+from app.responses import FastJSONResponse
+from app.executor import compute_executor
+from app.services import compute_tasks
 from app.models.sector import Sector
 from app.models.investment import SpecialEconomicZone
-from app.models.indicator import MacroeconomicIndicator
+from app.ml.forecast_engines import ENGINES
+from app.services.backtesting import BacktestService, check_models
+from app.services.clustering import InvestmentClusteringService
+from app.services.indicator_store import check_resample, indicator_store
+from app.services.job_queue import job_queue
 from app.services.predictive_analytics import PredictiveAnalyticsService
-from app.schemas.analytics import PortfolioOptimisationRequest
+from app.schemas.analytics import FDIScenarioRequest, PortfolioOptimisationRequest
 
 router = APIRouter(prefix="/analytics", tags=["Predictive Analytics"])
 
 
 @router.get("/dashboard-summary")
-def dashboard_summary(db: Session = Depends(get_db)):
+def dashboard_summary(db: Session = Depends(get_read_db)):
     """Aggregated dashboard KPI data."""
+    return PredictiveAnalyticsService(db).get_dashboard_summary()
+
+
+def _check_model(model: Optional[str]):
+    if model and model != "auto" and model not in ENGINES:
+        raise HTTPException(status_code=400, detail=f"Unknown model: {model}. Valid: {['auto'] + list(ENGINES)}")
+
+
+@router.get("/fdi-forecast/sectors")
+def fdi_forecast_by_sector(horizon: int = Query(24, ge=1, le=60), confidence: float = Query(0.95, gt=0, lt=1),
+                           model: Optional[str] = None, columnar: bool = False, db: Session = Depends(get_read_db)):
+    """Investment forecasts for every sector, fitted in parallel."""
+    _check_model(model)
     service = PredictiveAnalyticsService(db)
-    return service.get_dashboard_summary()
+    return FastJSONResponse(service.forecast_sectors(horizon, confidence, columnar=columnar, model=model))
 
 
 @router.get("/fdi-forecast")
-def fdi_forecast(sector: Optional[str] = None, horizon: int = Query(24, ge=1, le=60), db: Session = Depends(get_db)):
-    """FDI forecast with confidence intervals."""
+def fdi_forecast(sector: Optional[str] = None, indicator: Optional[str] = None,
+                 horizon: int = Query(24, ge=1, le=60), confidence: float = Query(0.95, gt=0, lt=1),
+                 model: Optional[str] = None, columnar: bool = False, db: Session = Depends(get_read_db)):
+    """FDI forecast with confidence intervals, per sector or indicator (``columnar`` returns arrays per field)."""
+    _check_model(model)
+    if sector and indicator:
+        raise HTTPException(status_code=400, detail="Pass either sector or indicator, not both")
     service = PredictiveAnalyticsService(db)
     sector_id = None
     if sector:
         s = db.query(Sector).filter(Sector.code == sector.upper()).first()
-        sector_id = s.id if s else None
-    return service.forecast_fdi_trends(sector_id, horizon)
+        if not s:
+            raise HTTPException(status_code=404, detail="Sector not found")
+        sector_id = s.id
+    return FastJSONResponse(service.forecast_fdi_trends(sector_id, horizon, confidence, columnar=columnar,
+                                                        indicator=indicator, model=model))
+
+
+def _check_resample(freq: Optional[str], how: str = "last"):
+    try:
+        check_resample(freq, how)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+
+
+def _driver_model(service: PredictiveAnalyticsService, target: str, frequency: str):
+    _check_resample(frequency)
+    try:
+        return service.driver_model(target, frequency)
+    except ValueError as exc:
+        raise HTTPException(status_code=404, detail=str(exc))
+
+
+@router.get("/fdi-drivers")
+def fdi_drivers(target: str = "fdi_inflow", frequency: str = "YE", db: Session = Depends(get_read_db)):
+    """Macro drivers of FDI ranked by their fitted regression coefficients."""
+    return _driver_model(PredictiveAnalyticsService(db), target, frequency).summary()
+
+
+@router.post("/fdi-forecast/scenario")
+def fdi_scenario(request: FDIScenarioRequest, db: Session = Depends(get_read_db)):
+    """Baseline vs. scenario FDI forecast with driver indicators set to given levels."""
+    model = _driver_model(PredictiveAnalyticsService(db), request.target, request.frequency)
+    try:
+        return {**model.forecast(request.horizon, request.drivers), "target": request.target,
+                "r_squared": round(model.r_squared, 4)}
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+
+
+@router.get("/backtests")
+def backtest_results(indicator: Optional[str] = None, model: Optional[str] = None,
+                     horizon: Optional[int] = Query(None, ge=1), db: Session = Depends(get_db)):
+    """Stored rolling-origin MAPE/MASE/coverage per forecast model and indicator."""
+    return BacktestService(db).results(indicator, model, horizon)
+
+
+@router.post("/backtests/run", status_code=202)
+def run_backtests(indicator: Optional[List[str]] = Query(None), model: Optional[List[str]] = Query(None),
+                  horizon: int = Query(1, ge=1, le=12), confidence: float = Query(0.8, gt=0, lt=1),
+                  force: bool = False, db: Session = Depends(get_db)):
+    """Queue backtests of forecast models on indicator series whose data changed since the last run."""
+    try:
+        check_models(model)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    job, deduplicated = job_queue.submit(db, "backtests", {"indicators": indicator, "models": model,
+                                                           "horizon": horizon, "confidence": confidence,
+                                                           "force": force})
+    return {**job_queue.describe(job), "deduplicated": deduplicated}
 
 
 @router.get("/sector-risk-return")
-def sector_risk_return(db: Session = Depends(get_db)):
-    """Sector risk-return profiles."""
+def sector_risk_return(group: str = Query("sector", pattern="^(sector|province)$"), columnar: bool = False,
+                       db: Session = Depends(get_read_db)):
+    """Sector (or province) risk-return profiles with Sharpe, Sortino and downside deviation."""
     service = PredictiveAnalyticsService(db)
-    return service.compute_sector_risk_return()
+    if group == "province":
+        return service.compute_province_risk_return(columnar)
+    return service.compute_sector_risk_return(columnar)
+
+
+async def _portfolio_inputs(service: PredictiveAnalyticsService, db: Session):
+    metrics = await run_in_threadpool(service.compute_sector_risk_return)
+    inputs = await run_in_threadpool(service.portfolio_inputs, metrics) if metrics else None
+    db.close()
+    return metrics, inputs
 
 
 @router.post("/portfolio-optimisation")
-def portfolio_optimisation(request: PortfolioOptimisationRequest, db: Session = Depends(get_db)):
+async def portfolio_optimisation(request: PortfolioOptimisationRequest, db: Session = Depends(get_read_db)):
     """Optimize portfolio allocation across sectors."""
     service = PredictiveAnalyticsService(db)
-    return service.optimise_portfolio_allocation(request.total_budget, request.risk_tolerance)
+    metrics, inputs = await _portfolio_inputs(service, db)
+    if not metrics:
+        return service.build_allocation_response(metrics, None, request.total_budget)
+    result = await compute_executor.run(compute_tasks.optimise_portfolio, *inputs, request.risk_tolerance)
+    return service.build_allocation_response(metrics, result, request.total_budget)
 
 
-@router.get("/investment-patterns")
-def investment_patterns(db: Session = Depends(get_db)):
-    """Investment clustering patterns."""
+@router.get("/efficient-frontier")
+async def efficient_frontier(points: int = Query(25, ge=2, le=200), db: Session = Depends(get_read_db)):
+    """Minimum-risk sector portfolios across the range of expected returns."""
     service = PredictiveAnalyticsService(db)
-    return service.detect_investment_patterns()
+    metrics, inputs = await _portfolio_inputs(service, db)
+    if not metrics:
+        return {"sectors": [], "points": []}
+    frontier = await compute_executor.run(compute_tasks.efficient_frontier, *inputs, points)
+    return {"sectors": [m["sector_code"] for m in metrics], "points": frontier}
+
+
+@router.get("/sector-correlations")
+def sector_correlations(db: Session = Depends(get_read_db)):
+    """Ledoit-Wolf shrunk correlation of sector capital growth."""
+    estimate = PredictiveAnalyticsService(db).sector_correlation()
+    return {**estimate, "matrix": estimate["matrix"].tolist()}
+
+
+@router.get("/investment-patterns")
+def investment_patterns(db: Session = Depends(get_read_db), session_factory=Depends(get_session_factory)):
+    """Investment clustering patterns from the current model; queues the first fit when none is stored yet."""
+    patterns = PredictiveAnalyticsService(db).detect_investment_patterns()
+    if patterns and InvestmentClusteringService(db).current_model()[0] is None:
+        writer = session_factory()
+        try:
+            job_queue.submit(writer, "investment_clusters", {"refit": False})
+        finally:
+            writer.close()
+    return patterns
+
+
+@router.post("/investment-patterns/refresh", status_code=202)
+def refresh_investment_patterns(refit: bool = False, db: Session = Depends(get_db)):
+    """Queue assignment of new or edited investments to patterns (``refit`` forces a full refit)."""
+    job, deduplicated = job_queue.submit(db, "investment_clusters", {"refit": refit})
+    return {**job_queue.describe(job), "deduplicated": deduplicated}
 
 
 @router.get("/trend-decomposition")
-def trend_decomposition(indicator: str = Query("fdi_inflow"), db: Session = Depends(get_db)):
+def trend_decomposition(indicator: str = Query("fdi_inflow"), start: Optional[date] = None, end: Optional[date] = None,
+                        freq: Optional[str] = None, how: str = "last", db: Session = Depends(get_read_db)):
     """Decompose indicator trends into components."""
+    _check_resample(freq, how)
     service = PredictiveAnalyticsService(db)
-    return service.get_trend_decomposition(indicator)
+    return service.get_trend_decomposition(indicator, start, end, freq, how)
 
 
 @router.get("/sectors")
-def list_sectors(db: Session = Depends(get_db)):
+async def list_sectors(db: AsyncSession = Depends(get_async_read_db)):
     """List all sectors."""
     return [{"id": str(s.id), "name": s.name, "code": s.code, "description": s.description,
              "avg_return_rate": s.avg_return_rate, "risk_score": s.risk_score,
              "growth_rate_5yr": s.growth_rate_5yr, "contribution_to_gdp": s.contribution_to_gdp,
              "employment_multiplier": s.employment_multiplier, "priority_sector": s.priority_sector}
-            for s in db.query(Sector).all()]
+            for s in await db.scalars(select(Sector))]
 
 
 @router.get("/sez")
-def list_sez(db: Session = Depends(get_db)):
+async def list_sez(db: AsyncSession = Depends(get_async_read_db)):
     """List all Special Economic Zones."""
     return [{"id": str(s.id), "name": s.name, "location_province": s.location_province,
              "total_area_hectares": s.total_area_hectares, "occupied_percentage": s.occupied_percentage,
              "incentive_package": s.incentive_package, "target_sectors": s.target_sectors,
              "total_investment_attracted": s.total_investment_attracted, "total_jobs_created": s.total_jobs_created}
-            for s in db.query(SpecialEconomicZone).all()]
+            for s in await db.scalars(select(SpecialEconomicZone))]
 
 
 @router.get("/macro-indicators")
-def list_macro_indicators(indicator: Optional[str] = None, db: Session = Depends(get_db)):
-    """List macroeconomic indicators."""
-    query = db.query(MacroeconomicIndicator)
-    if indicator:
-        query = query.filter(MacroeconomicIndicator.indicator_name == indicator)
-    results = query.order_by(MacroeconomicIndicator.period).all()
-    return [{"id": str(r.id), "indicator_name": r.indicator_name, "value": r.value,
-             "period": str(r.period), "source": r.source, "unit": r.unit} for r in results]
+def list_macro_indicators(indicator: Optional[List[str]] = Query(None), start: Optional[date] = None,
+                          end: Optional[date] = None, freq: Optional[str] = None, how: str = "last",
+                          format: str = Query("records", pattern="^(records|wide)$"), db: Session = Depends(get_read_db)):
+    """List macroeconomic indicators, optionally clipped to a date range and resampled (``freq`` ME/QE/YE).
+
+    ``format=wide`` returns one value array per indicator aligned on a shared period axis.
+    """
+    _check_resample(freq, how)
+    if format == "records" and not freq:
+        rows = indicator_store.records(db, indicator, start, end)
+        return FastJSONResponse([{"id": r.id, "indicator_name": r.indicator_name, "value": r.value,
+                                  "period": str(r.period.date()), "source": r.source, "unit": r.unit}
+                                 for r in rows.itertuples(index=False)])
+    wide = indicator_store.wide(db, indicator, start, end, freq, how)
+    periods = wide.index.strftime("%Y-%m-%d").tolist()
+    if format == "wide":  # NaN serialises as null
+        return FastJSONResponse({"periods": periods, "frequency": freq,
+                                 "indicators": {name: wide[name].to_numpy() for name in wide.columns}})
+    columns = {name: [None if np.isnan(v) else float(v) for v in wide[name].to_numpy()] for name in wide.columns}
+    return FastJSONResponse([{"indicator_name": name, "period": period, "value": value}
+                             for period, *values in zip(periods, *columns.values())
+                             for name, value in zip(columns, values) if value is not None])
@@ -1,6 +1,8 @@
 """Authentication endpoints."""
+import uuid
 from datetime import datetime, timedelta
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 from jose import jwt
 from passlib.context import CryptContext
@@ -10,9 +12,14 @@ from app.config import settings
 from app.models.user import User
 from app.schemas.auth import UserCreate, UserLogin, UserResponse, Token
 from app.api.dependencies import get_current_user
+from app.executor import password_executor
+from app.services.rate_limit import TokenBucketLimiter
 
 router = APIRouter(prefix="/auth", tags=["Authentication"])
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+account_limiter = TokenBucketLimiter("login_account", settings.LOGIN_ATTEMPTS_PER_MINUTE_ACCOUNT,
+                                     settings.LOGIN_ATTEMPTS_PER_MINUTE_ACCOUNT)
+ip_limiter = TokenBucketLimiter("login_ip", settings.LOGIN_ATTEMPTS_PER_MINUTE_IP, settings.LOGIN_ATTEMPTS_PER_MINUTE_IP)
 
 
 def verify_password(plain: str, hashed: str) -> bool:
@@ -25,36 +32,57 @@ def get_password_hash(password: str) -> str:
 
 def create_access_token(data: dict) -> str:
     to_encode = data.copy()
-    expire = datetime.utcnow() + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
-    to_encode.update({"exp": expire})
+    now = datetime.utcnow()
+    expire = now + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
+    to_encode.update({"exp": expire, "iat": now, "jti": str(uuid.uuid4())})
     return jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
 
 
+def _check_login_rate(request: Request, email: str):
+    host = request.client.host if request.client else "unknown"
+    for limiter, key in ((ip_limiter, host), (account_limiter, email.lower())):
+        allowed, retry_after = limiter.acquire(key)
+        if not allowed:
+            raise HTTPException(status_code=429, detail="Too many login attempts, retry later",
+                                headers={"Retry-After": str(max(1, round(retry_after)))})
+
+
+def _find_user(db: Session, email: str):
+    return db.query(User).filter(User.email == email).first()
+
+
 @router.post("/register", response_model=UserResponse, status_code=201)
-def register(user_data: UserCreate, db: Session = Depends(get_db)):
+async def register(user_data: UserCreate, db: Session = Depends(get_db)):
     """Register a new user account."""
-    existing = db.query(User).filter(User.email == user_data.email).first()
+    existing = await run_in_threadpool(_find_user, db, user_data.email)
     if existing:
         raise HTTPException(status_code=400, detail="Email already registered")
+    hashed = await password_executor.run(get_password_hash, user_data.password, task="hash")
     user = User(
-        email=user_data.email, hashed_password=get_password_hash(user_data.password),
+        email=user_data.email, hashed_password=hashed,
         full_name=user_data.full_name, role=user_data.role, organization=user_data.organization,
     )
-    db.add(user)
-    db.commit()
-    db.refresh(user)
-    return user
+
+    def save():
+        db.add(user)
+        db.commit()
+        db.refresh(user)
+        return user
+
+    return await run_in_threadpool(save)
 
 
 @router.post("/login", response_model=Token)
-def login(credentials: UserLogin, db: Session = Depends(get_db)):
+async def login(credentials: UserLogin, request: Request, db: Session = Depends(get_db)):
     """Authenticate and receive JWT token."""
-    user = db.query(User).filter(User.email == credentials.email).first()
-    if not user or not verify_password(credentials.password, user.hashed_password):
+    _check_login_rate(request, credentials.email)
+    user = await run_in_threadpool(_find_user, db, credentials.email)
+    if not user or not await password_executor.run(verify_password, credentials.password, user.hashed_password,
+                                                   task="verify"):
         raise HTTPException(status_code=401, detail="Invalid credentials")
     if not user.is_active:
         raise HTTPException(status_code=403, detail="Account is disabled")
-    token = create_access_token({"sub": user.email, "role": user.role})
+    token = create_access_token({"sub": user.email, "role": user.role, "uid": str(user.id)})
     return {"access_token": token, "token_type": "bearer"}
 
 
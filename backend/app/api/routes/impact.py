@@ -1,17 +1,27 @@
 """Impact calculator endpoints."""
-from fastapi import APIRouter, Depends
+import asyncio
+import os
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.concurrency import run_in_threadpool
 from fastapi.responses import StreamingResponse
+from starlette.background import BackgroundTask
 from pydantic import BaseModel, Field
-from typing import Optional, Dict
+from typing import Optional, Dict, List
 from sqlalchemy.orm import Session
-import io
 
 from app.database import get_db
+from app.executor import compute_executor
+from app.models.investment import Investment
+from app.models.sector import Sector
+from app.services import compute_tasks
 from app.services.impact_calculator import InvestmentImpactCalculator
-from app.services.report_generator import ReportGenerator
+from app.services.report_generator import iter_file, remove_file
+from app.services.report_store import get_report, report_key, save_report
 
 router = APIRouter(prefix="/impact", tags=["Impact Calculator"])
 
+XLSX_MEDIA_TYPE = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+
 
 class JobCreationRequest(BaseModel):
     investment_amount: float = Field(gt=0)
@@ -31,6 +41,7 @@ class MonteCarloRequest(BaseModel):
     sector: str
     num_simulations: int = 10000
     scenario: str = "base"
+    seed: Optional[int] = None  # results are cached only for seeded runs
 
 
 class SEZRequest(BaseModel):
@@ -52,6 +63,22 @@ class ComprehensiveRequest(BaseModel):
     province: str = "Harare"
     is_sez: bool = False
     sez_id: Optional[str] = None
+    seed: Optional[int] = None
+
+
+class PortfolioExportRequest(BaseModel):
+    investment_ids: Optional[List[str]] = None
+    sector: Optional[str] = None
+    status: Optional[str] = None
+    province: Optional[str] = None
+    min_amount: Optional[float] = None
+    max_amount: Optional[float] = None
+    num_simulations: int = Field(default=1000, gt=0, le=10000)
+    seed: Optional[int] = None
+
+
+class PortfolioPdfRequest(PortfolioExportRequest):
+    bundle: str = "zip"  # zip: one PDF per investment; merged: a single PDF
 
 
 @router.post("/job-creation")
@@ -69,11 +96,11 @@ def calculate_gdp(request: GDPRequest, db: Session = Depends(get_db)):
 
 
 @router.post("/monte-carlo")
-def run_monte_carlo(request: MonteCarloRequest, db: Session = Depends(get_db)):
+async def run_monte_carlo(request: MonteCarloRequest):
     """Run Monte Carlo simulation for probabilistic impact."""
-    calc = InvestmentImpactCalculator(db)
-    result = calc.run_monte_carlo_simulation(request.investment_amount, request.sector, request.num_simulations, request.scenario)
-    return {"statistics": result.get("statistics", {}), "outcome_count": len(result.get("outcomes", []))}
+    return await compute_executor.run(
+        compute_tasks.monte_carlo_summary, request.investment_amount, request.sector,
+        request.num_simulations, request.scenario, request.seed)
 
 
 @router.post("/sez-incentives")
@@ -90,12 +117,62 @@ def generate_roi(request: ROIRequest, db: Session = Depends(get_db)):
     return calc.generate_roi_timeline(request.investment_amount, request.sector, request.revenue_assumptions)
 
 
+async def _report_kwargs(request: ComprehensiveRequest, db: Session) -> Dict:
+    """Resolve DB-backed inputs, then release the session before heavy compute starts."""
+    sez = None
+    if request.is_sez and request.sez_id:
+        sez = await run_in_threadpool(InvestmentImpactCalculator(db).get_sez_snapshot, request.sez_id)
+    db.close()
+    return {"investment_amount": request.investment_amount, "sector": request.sector,
+            "province": request.province, "is_sez": request.is_sez, "sez_id": request.sez_id, "sez": sez,
+            "seed": request.seed}
+
+
+async def _build_report(request: ComprehensiveRequest, db: Session, keep: bool = True):
+    """Return ``(report_id, report)``, reusing a stored report for identical seeded requests.
+
+    With ``keep=False`` unseeded reports are not stored: nothing could look them up again.
+    """
+    kwargs = await _report_kwargs(request, db)
+    key = report_key(kwargs)
+    report = get_report(key) if key else None
+    if report is None:
+        report = await compute_executor.run(compute_tasks.comprehensive_report, **kwargs)
+        if key or keep:
+            key = save_report(kwargs, report)
+    return key, report
+
+
+def _stored_report(report_id: str) -> Dict:
+    report = get_report(report_id)
+    if report is None:
+        raise HTTPException(status_code=404, detail="Report not found or expired")
+    return report
+
+
+async def _export_response(report: Dict, fmt: str) -> StreamingResponse:
+    """Render in the compute pool to a temp file, then stream it in chunks."""
+    path = await compute_executor.run(compute_tasks.write_impact_export, report, fmt)
+    media_type = "application/pdf" if fmt == "pdf" else XLSX_MEDIA_TYPE
+    return _file_response(path, media_type, f"impact_report.{fmt}")
+
+
+def _file_response(path: str, media_type: str, filename: str) -> StreamingResponse:
+    return StreamingResponse(iter_file(path), media_type=media_type, background=BackgroundTask(remove_file, path),
+                             headers={"Content-Disposition": f"attachment; filename={filename}"})
+
+
 @router.post("/comprehensive-report")
-def comprehensive_report(request: ComprehensiveRequest, db: Session = Depends(get_db)):
+async def comprehensive_report(request: ComprehensiveRequest, db: Session = Depends(get_db)):
     """Generate comprehensive impact assessment."""
-    calc = InvestmentImpactCalculator(db)
-    return calc.generate_comprehensive_report(
-        request.investment_amount, request.sector, request.province, request.is_sez, request.sez_id)
+    report_id, report = await _build_report(request, db)
+    return {"report_id": report_id, **report}
+
+
+@router.get("/reports/{report_id}")
+def get_comprehensive_report(report_id: str):
+    """Fetch a previously generated comprehensive report."""
+    return {"report_id": report_id, **_stored_report(report_id)}
 
 
 @router.get("/sector-benchmarks")
@@ -106,23 +183,92 @@ def sector_benchmarks(db: Session = Depends(get_db)):
 
 
 @router.post("/export/pdf")
-def export_pdf(request: ComprehensiveRequest, db: Session = Depends(get_db)):
+async def export_pdf(request: ComprehensiveRequest, db: Session = Depends(get_db)):
     """Export impact report as PDF."""
-    calc = InvestmentImpactCalculator(db)
-    data = calc.generate_comprehensive_report(request.investment_amount, request.sector, request.province)
-    gen = ReportGenerator()
-    pdf_bytes = gen.generate_impact_pdf(data)
-    return StreamingResponse(io.BytesIO(pdf_bytes), media_type="application/pdf",
-                           headers={"Content-Disposition": "attachment; filename=impact_report.pdf"})
+    _, report = await _build_report(request, db, keep=False)
+    return await _export_response(report, "pdf")
 
 
 @router.post("/export/excel")
-def export_excel(request: ComprehensiveRequest, db: Session = Depends(get_db)):
+async def export_excel(request: ComprehensiveRequest, db: Session = Depends(get_db)):
     """Export impact report as Excel."""
-    calc = InvestmentImpactCalculator(db)
-    data = calc.generate_comprehensive_report(request.investment_amount, request.sector, request.province)
-    gen = ReportGenerator()
-    excel_bytes = gen.generate_impact_excel(data)
-    return StreamingResponse(io.BytesIO(excel_bytes),
-                           media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-                           headers={"Content-Disposition": "attachment; filename=impact_report.xlsx"})
+    _, report = await _build_report(request, db, keep=False)
+    return await _export_response(report, "xlsx")
+
+
+@router.get("/reports/{report_id}/pdf")
+async def export_stored_pdf(report_id: str):
+    """Export a previously generated report as PDF without recomputing it."""
+    return await _export_response(_stored_report(report_id), "pdf")
+
+
+@router.get("/reports/{report_id}/excel")
+async def export_stored_excel(report_id: str):
+    """Export a previously generated report as Excel without recomputing it."""
+    return await _export_response(_stored_report(report_id), "xlsx")
+
+
+def _portfolio_investments(request: PortfolioExportRequest, db: Session) -> List[Dict]:
+    query = db.query(Investment, Sector.code).join(Sector, Investment.sector_id == Sector.id)
+    if request.investment_ids:
+        query = query.filter(Investment.id.in_(request.investment_ids))
+    if request.sector:
+        query = query.filter(Sector.code == request.sector.upper())
+    if request.status:
+        query = query.filter(Investment.status == request.status)
+    if request.province:
+        query = query.filter(Investment.province == request.province)
+    if request.min_amount:
+        query = query.filter(Investment.investment_amount_usd >= request.min_amount)
+    if request.max_amount:
+        query = query.filter(Investment.investment_amount_usd <= request.max_amount)
+    return [{
+        "id": inv.id, "project_name": inv.project_name, "investor_name": inv.investor_name, "sector": code,
+        "province": inv.province, "investment_amount_usd": inv.investment_amount_usd,
+    } for inv, code in query.order_by(Investment.investment_amount_usd.desc()).all()]
+
+
+@router.post("/export/portfolio/excel")
+async def export_portfolio_excel(request: PortfolioExportRequest, db: Session = Depends(get_db)):
+    """Export impact, Monte Carlo and year-by-year sheets for a filtered set of investments."""
+    investments = await run_in_threadpool(_portfolio_investments, request, db)
+    db.close()
+    if not investments:
+        raise HTTPException(status_code=404, detail="No investments match the filters")
+    path = await compute_executor.run(
+        compute_tasks.export_portfolio_excel, investments, request.num_simulations, request.seed)
+    return _file_response(path, XLSX_MEDIA_TYPE, "portfolio_impact_report.xlsx")
+
+
+async def _run_chunked(fn, investments: List[Dict], *args) -> List:
+    """Split ``investments`` into one contiguous chunk per compute worker and run them concurrently."""
+    size = -(-len(investments) // compute_executor.workers)
+    chunks = [investments[i:i + size] for i in range(0, len(investments), size)]
+    results = await asyncio.gather(*(compute_executor.run(fn, chunk, *args) for chunk in chunks),
+                                   return_exceptions=True)
+    errors = [r for r in results if isinstance(r, BaseException)]
+    if errors:
+        if fn is compute_tasks.render_portfolio_pdfs:
+            for _, path in (f for r in results if not isinstance(r, BaseException) for f in r):
+                os.unlink(path)
+        raise errors[0]
+    return [item for part in results for item in part]
+
+
+@router.post("/export/portfolio/pdf")
+async def export_portfolio_pdf(request: PortfolioPdfRequest, db: Session = Depends(get_db)):
+    """Render one PDF impact report per matching investment, as a ZIP or a single merged PDF."""
+    if request.bundle not in ("zip", "merged"):
+        raise HTTPException(status_code=400, detail="bundle must be 'zip' or 'merged'")
+    investments = await run_in_threadpool(_portfolio_investments, request, db)
+    db.close()
+    if not investments:
+        raise HTTPException(status_code=404, detail="No investments match the filters")
+    args = (request.num_simulations, request.seed)
+    if request.bundle == "merged":
+        reports = await _run_chunked(compute_tasks.portfolio_reports, investments, *args)
+        path = await compute_executor.run(compute_tasks.render_merged_pdf, reports)
+        return _file_response(path, "application/pdf", "portfolio_impact_reports.pdf")
+    files = await _run_chunked(compute_tasks.render_portfolio_pdfs, investments, *args)
+    path = await run_in_threadpool(compute_tasks.bundle_zip, files)
+    return _file_response(path, "application/zip", "portfolio_impact_reports.zip")
@@ -1,10 +1,11 @@
 """Investment CRUD endpoints."""
 from typing import Optional
 from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from sqlalchemy import func
+from sqlalchemy import func, select
 
-from app.database import get_db
+from app.database import get_async_read_db, get_db
 from app.models.investment import Investment
 from app.models.sector import Sector
 from app.schemas.investment import InvestmentCreate, InvestmentUpdate, InvestmentResponse, InvestmentListResponse
@@ -14,54 +15,60 @@ router = APIRouter(prefix="/investments", tags=["Investments"])
 
 
 @router.get("/stats/summary")
-def investment_stats(db: Session = Depends(get_db)):
+async def investment_stats(db: AsyncSession = Depends(get_async_read_db)):
     """Quick investment statistics."""
-    total = db.query(func.count(Investment.id)).scalar() or 0
-    total_amount = db.query(func.sum(Investment.investment_amount_usd)).scalar() or 0
-    active = db.query(func.count(Investment.id)).filter(Investment.status == "active").scalar() or 0
-    approved = db.query(func.count(Investment.id)).filter(Investment.status == "approved").scalar() or 0
-    inquiry = db.query(func.count(Investment.id)).filter(Investment.status == "inquiry").scalar() or 0
-    return {"total": total, "total_amount": total_amount, "active": active, "approved": approved, "inquiry": inquiry}
+    count = func.count(Investment.id)
+    row = (await db.execute(select(
+        count, func.sum(Investment.investment_amount_usd),
+        count.filter(Investment.status == "active"), count.filter(Investment.status == "approved"),
+        count.filter(Investment.status == "inquiry"),
+    ))).one()
+    total, total_amount, active, approved, inquiry = row
+    return {"total": total or 0, "total_amount": total_amount or 0, "active": active or 0, "approved": approved or 0,
+            "inquiry": inquiry or 0}
 
 
 @router.get("/by-sector")
-def investments_by_sector(db: Session = Depends(get_db)):
+async def investments_by_sector(db: AsyncSession = Depends(get_async_read_db)):
     """Investments grouped by sector."""
-    results = db.query(Sector.name, Sector.code, func.sum(Investment.investment_amount_usd), func.count(Investment.id)
-    ).join(Investment, Investment.sector_id == Sector.id).group_by(Sector.name, Sector.code).all()
+    results = await db.execute(select(Sector.name, Sector.code, func.sum(Investment.investment_amount_usd),
+                                      func.count(Investment.id)
+    ).join(Investment, Investment.sector_id == Sector.id).group_by(Sector.name, Sector.code))
     return [{"sector": r[0], "code": r[1], "total_amount": r[2] or 0, "count": r[3]} for r in results]
 
 
 @router.get("/by-province")
-def investments_by_province(db: Session = Depends(get_db)):
+async def investments_by_province(db: AsyncSession = Depends(get_async_read_db)):
     """Investments grouped by province."""
-    results = db.query(Investment.province, func.sum(Investment.investment_amount_usd), func.count(Investment.id)
-    ).group_by(Investment.province).all()
+    results = await db.execute(select(Investment.province, func.sum(Investment.investment_amount_usd),
+                                      func.count(Investment.id)
+    ).group_by(Investment.province))
     return [{"province": r[0] or "N/A", "total_amount": r[1] or 0, "count": r[2]} for r in results]
 
 
 @router.get("/", response_model=InvestmentListResponse)
-def list_investments(
+async def list_investments(
     sector: Optional[str] = None, status: Optional[str] = None, province: Optional[str] = None,
     min_amount: Optional[float] = None, max_amount: Optional[float] = None,
-    pagination: PaginationParams = Depends(), db: Session = Depends(get_db),
+    pagination: PaginationParams = Depends(), db: AsyncSession = Depends(get_async_read_db),
 ):
     """List investments with filtering and pagination."""
-    query = db.query(Investment)
+    query = select(Investment)
     if sector:
-        sec = db.query(Sector).filter(Sector.code == sector.upper()).first()
-        if sec:
-            query = query.filter(Investment.sector_id == sec.id)
+        sector_id = await db.scalar(select(Sector.id).where(Sector.code == sector.upper()))
+        if sector_id:
+            query = query.where(Investment.sector_id == sector_id)
     if status:
-        query = query.filter(Investment.status == status)
+        query = query.where(Investment.status == status)
     if province:
-        query = query.filter(Investment.province == province)
+        query = query.where(Investment.province == province)
     if min_amount:
-        query = query.filter(Investment.investment_amount_usd >= min_amount)
+        query = query.where(Investment.investment_amount_usd >= min_amount)
     if max_amount:
-        query = query.filter(Investment.investment_amount_usd <= max_amount)
-    total = query.count()
-    items = query.order_by(Investment.investment_amount_usd.desc()).offset(pagination.offset).limit(pagination.per_page).all()
+        query = query.where(Investment.investment_amount_usd <= max_amount)
+    total = await db.scalar(select(func.count()).select_from(query.subquery()))
+    items = (await db.scalars(query.order_by(Investment.investment_amount_usd.desc())
+                              .offset(pagination.offset).limit(pagination.per_page))).all()
     return {"items": items, "total": total, "page": pagination.page, "per_page": pagination.per_page}
 
 
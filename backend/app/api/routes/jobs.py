@@ -0,0 +1,102 @@
+"""Background job endpoints for long-running simulations and exports."""
+import asyncio
+import io
+import json
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.concurrency import run_in_threadpool
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session
+
+from app.database import get_db
+from app.models.job import Job
+from app.api.routes.impact import MonteCarloRequest, ComprehensiveRequest
+from app.services.job_queue import job_queue, TERMINAL_STATUSES
+
+router = APIRouter(prefix="/jobs", tags=["Background Jobs"])
+
+
+def _submit(db: Session, kind: str, params: dict) -> dict:
+    job, deduplicated = job_queue.submit(db, kind, params)
+    return {**job_queue.describe(job), "deduplicated": deduplicated}
+
+
+def _get_job(db: Session, job_id: str) -> Job:
+    job = db.query(Job).filter(Job.id == job_id).first()
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+
+@router.post("/monte-carlo", status_code=202)
+def submit_monte_carlo(request: MonteCarloRequest, db: Session = Depends(get_db)):
+    """Queue a Monte Carlo simulation."""
+    return _submit(db, "monte_carlo", request.model_dump())
+
+
+@router.post("/comprehensive-report", status_code=202)
+def submit_comprehensive_report(request: ComprehensiveRequest, db: Session = Depends(get_db)):
+    """Queue a comprehensive impact assessment."""
+    return _submit(db, "comprehensive_report", request.model_dump())
+
+
+@router.post("/export/pdf", status_code=202)
+def submit_export_pdf(request: ComprehensiveRequest, db: Session = Depends(get_db)):
+    """Queue a PDF impact report export."""
+    return _submit(db, "export_pdf", request.model_dump())
+
+
+@router.post("/export/excel", status_code=202)
+def submit_export_excel(request: ComprehensiveRequest, db: Session = Depends(get_db)):
+    """Queue an Excel impact report export."""
+    return _submit(db, "export_excel", request.model_dump())
+
+
+@router.get("/{job_id}")
+def get_job_status(job_id: str, db: Session = Depends(get_db)):
+    """Poll job status."""
+    return job_queue.describe(_get_job(db, job_id))
+
+
+@router.get("/{job_id}/events")
+async def stream_job_status(job_id: str, poll_interval: float = Query(0.5, ge=0.1, le=10)):
+    """Stream job status changes as server-sent events until the job finishes."""
+    def load():
+        db = job_queue.session_factory()
+        try:
+            job = db.query(Job).filter(Job.id == job_id).first()
+            return job_queue.describe(job) if job else None
+        finally:
+            db.close()
+
+    first = await run_in_threadpool(load)
+    if first is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+
+    async def events():
+        state, last_status = first, None
+        while True:
+            if state["status"] != last_status:
+                last_status = state["status"]
+                yield f"event: status\ndata: {json.dumps(jsonable_encoder(state))}\n\n"
+            if last_status in TERMINAL_STATUSES:
+                return
+            await asyncio.sleep(poll_interval)
+            state = await run_in_threadpool(load)
+
+    return StreamingResponse(events(), media_type="text/event-stream", headers={"Cache-Control": "no-cache"})
+
+
+@router.get("/{job_id}/result")
+def get_job_result(job_id: str, db: Session = Depends(get_db)):
+    """Fetch the result of a finished job (JSON or file download)."""
+    job = _get_job(db, job_id)
+    if job.status == "failed":
+        raise HTTPException(status_code=409, detail=f"Job failed: {job.error}")
+    if job.status != "succeeded":
+        raise HTTPException(status_code=409, detail=f"Job is {job.status}")
+    if job.result_blob is not None:
+        return StreamingResponse(io.BytesIO(job.result_blob), media_type=job.media_type,
+                                 headers={"Content-Disposition": f"attachment; filename={job.filename}"})
+    return job.result
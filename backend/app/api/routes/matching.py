@@ -4,26 +4,33 @@ from fastapi import APIRouter, Depends, HTTPException, Query
 from pydantic import BaseModel, Field
 from sqlalchemy.orm import Session
 
-from app.database import get_db
+from app.database import get_db, get_read_db
 from app.models.investor import InvestorProfile, InvestmentOpportunity
+from app.responses import FastJSONResponse
 from app.schemas.matching import InvestorProfileCreate, InquiryAnalysisRequest
 from app.services.matching_engine import InvestmentMatchingEngine
+from app.services.size_index import parse_size_range, range_overlaps
 
 router = APIRouter(prefix="/matching", tags=["Investment Matching"])
 
 
 @router.post("/investor-to-opportunities/{investor_id}")
-def match_investor(investor_id: str, top_n: int = Query(10, ge=1, le=50), db: Session = Depends(get_db)):
+def match_investor(investor_id: str, top_n: int = Query(10, ge=1, le=50), retrieval: str = "auto",
+                   size_overlap: bool = False, db: Session = Depends(get_db)):
     """Match investor to best opportunities."""
     engine = InvestmentMatchingEngine(db)
-    return engine.match_investor_to_opportunities(investor_id, top_n)
+    try:
+        return engine.match_investor_to_opportunities(investor_id, top_n, retrieval, size_overlap)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
 
 
 @router.post("/opportunity-to-investors/{opportunity_id}")
-def match_opportunity(opportunity_id: str, top_n: int = Query(10, ge=1, le=50), db: Session = Depends(get_db)):
+def match_opportunity(opportunity_id: str, top_n: int = Query(10, ge=1, le=50), size_overlap: bool = False,
+                      db: Session = Depends(get_db)):
     """Find best investors for an opportunity."""
     engine = InvestmentMatchingEngine(db)
-    return engine.match_opportunity_to_investors(opportunity_id, top_n)
+    return engine.match_opportunity_to_investors(opportunity_id, top_n, size_overlap)
 
 
 @router.post("/analyse-inquiry")
@@ -34,10 +41,10 @@ def analyse_inquiry(request: InquiryAnalysisRequest, db: Session = Depends(get_d
 
 
 @router.get("/similarity-network")
-def similarity_network(db: Session = Depends(get_db)):
-    """Get investment similarity network graph data."""
+def similarity_network(columnar: bool = False, db: Session = Depends(get_read_db)):
+    """Get investment similarity network graph data (``columnar`` returns node and edge arrays)."""
     engine = InvestmentMatchingEngine(db)
-    return engine.build_similarity_network()
+    return FastJSONResponse(engine.build_similarity_network(columnar))
 
 
 @router.get("/match-score/{investor_id}/{opportunity_id}")
@@ -54,14 +61,25 @@ def proactive_recommendations(db: Session = Depends(get_db)):
     return engine.get_proactive_recommendations()
 
 
+def _size_overlap(lo_column, hi_column, size_overlap: str):
+    try:
+        return range_overlaps(lo_column, hi_column, *parse_size_range(size_overlap))
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+
+
 @router.get("/investors")
-def list_investors(db: Session = Depends(get_db)):
-    """List all investor profiles."""
-    investors = db.query(InvestorProfile).all()
-    return [{"id": str(i.id), "company_name": i.company_name, "country_of_origin": i.country_of_origin,
+def list_investors(size_overlap: Optional[str] = None, db: Session = Depends(get_read_db)):
+    """List investor profiles, optionally only those whose range overlaps ``size_overlap`` ("min:max")."""
+    query = db.query(InvestorProfile)
+    if size_overlap:
+        query = query.filter(_size_overlap(InvestorProfile.investment_range_min, InvestorProfile.investment_range_max,
+                                           size_overlap))
+    investors = query.all()
+    return FastJSONResponse([{"id": str(i.id), "company_name": i.company_name, "country_of_origin": i.country_of_origin,
              "investor_type": i.investor_type, "sectors_of_interest": i.sectors_of_interest,
              "investment_range_min": i.investment_range_min, "investment_range_max": i.investment_range_max,
-             "risk_appetite": i.risk_appetite, "engagement_score": i.engagement_score} for i in investors]
+             "risk_appetite": i.risk_appetite, "engagement_score": i.engagement_score} for i in investors])
 
 
 @router.post("/investors", status_code=201)
@@ -87,13 +105,17 @@ def get_investor(investor_id: str, db: Session = Depends(get_db)):
 
 
 @router.get("/opportunities")
-def list_opportunities(db: Session = Depends(get_db)):
-    """List all investment opportunities."""
-    opps = db.query(InvestmentOpportunity).all()
-    return [{"id": str(o.id), "title": o.title, "description": o.description, "province": o.province,
+def list_opportunities(size_overlap: Optional[str] = None, db: Session = Depends(get_read_db)):
+    """List investment opportunities, optionally only those whose range overlaps ``size_overlap`` ("min:max")."""
+    query = db.query(InvestmentOpportunity)
+    if size_overlap:
+        query = query.filter(_size_overlap(InvestmentOpportunity.minimum_investment,
+                                           InvestmentOpportunity.maximum_investment, size_overlap))
+    opps = query.all()
+    return FastJSONResponse([{"id": str(o.id), "title": o.title, "description": o.description, "province": o.province,
              "minimum_investment": o.minimum_investment, "maximum_investment": o.maximum_investment,
              "expected_return_rate": o.expected_return_rate, "risk_level": o.risk_level,
-             "status": o.status, "tags": o.tags} for o in opps]
+             "status": o.status, "tags": o.tags} for o in opps])
 
 
 @router.get("/opportunities/{opportunity_id}")
@@ -1,5 +1,5 @@
 """Application configuration using pydantic-settings."""
-from typing import List
+from typing import List, Optional
 from pydantic_settings import BaseSettings
 
 
@@ -11,15 +11,58 @@ class Settings(BaseSettings):
 
     # Database (SQLite for local dev, PostgreSQL for production)
     DATABASE_URL: str = "sqlite:///./investiq_africa.db"
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_RECYCLE_SECONDS: int = 1800  # recycle connections before server-side idle timeouts
+    DATABASE_REPLICA_URL: Optional[str] = None  # read-only routes use it when set; falls back to the primary
+    REPLICA_STICKY_SECONDS: float = 5  # a client's reads stay on the primary this long after it writes
+    REPLICA_HEALTH_CHECK_SECONDS: float = 10
 
     # JWT Auth
     SECRET_KEY: str = "your-secret-key-change-in-production"
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 1440
+    AUTH_CACHE_TTL_SECONDS: float = 60  # resolved users are re-read from the database after this
+    PASSWORD_HASH_WORKERS: int = 2  # bcrypt runs on its own bounded pool, off the request threads
+    PASSWORD_HASH_MAX_QUEUE: int = 16
+    LOGIN_ATTEMPTS_PER_MINUTE_ACCOUNT: float = 5  # token-bucket login limits; burst equals the per-minute rate
+    LOGIN_ATTEMPTS_PER_MINUTE_IP: float = 30
 
     # CORS
     CORS_ORIGINS: List[str] = ["http://localhost:3000", "http://localhost:5173"]
 
+    # Observability: per-route wall time / SQL metrics and slow-request sampling profiles
+    REQUEST_METRICS_ENABLED: bool = False
+    PROFILE_SLOW_REQUEST_MS: float = 0  # 0 disables the sampling profiler
+    PROFILE_SAMPLE_INTERVAL_MS: float = 5.0
+
+    # Response compression (Brotli when installed and accepted, else gzip)
+    RESPONSE_COMPRESSION_MIN_BYTES: int = 1024  # 0 disables compression
+    RESPONSE_GZIP_LEVEL: int = 6
+    RESPONSE_BROTLI_QUALITY: int = 5
+
+    # Compute executor for CPU-bound simulations, optimisation and report rendering
+    COMPUTE_BACKEND: str = "process"  # process, thread, inline
+    COMPUTE_WORKERS: int = 0  # 0 = min(4, cpu_count)
+    COMPUTE_MAX_QUEUE: int = 32
+
+    # Background jobs for long-running simulations and exports
+    JOB_WORKERS: int = 2
+    JOB_RESULT_TTL_HOURS: int = 24
+
+    # Memoization of impact calculations (in-process LRU, optional shared SQLite file)
+    RESULT_CACHE_ENABLED: bool = True
+    RESULT_CACHE_MAX_ENTRIES: int = 2048
+    RESULT_CACHE_TTL_SECONDS: int = 3600
+    RESULT_CACHE_PATH: Optional[str] = None
+    REPORT_PARALLEL_SECTIONS: bool = False
+    FORECAST_MODEL_CACHE_SIZE: int = 256
+    FORECAST_ENGINE: str = "auto"  # auto, linear, holt_winters, ets, arima
+    INVESTMENT_CLUSTERS: int = 6
+    CLUSTER_REFIT_GROWTH: float = 0.5  # full refit once the catalogue grows by this share
+    MATCH_ANN_MIN_CATALOG: int = 5000  # "auto" retrieval switches to two-stage above this many opportunities
+    MATCH_ANN_CANDIDATES: int = 200  # opportunities given full scoring in two-stage retrieval
+
     model_config = {"env_file": ".env", "env_file_encoding": "utf-8"}
 
 
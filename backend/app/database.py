@@ -1,22 +1,77 @@
-"""Database connection and session management."""
-from sqlalchemy import create_engine, event
-from sqlalchemy.orm import sessionmaker, DeclarativeBase
+"""Database connection and session management.
+
+Sync sessions serve the services and most routes. Pure-SQL aggregation and
+listing routes use an ``AsyncSession`` on an async engine over the same
+database (aiosqlite for SQLite, asyncpg for PostgreSQL). Routes backed by the
+pandas/statsmodels services stay on sync sessions in the threadpool, since
+``AsyncSession.run_sync`` would run that work on the event loop.
+
+Read-only routes take their sessions from ``get_read_db``/``get_async_read_db``,
+which use ``DATABASE_REPLICA_URL`` when it is set and reachable. A client
+whose request committed a write is kept on the primary for
+``REPLICA_STICKY_SECONDS`` (via a cookie set by ``ReadYourWritesMiddleware``)
+so it never reads state older than its own writes. Process-wide caches keyed
+on table signatures sync only from the primary (``syncs_from_primary``).
+"""
+import functools
+import threading
+import time
+from contextvars import ContextVar
+from http.cookies import SimpleCookie
+from typing import Optional
+
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session, sessionmaker, DeclarativeBase
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from starlette.concurrency import run_in_threadpool
 from app.config import settings
 
-connect_args = {}
-if settings.DATABASE_URL.startswith("sqlite"):
-    connect_args = {"check_same_thread": False}
+ASYNC_DRIVERS = {"sqlite": "sqlite+aiosqlite", "postgresql": "postgresql+asyncpg"}
+STICKY_COOKIE = "investiq_primary_until"
+
+
+def async_database_url(url: str) -> str:
+    """The async-driver form of a database URL, e.g. ``sqlite:///x.db`` -> ``sqlite+aiosqlite:///x.db``."""
+    scheme, sep, rest = url.partition("://")
+    dialect = scheme.split("+")[0]
+    if dialect not in ASYNC_DRIVERS:
+        raise ValueError(f"No async driver configured for {dialect}. Valid: {list(ASYNC_DRIVERS)}")
+    return f"{ASYNC_DRIVERS[dialect]}{sep}{rest}"
+
+
+def pool_options(url: str, is_async: bool = False) -> dict:
+    if ":memory:" in url:  # single-connection pool, sizing does not apply
+        return {}
+    options = {"pool_size": settings.DB_POOL_SIZE, "max_overflow": settings.DB_MAX_OVERFLOW,
+               "pool_recycle": settings.DB_POOL_RECYCLE_SECONDS}
+    if is_async and url.startswith("sqlite"):
+        # aiosqlite defaults to NullPool, which opens a new connection for every session.
+        options["poolclass"] = AsyncAdaptedQueuePool
+    return options
+
 
-engine = create_engine(settings.DATABASE_URL, connect_args=connect_args, pool_pre_ping=True)
+def _set_sqlite_pragma(dbapi_connection, connection_record):
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.close()
 
-if settings.DATABASE_URL.startswith("sqlite"):
-    @event.listens_for(engine, "connect")
-    def set_sqlite_pragma(dbapi_connection, connection_record):
-        cursor = dbapi_connection.cursor()
-        cursor.execute("PRAGMA journal_mode=WAL")
-        cursor.close()
 
+def create_engines(url: str):
+    """Sync and async engines for one database URL."""
+    connect_args = {"check_same_thread": False} if url.startswith("sqlite") else {}
+    sync_engine = create_engine(url, connect_args=connect_args, pool_pre_ping=True, **pool_options(url))
+    aio_engine = create_async_engine(async_database_url(url), pool_pre_ping=True,
+                                     **pool_options(url, is_async=True))
+    if url.startswith("sqlite"):
+        event.listen(sync_engine, "connect", _set_sqlite_pragma)
+        event.listen(aio_engine.sync_engine, "connect", _set_sqlite_pragma)
+    return sync_engine, aio_engine
+
+
+engine, async_engine = create_engines(settings.DATABASE_URL)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
 
 
 class Base(DeclarativeBase):
@@ -29,3 +84,183 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+def get_session_factory():
+    """Session factory for dependencies that only need a session some of the time."""
+    return SessionLocal
+
+
+# Set for requests that must read from the primary (recent writer or explicit opt-out).
+_read_primary: ContextVar[bool] = ContextVar("read_primary", default=False)
+
+
+class _WriteMarker:
+    """Per-request flag set when a session commits a write; mutable so sync routes on worker threads can set it."""
+    committed = False
+
+
+_request_writes: ContextVar[Optional[_WriteMarker]] = ContextVar("request_writes", default=None)
+
+
+def request_committed_write() -> bool:
+    marker = _request_writes.get()
+    return marker is not None and marker.committed
+
+
+@event.listens_for(Session, "after_flush")
+def _flushed(session, flush_context):
+    session.info["wrote"] = True
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _bulk_write(orm_execute_state):
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        orm_execute_state.session.info["wrote"] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _committed(session):
+    marker = _request_writes.get()
+    if session.info.pop("wrote", False) and marker is not None:
+        marker.committed = True
+
+
+@event.listens_for(Session, "after_rollback")
+def _rolled_back(session):
+    session.info.pop("wrote", None)
+
+
+class ReadRouter:
+    """Chooses between a read replica and the primary for read-only sessions."""
+
+    def __init__(self, primary: sessionmaker, async_primary: async_sessionmaker, replica_url: Optional[str] = None,
+                 health_check_seconds: float = 10.0):
+        self.primary, self.async_primary = primary, async_primary
+        self.replica = self.async_replica = self.replica_engine = None
+        if replica_url:
+            self.replica_engine, replica_async_engine = create_engines(replica_url)
+            self.replica = sessionmaker(autocommit=False, autoflush=False, bind=self.replica_engine)
+            self.async_replica = async_sessionmaker(replica_async_engine, autoflush=False, expire_on_commit=False)
+        self.health_check_seconds = health_check_seconds
+        self._healthy = True
+        self._checked_at = float("-inf")
+        self._lock = threading.Lock()
+
+    def _health_stale(self) -> bool:
+        return time.monotonic() - self._checked_at >= self.health_check_seconds
+
+    def replica_healthy(self) -> bool:
+        """Cached result of a ``SELECT 1`` against the replica, refreshed every ``health_check_seconds``."""
+        with self._lock:
+            if not self._health_stale():
+                return self._healthy
+            try:
+                with self.replica_engine.connect() as conn:
+                    conn.execute(text("SELECT 1"))
+                self._healthy = True
+            except Exception:
+                self._healthy = False  # fall back to the primary until the next check
+            self._checked_at = time.monotonic()
+            return self._healthy
+
+    def _wants_replica(self) -> bool:
+        return self.replica is not None and not _read_primary.get() and not request_committed_write()
+
+    def is_replica(self, db: Session) -> bool:
+        return self.replica_engine is not None and db.get_bind() is self.replica_engine
+
+    def session_factory(self) -> sessionmaker:
+        return self.replica if self._wants_replica() and self.replica_healthy() else self.primary
+
+    async def async_session_factory(self) -> async_sessionmaker:
+        if not self._wants_replica():
+            return self.async_primary
+        healthy = await run_in_threadpool(self.replica_healthy) if self._health_stale() else self._healthy
+        return self.async_replica if healthy else self.async_primary
+
+
+read_router = ReadRouter(SessionLocal, AsyncSessionLocal, settings.DATABASE_REPLICA_URL,
+                         settings.REPLICA_HEALTH_CHECK_SECONDS)
+
+
+def syncs_from_primary(method):
+    """Run a cache's ``sync(db)`` on a primary session when ``db`` reads from the replica.
+
+    A lagging replica would otherwise report different signatures than the
+    primary and make process-wide caches rebuild back and forth.
+    """
+    @functools.wraps(method)
+    def wrapper(self, db: Session, *args, **kwargs):
+        if not read_router.is_replica(db):
+            return method(self, db, *args, **kwargs)
+        with read_router.primary() as primary:
+            return method(self, primary, *args, **kwargs)
+    return wrapper
+
+
+def get_read_db():
+    """Session for read-only routes: the replica when configured and healthy, else the primary."""
+    db = read_router.session_factory()()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+async def get_async_read_db():
+    async with (await read_router.async_session_factory())() as db:
+        yield db
+
+
+class ReadYourWritesMiddleware:
+    """ASGI middleware pinning a client's reads to the primary shortly after it writes.
+
+    Requests that commit a write set a short-lived cookie; requests carrying
+    it, or an ``X-Read-Primary`` header, read from the primary. Read-only
+    requests keep using the replica whatever their method.
+    """
+
+    def __init__(self, app, sticky_seconds: float = 5.0):
+        self.app = app
+        self.sticky_seconds = sticky_seconds
+
+    def _pinned(self, scope) -> bool:
+        for name, value in scope.get("headers", []):
+            if name == b"x-read-primary":
+                return True
+            if name == b"cookie":
+                morsel = SimpleCookie(value.decode("latin-1")).get(STICKY_COOKIE)
+                try:
+                    if morsel is not None and float(morsel.value) > time.time():
+                        return True
+                except ValueError:
+                    pass
+        return False
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        marker = _WriteMarker()
+        token = _read_primary.set(self._pinned(scope))
+        writes_token = _request_writes.set(marker)
+
+        async def send_wrapper(message):
+            if marker.committed and message["type"] == "http.response.start" and message["status"] < 400:
+                until = time.time() + self.sticky_seconds
+                cookie = (f"{STICKY_COOKIE}={until:.3f}; Max-Age={max(1, round(self.sticky_seconds))}; Path=/; "
+                          f"HttpOnly; SameSite=Lax")
+                message = {**message, "headers": list(message.get("headers", [])) + [(b"set-cookie", cookie.encode())]}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _request_writes.reset(writes_token)
+            _read_primary.reset(token)
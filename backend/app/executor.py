@@ -0,0 +1,154 @@
+"""Bounded compute executor for CPU-bound NumPy/SciPy work.
+
+Monte Carlo runs, SLSQP optimisation and report rendering are dispatched to a
+dedicated process pool so they neither block the event loop nor occupy the
+request threadpool that lightweight CRUD handlers depend on.
+"""
+import asyncio
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, List, Optional
+
+from app.config import settings
+from app.monitoring import REGISTRY, MetricsRegistry
+
+
+def describe_pool_metrics(name: str):
+    label = name.replace("_", " ").capitalize()
+    REGISTRY.describe(f"investiq_{name}_pending", "gauge", f"{label} tasks submitted and not yet finished.")
+    REGISTRY.describe(f"investiq_{name}_running", "gauge", f"{label} tasks currently executing.")
+    REGISTRY.describe(f"investiq_{name}_queued", "gauge", f"{label} tasks waiting for a free worker.")
+    REGISTRY.describe(f"investiq_{name}_workers", "gauge", f"Size of the {name.replace('_', ' ')} worker pool.")
+    REGISTRY.describe(f"investiq_{name}_tasks_total", "counter", f"{label} tasks by task name and outcome.")
+    REGISTRY.describe(f"investiq_{name}_queue_wait_seconds", "histogram", "Time tasks spent waiting for a worker.")
+    REGISTRY.describe(f"investiq_{name}_run_seconds", "histogram", f"Execution time of {name.replace('_', ' ')} tasks.")
+
+
+class ComputeSaturatedError(RuntimeError):
+    """Raised when the compute queue is full and a task cannot be accepted."""
+
+
+def _timed_call(fn: Callable, args: tuple, kwargs: dict):
+    # Runs inside the worker; wall-clock timestamps are comparable across processes.
+    started = time.time()
+    result = fn(*args, **kwargs)
+    return started, time.time(), result
+
+
+class ComputeExecutor:
+    BACKENDS = ("process", "thread", "inline")
+
+    def __init__(self, backend: str = "process", workers: int = 0, max_queue: int = 32, name: str = "compute"):
+        if backend not in self.BACKENDS:
+            raise ValueError(f"Unknown compute backend: {backend}. Valid: {list(self.BACKENDS)}")
+        # ``name`` prefixes the pool's metrics (investiq_<name>_*) and worker thread names.
+        self.name = name
+        describe_pool_metrics(name)
+        self.backend = backend
+        self.workers = workers or min(4, os.cpu_count() or 1)
+        self.max_queue = max_queue
+        self._executor: Optional[Executor] = None
+        self._lock = threading.Lock()
+        self._pending = 0
+
+    @property
+    def pending(self) -> int:
+        return self._pending
+
+    @property
+    def running(self) -> int:
+        return min(self._pending, self.workers)
+
+    @property
+    def queued(self) -> int:
+        return max(self._pending - self.workers, 0)
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            if self.backend == "process":
+                # spawn avoids forking a process that already runs event-loop and threadpool threads
+                self._executor = ProcessPoolExecutor(self.workers, mp_context=multiprocessing.get_context("spawn"))
+            else:
+                self._executor = ThreadPoolExecutor(self.workers, thread_name_prefix=f"investiq-{self.name}")
+        return self._executor
+
+    def submit(self, fn: Callable, *args, task: Optional[str] = None, **kwargs) -> Future:
+        """Queue ``fn(*args, **kwargs)`` on the pool, rejecting work beyond the queue limit."""
+        task = task or getattr(fn, "__name__", "task")
+        with self._lock:
+            if self._pending >= self.workers + self.max_queue:
+                REGISTRY.inc(f"investiq_{self.name}_tasks_total", task=task, status="rejected")
+                raise ComputeSaturatedError("Compute capacity exhausted, retry shortly")
+            self._pending += 1
+        submitted = time.time()
+        if self.backend == "inline":
+            inner: Future = Future()
+            try:
+                inner.set_result(_timed_call(fn, args, kwargs))
+            except Exception as exc:
+                inner.set_exception(exc)
+        else:
+            try:
+                inner = self._get_executor().submit(_timed_call, fn, args, kwargs)
+            except Exception:
+                self._finish(task, "error")
+                raise
+        outer: Future = Future()
+
+        def _done(f: Future):
+            exc = f.exception()
+            if exc is not None:
+                self._finish(task, "error")
+                outer.set_exception(exc)
+                return
+            started, finished, result = f.result()
+            REGISTRY.observe(f"investiq_{self.name}_queue_wait_seconds", max(started - submitted, 0.0), task=task)
+            REGISTRY.observe(f"investiq_{self.name}_run_seconds", finished - started, task=task)
+            self._finish(task, "ok")
+            outer.set_result(result)
+
+        inner.add_done_callback(_done)
+        return outer
+
+    def _finish(self, task: str, status: str):
+        with self._lock:
+            self._pending -= 1
+        REGISTRY.inc(f"investiq_{self.name}_tasks_total", task=task, status=status)
+
+    def map_chunked(self, fn: Callable, items: List, *args, task: Optional[str] = None) -> List:
+        """Run ``fn(chunk, *args)`` over one contiguous chunk of ``items`` per worker and concatenate.
+
+        ``fn`` must return a list with one result per input item, in order.
+        Blocks until every chunk finishes, so call it from a worker thread.
+        """
+        if not items:
+            return []
+        size = -(-len(items) // self.workers)
+        futures = [self.submit(fn, items[i:i + size], *args, task=task) for i in range(0, len(items), size)]
+        return [result for future in futures for result in future.result()]
+
+    async def run(self, fn: Callable, *args, task: Optional[str] = None, **kwargs) -> Any:
+        """Await ``fn(*args, **kwargs)`` on the pool without holding a threadpool slot."""
+        return await asyncio.wrap_future(self.submit(fn, *args, task=task, **kwargs))
+
+    def collect(self, registry: MetricsRegistry):
+        registry.set(f"investiq_{self.name}_pending", self.pending, backend=self.backend)
+        registry.set(f"investiq_{self.name}_running", self.running, backend=self.backend)
+        registry.set(f"investiq_{self.name}_queued", self.queued, backend=self.backend)
+        registry.set(f"investiq_{self.name}_workers", self.workers, backend=self.backend)
+
+    def shutdown(self, wait: bool = True):
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait, cancel_futures=True)
+            self._executor = None
+
+
+compute_executor = ComputeExecutor(settings.COMPUTE_BACKEND, settings.COMPUTE_WORKERS, settings.COMPUTE_MAX_QUEUE)
+REGISTRY.add_collector(compute_executor.collect)
+# bcrypt hashing is CPU-bound but releases the GIL, so a small thread pool suffices.
+password_executor = ComputeExecutor("thread", settings.PASSWORD_HASH_WORKERS, settings.PASSWORD_HASH_MAX_QUEUE,
+                                    name="password_hash")
+REGISTRY.add_collector(password_executor.collect)
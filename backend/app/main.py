@@ -1,18 +1,28 @@
 """FastAPI application entry point for InvestIQ Africa."""
 from contextlib import asynccontextmanager
-from fastapi import FastAPI
+from fastapi import Depends, FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
 
 from app.config import settings
-from app.database import engine, Base
+from app.database import engine, Base, ReadYourWritesMiddleware
+from app.executor import compute_executor, password_executor, ComputeSaturatedError
+from app.monitoring import REGISTRY, SLOW_PROFILES, PROMETHEUS_CONTENT_TYPE, InstrumentationMiddleware
+from app.responses import CompressionMiddleware, FastJSONResponse
 from app.models import *  # noqa: F401,F403 — ensure all models are registered
-from app.api.routes import auth, investments, analytics, impact, matching, dashboard
+from app.api.dependencies import require_role
+from app.api.routes import auth, investments, analytics, impact, matching, dashboard, jobs
+from app.services.job_queue import job_queue
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     Base.metadata.create_all(bind=engine)
+    job_queue.start()
     yield
+    job_queue.shutdown()
+    compute_executor.shutdown()
+    password_executor.shutdown()
 
 app = FastAPI(
     title=settings.APP_NAME,
@@ -21,6 +31,7 @@ app = FastAPI(
     docs_url="/docs",
     redoc_url="/redoc",
     lifespan=lifespan,
+    default_response_class=FastJSONResponse,
 )
 
 app.add_middleware(
@@ -31,6 +42,30 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+if settings.RESPONSE_COMPRESSION_MIN_BYTES > 0:
+    app.add_middleware(
+        CompressionMiddleware,
+        minimum_size=settings.RESPONSE_COMPRESSION_MIN_BYTES,
+        gzip_level=settings.RESPONSE_GZIP_LEVEL,
+        brotli_quality=settings.RESPONSE_BROTLI_QUALITY,
+    )
+
+if settings.DATABASE_REPLICA_URL:
+    app.add_middleware(ReadYourWritesMiddleware, sticky_seconds=settings.REPLICA_STICKY_SECONDS)
+
+if settings.REQUEST_METRICS_ENABLED or settings.PROFILE_SLOW_REQUEST_MS > 0:
+    app.add_middleware(
+        InstrumentationMiddleware,
+        profile_threshold_ms=settings.PROFILE_SLOW_REQUEST_MS,
+        sample_interval_ms=settings.PROFILE_SAMPLE_INTERVAL_MS,
+    )
+
+
+@app.exception_handler(ComputeSaturatedError)
+async def compute_saturated_handler(request: Request, exc: ComputeSaturatedError):
+    return FastJSONResponse(status_code=503, content={"detail": str(exc)}, headers={"Retry-After": "5"})
+
+
 # Include routers
 app.include_router(auth.router, prefix=settings.API_V1_PREFIX)
 app.include_router(investments.router, prefix=settings.API_V1_PREFIX)
@@ -38,6 +73,7 @@ app.include_router(analytics.router, prefix=settings.API_V1_PREFIX)
 app.include_router(impact.router, prefix=settings.API_V1_PREFIX)
 app.include_router(matching.router, prefix=settings.API_V1_PREFIX)
 app.include_router(dashboard.router, prefix=settings.API_V1_PREFIX)
+app.include_router(jobs.router, prefix=settings.API_V1_PREFIX)
 
 
 @app.get("/")
@@ -56,3 +92,16 @@ def root():
 def health_check():
     """Health check endpoint."""
     return {"status": "healthy", "version": settings.APP_VERSION}
+
+
+@app.get("/metrics", include_in_schema=False)
+def metrics():
+    """Prometheus metrics in text exposition format."""
+    return PlainTextResponse(REGISTRY.render(), media_type=PROMETHEUS_CONTENT_TYPE)
+
+
+if settings.PROFILE_SLOW_REQUEST_MS > 0:
+    @app.get("/debug/profiles", include_in_schema=False, dependencies=[Depends(require_role("admin"))])
+    def slow_request_profiles():
+        """Sampling profiles of the most recent slow requests, newest first (admins only: they include URLs)."""
+        return list(reversed(SLOW_PROFILES))
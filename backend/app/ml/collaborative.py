@@ -0,0 +1,95 @@
+"""Item-item collaborative filtering of sector appetite from investment history.
+
+Investor groups (origin countries, investor types) are users and sectors are
+items; each recorded investment adds one interaction. The sector Gram matrix
+``R^T R`` is maintained incrementally as interactions are added or removed, so
+item-item cosine similarities never need a full recount. The
+``group x sector`` affinity table derived from them is rebuilt lazily after a
+change, and scoring a pair is then a constant-time array lookup.
+"""
+import threading
+from typing import Dict, Iterable, Optional, Tuple
+
+import numpy as np
+from scipy.sparse import csr_matrix
+
+
+class SectorAffinity:
+    def __init__(self):
+        self._counts: Dict[str, Dict[str, float]] = {}  # group -> sector -> interactions
+        self._sectors: Dict[str, int] = {}
+        self._gram = np.zeros((0, 0))
+        self._lock = threading.Lock()
+        self._table = None
+
+    def _column(self, sector: str) -> int:
+        col = self._sectors.get(sector)
+        if col is None:
+            col = self._sectors[sector] = len(self._sectors)
+            self._gram = np.pad(self._gram, ((0, 1), (0, 1)))
+        return col
+
+    def add(self, group: str, sector: str, delta: float = 1.0):
+        """Add ``delta`` interactions between a group and a sector (negative to remove)."""
+        with self._lock:
+            row = self._counts.setdefault(group, {})
+            s = self._column(sector)
+            # R[g, s] += delta changes row/column s of R^T R by delta * R[g, :].
+            for other, count in row.items():
+                t = self._sectors[other]
+                self._gram[s, t] += delta * count
+                self._gram[t, s] += delta * count
+            self._gram[s, s] += delta * delta
+            count = row.get(sector, 0.0) + delta
+            if count > 0:
+                row[sector] = count
+            else:
+                row.pop(sector, None)
+                if not row:
+                    del self._counts[group]
+            self._table = None
+
+    def similarities(self) -> np.ndarray:
+        """Cosine similarity between sector columns of the interaction matrix."""
+        norms = np.sqrt(np.clip(np.diag(self._gram), 0, None))
+        with np.errstate(divide="ignore", invalid="ignore"):
+            sims = self._gram / np.outer(norms, norms)
+        return np.nan_to_num(sims)
+
+    def _build(self):
+        groups = list(self._counts)
+        rows, cols, vals = [], [], []
+        for i, group in enumerate(groups):
+            for sector, count in self._counts[group].items():
+                rows.append(i)
+                cols.append(self._sectors[sector])
+                vals.append(count)
+        shape = (len(groups), len(self._sectors))
+        interactions = csr_matrix((vals, (rows, cols)), shape=shape)
+        totals = np.asarray(interactions.sum(axis=1)).ravel()
+        # Interaction-weighted mean similarity of each sector to a group's past sectors.
+        affinity = (interactions @ self.similarities()) / np.where(totals > 0, totals, 1)[:, None]
+        return {g: i for i, g in enumerate(groups)}, dict(self._sectors), affinity, totals
+
+    def _snapshot(self):
+        with self._lock:
+            if self._table is None:
+                self._table = self._build()
+            return self._table
+
+    def affinity(self, groups: Iterable[str], sector: str) -> Optional[Tuple[float, float]]:
+        """Evidence-weighted affinity of ``groups`` for ``sector`` and the interactions behind it.
+
+        None when none of the groups or the sector has any history.
+        """
+        positions, sectors, table, totals = self._snapshot()
+        col = sectors.get(sector)
+        if col is None:
+            return None
+        weighted, evidence = 0.0, 0.0
+        for group in groups:
+            row = positions.get(group)
+            if row is not None:
+                weighted += table[row, col] * totals[row]
+                evidence += totals[row]
+        return (weighted / evidence, evidence) if evidence else None
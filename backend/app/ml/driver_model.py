@@ -0,0 +1,124 @@
+"""Multivariate FDI regression on lagged macroeconomic driver indicators.
+
+Drivers are lagged, standardised and regressed on the target with a ridge
+penalty solved from one SVD of the feature matrix. The factorisation is kept
+on the fitted model, so re-solving for another penalty or target on the same
+features costs a few matrix-vector products.
+"""
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+DRIVER_LABELS = {
+    "gdp_growth": "GDP Growth",
+    "inflation_rate": "Inflation Rate",
+    "exchange_rate": "Exchange Rate",
+    "trade_balance": "Trade Balance",
+    "unemployment_rate": "Unemployment Rate",
+    "ease_of_business": "Ease of Doing Business",
+}
+# Indicators that move by orders of magnitude enter the model in logs.
+LOG_DRIVERS = {"exchange_rate"}
+
+
+def _transform(name: str, values):
+    return np.log(np.maximum(values, 1e-9)) if name in LOG_DRIVERS else values
+
+
+class DriverModel:
+    def __init__(self, target: str = "fdi_inflow", drivers: Optional[Sequence[str]] = None,
+                 lags: Sequence[int] = (1,), freq: str = "YE", ridge: float = 1.0):
+        self.target = target
+        self.drivers = list(drivers or DRIVER_LABELS)
+        self.lags = tuple(lags)
+        self.freq = freq
+        self.ridge = ridge
+        self.fitted = False
+
+    def fit(self, wide: pd.DataFrame) -> "DriverModel":
+        """Fit on a wide ``period x indicator`` frame (see ``indicator_store``)."""
+        if self.target not in wide:
+            raise ValueError(f"No data for target indicator: {self.target}")
+        frame = wide.resample(self.freq).last()
+        self.drivers = [d for d in self.drivers if d in frame and frame[d].notna().any()]
+        # Drivers are carried forward over gaps; the last observed level persists into the forecast.
+        self.history = pd.DataFrame({d: _transform(d, frame[d]) for d in self.drivers}, index=frame.index).ffill()
+        features = self._features(self.history)
+        y = frame[self.target]
+        rows = y.notna() & features.notna().all(axis=1)
+        if rows.sum() < 3 or not self.drivers:
+            raise ValueError(f"Not enough overlapping driver and {self.target} observations")
+        X, y = features[rows].to_numpy(), y[rows].to_numpy()
+        self.feature_names = list(features.columns)
+        self.mean_ = X.mean(axis=0)
+        self.scale_ = X.std(axis=0)
+        self.scale_[self.scale_ == 0] = 1.0
+        self._u, self._s, self._vt = np.linalg.svd((X - self.mean_) / self.scale_, full_matrices=False)
+        self._X, self.y = X, y
+        self.solve(y)
+        self.fitted = True
+        return self
+
+    def _features(self, history: pd.DataFrame) -> pd.DataFrame:
+        return pd.DataFrame({f"{d}_lag{lag}": history[d].shift(lag) for lag in self.lags for d in self.drivers})
+
+    def solve(self, y: np.ndarray, ridge: Optional[float] = None) -> np.ndarray:
+        """Ridge solution for ``y`` from the cached SVD; updates the model's coefficients."""
+        ridge = self.ridge if ridge is None else ridge
+        self.intercept_ = float(np.mean(y))
+        shrink = self._s / (self._s ** 2 + ridge)
+        self.coef_ = self._vt.T @ (shrink * (self._u.T @ (y - self.intercept_)))
+        fitted = self.intercept_ + ((self._X - self.mean_) / self.scale_) @ self.coef_
+        ss_tot = np.sum((y - self.intercept_) ** 2)
+        self.r_squared = float(1 - np.sum((y - fitted) ** 2) / ss_tot) if ss_tot > 0 else 0.0
+        self.residual_std = float(np.std(y - fitted))
+        return self.coef_
+
+    def key_drivers(self) -> List[Dict]:
+        """Drivers ranked by the share of their standardised coefficients (summed over lags)."""
+        weights = self.coef_.reshape(len(self.lags), len(self.drivers)).sum(axis=0)
+        total = np.abs(weights).sum() or 1.0
+        ranked = sorted(zip(self.drivers, weights), key=lambda item: abs(item[1]), reverse=True)
+        return [{"indicator": d, "label": DRIVER_LABELS.get(d, d), "coefficient": round(float(w), 4),
+                 "importance": round(float(abs(w) / total), 4), "direction": "positive" if w >= 0 else "negative"}
+                for d, w in ranked]
+
+    def forecast(self, horizon: int = 1, scenario: Optional[Dict[str, float]] = None) -> Dict:
+        """Baseline and scenario forecasts for the next ``horizon`` periods.
+
+        Drivers are held at their last observed level. Scenario values (in the
+        indicator's own units, e.g. ``{"inflation_rate": 30}``) replace a driver
+        from the latest observed period onward, so with one-period lags they
+        move the very next forecast.
+        """
+        if not self.fitted:
+            raise RuntimeError("Model not fitted. Call fit() first.")
+        scenario = scenario or {}
+        unknown = set(scenario) - set(self.drivers)
+        if unknown:
+            raise ValueError(f"Unknown driver(s): {sorted(unknown)}. Valid: {self.drivers}")
+        periods = pd.date_range(self.history.index[-1], periods=horizon + 1, freq=self.freq)[1:]
+        future = pd.DataFrame([self.history.iloc[-1]] * horizon, index=periods)
+        path = pd.concat([self.history, future])
+        baseline = self._predict(path, horizon)
+        for name, value in scenario.items():
+            path.iloc[len(self.history) - 1:, path.columns.get_loc(name)] = _transform(name, float(value))
+        shocked = self._predict(path, horizon)
+        return {
+            "periods": [str(p.date()) for p in periods],
+            "baseline": np.round(baseline, 2).tolist(),
+            "scenario": np.round(shocked, 2).tolist(),
+            "delta": np.round(shocked - baseline, 2).tolist(),
+            "drivers": scenario,
+        }
+
+    def _predict(self, path: pd.DataFrame, horizon: int) -> np.ndarray:
+        X = self._features(path).to_numpy()[-horizon:]
+        return self.intercept_ + ((X - self.mean_) / self.scale_) @ self.coef_
+
+    def summary(self) -> Dict:
+        return {"target": self.target, "frequency": self.freq, "lags": list(self.lags),
+                "observations": len(self.y), "r_squared": round(self.r_squared, 4),
+                "residual_std": round(self.residual_std, 4), "intercept": round(self.intercept_, 4),
+                "key_drivers": self.key_drivers()}
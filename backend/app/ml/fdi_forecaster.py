@@ -3,66 +3,76 @@ import numpy as np
 import pandas as pd
 from typing import Optional, Dict, List
 
+from app.ml.forecast_engines import fit_engine, holdout_errors, interval_z
+
 
 class FDIForecaster:
-    """Time series forecasting for FDI inflows."""
+    """Time series forecasting for FDI inflows on a pluggable engine (see ``forecast_engines``)."""
 
-    def __init__(self):
+    def __init__(self, engine: str = "linear"):
         self.data = None
-        self.trend_coef = None
-        self.alpha = 0.3
+        self.engine_name = engine
+        self.engine = None
         self.fitted = False
 
     def fit(self, data: pd.DataFrame, date_col: str = "period", value_col: str = "value"):
         self.data = data.sort_values(date_col).reset_index(drop=True)
         self.values = self.data[value_col].values.astype(float)
-        n = len(self.values)
-        if n < 2:
-            self.trend_coef = (0, self.values[0] if n > 0 else 0)
-            self.fitted = True
-            return
-        x = np.arange(n)
-        self.trend_coef = np.polyfit(x, self.values, 1)
-        residuals = self.values - np.polyval(self.trend_coef, x)
-        self.residual_std = np.std(residuals) if len(residuals) > 1 else 0
+        errors = holdout_errors(self.values) if self.engine_name == "auto" else {}
+        self.engine = fit_engine(self.values, self.engine_name, errors)
+        if self.engine.name not in errors:  # a named engine, or the linear fallback
+            errors = holdout_errors(self.values, [self.engine.name])
+        # Mean absolute error of the fitted engine on the last few points; None when the series is too short.
+        self.holdout_error = errors.get(self.engine.name)
         self.fitted = True
+        return self
+
+    @property
+    def model_name(self) -> str:
+        return self.engine.name if self.engine else self.engine_name
+
+    def predict(self, horizon_months: int = 24, confidence: float = 0.95, columnar: bool = False) -> Dict:
+        """Forecast ``horizon_months`` steps ahead with ``confidence`` prediction intervals.
 
-    def predict(self, horizon_months: int = 24, confidence: float = 0.95) -> Dict:
+        With ``columnar`` the history and predictions are returned as parallel
+        arrays (``{"step": [...], "value": [...]}``) instead of one dict per point.
+        """
         if not self.fitted:
             raise RuntimeError("Model not fitted. Call fit() first.")
         n = len(self.values)
-        z_score = 1.96 if confidence >= 0.95 else 1.645
-        predictions = []
-        for i in range(horizon_months):
-            idx = n + i
-            value = np.polyval(self.trend_coef, idx)
-            spread = self.residual_std * z_score * np.sqrt(1 + i / 12)
-            predictions.append({
-                "step": i + 1,
-                "value": round(float(max(value, 0)), 2),
-                "lower_bound": round(float(max(value - spread, 0)), 2),
-                "upper_bound": round(float(value + spread), 2),
-                "is_forecast": True,
-            })
-        history = []
-        for i, val in enumerate(self.values):
-            history.append({"step": i, "value": round(float(val), 2), "is_forecast": False})
-        return {
-            "history": history,
-            "predictions": predictions,
-            "model_accuracy": round(float(1.0 - self.residual_std / np.mean(self.values)) * 100, 1) if np.mean(self.values) > 0 else 0,
+        values, std = self.engine.forecast(horizon_months)
+        spread = std * interval_z(confidence)
+        predictions = {
+            "step": list(range(1, horizon_months + 1)),
+            "value": np.round(np.maximum(values, 0), 2).tolist(),
+            "lower_bound": np.round(np.maximum(values - spread, 0), 2).tolist(),
+            "upper_bound": np.round(values + spread, 2).tolist(),
         }
+        history = {"step": list(range(n)), "value": np.round(self.values, 2).tolist()}
+        mean = np.mean(self.values)
+        accuracy = None
+        if self.holdout_error is not None:
+            accuracy = round(float(1.0 - self.holdout_error / mean) * 100, 1) if mean > 0 else 0
+        if not columnar:
+            predictions = _records(predictions, is_forecast=True)
+            history = _records(history, is_forecast=False)
+        return {"history": history, "predictions": predictions, "model_accuracy": accuracy, "model": self.model_name}
 
     def decompose_trend(self, data: pd.DataFrame, value_col: str = "value", period: int = 4) -> Dict:
         values = data[value_col].values.astype(float)
         n = len(values)
         trend = np.convolve(values, np.ones(period) / period, mode='same')
-        trend[:period // 2] = trend[period // 2]
-        trend[-(period // 2):] = trend[-(period // 2) - 1]
+        half = period // 2
+        if half:
+            trend[:half] = trend[half]
+            trend[-half:] = trend[-half - 1]
         seasonal = values - trend
         if n >= period:
-            seasonal_avg = np.array([np.mean(seasonal[i::period]) for i in range(period)])
-            seasonal = np.tile(seasonal_avg, n // period + 1)[:n]
+            # Pad to whole cycles with NaN so the per-position means come from one reshape.
+            cycles = -(-n // period)
+            padded = np.full(cycles * period, np.nan)
+            padded[:n] = seasonal
+            seasonal = np.resize(np.nanmean(padded.reshape(cycles, period), axis=0), n)
         residual = values - trend - seasonal
         return {
             "trend": trend.tolist(),
@@ -85,3 +95,8 @@ class FDIForecaster:
             "predictions": predictions.tolist(),
             "feature_names": ["intercept"] + list(features.columns),
         }
+
+
+def _records(columns: Dict[str, List], **constants) -> List[Dict]:
+    keys = list(columns)
+    return [{**dict(zip(keys, row)), **constants} for row in zip(*columns.values())]
@@ -0,0 +1,162 @@
+"""Pluggable univariate forecasting engines.
+
+Every engine fits on a 1-D array and returns a point forecast together with
+the forecast standard deviation per step, so prediction intervals for any
+confidence level come from normal quantiles rather than hard-coded z-scores.
+"""
+import warnings
+from typing import Dict, List, Optional, Tuple, Type
+
+import numpy as np
+import pandas as pd
+from scipy.stats import norm
+from statsmodels.tsa.arima.model import ARIMA
+from statsmodels.tsa.exponential_smoothing.ets import ETSModel
+from statsmodels.tsa.holtwinters import ExponentialSmoothing
+
+
+def interval_z(confidence: float) -> float:
+    """Two-sided normal quantile for a confidence level in (0, 1)."""
+    return float(norm.ppf(0.5 + confidence / 2))
+
+
+class ForecastEngine:
+    name = "base"
+    min_points = 1
+
+    def fit(self, values: np.ndarray) -> "ForecastEngine":
+        raise NotImplementedError
+
+    def forecast(self, horizon: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Return ``(mean, std)`` arrays of length ``horizon``."""
+        raise NotImplementedError
+
+
+class LinearTrendEngine(ForecastEngine):
+    """Least-squares straight line; the original FDIForecaster model."""
+    name = "linear"
+
+    def fit(self, values: np.ndarray) -> "LinearTrendEngine":
+        self.n = len(values)
+        if self.n < 2:
+            self.coef = np.array([0.0, values[0] if self.n else 0.0])
+            self.residual_std = 0.0
+            return self
+        x = np.arange(self.n)
+        self.coef = np.polyfit(x, values, 1)
+        self.residual_std = float(np.std(values - np.polyval(self.coef, x)))
+        return self
+
+    def forecast(self, horizon: int) -> Tuple[np.ndarray, np.ndarray]:
+        offsets = np.arange(horizon)
+        return np.polyval(self.coef, self.n + offsets), self.residual_std * np.sqrt(1 + offsets / 12)
+
+
+class HoltWintersEngine(ForecastEngine):
+    """Additive Holt-Winters; seasonal only when at least two full cycles are available."""
+    name = "holt_winters"
+    min_points = 4
+
+    def __init__(self, seasonal_periods: int = 4):
+        self.seasonal_periods = seasonal_periods
+
+    def fit(self, values: np.ndarray) -> "HoltWintersEngine":
+        seasonal = "add" if len(values) >= 2 * self.seasonal_periods else None
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            self.result = ExponentialSmoothing(
+                values, trend="add", seasonal=seasonal,
+                seasonal_periods=self.seasonal_periods if seasonal else None,
+            ).fit()
+        self.sigma = float(np.sqrt(self.result.sse / max(len(values) - 1, 1)))
+        return self
+
+    def forecast(self, horizon: int) -> Tuple[np.ndarray, np.ndarray]:
+        # Analytical ETS(A,A,N) variance (Hyndman et al., class 1) with beta = alpha * beta*.
+        alpha = self.result.params["smoothing_level"]
+        beta = alpha * self.result.params["smoothing_trend"]
+        h = np.arange(1, horizon + 1)
+        var = 1 + (h - 1) * (alpha ** 2 + alpha * beta * h + beta ** 2 * h * (2 * h - 1) / 6)
+        return np.asarray(self.result.forecast(horizon)), self.sigma * np.sqrt(var)
+
+
+class ETSEngine(ForecastEngine):
+    """State-space ETS with additive errors and a damped additive trend."""
+    name = "ets"
+    min_points = 4
+
+    def fit(self, values: np.ndarray) -> "ETSEngine":
+        self.n = len(values)
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            # ETS prediction needs an indexed series to label its output.
+            self.result = ETSModel(pd.Series(values), error="add", trend="add", damped_trend=True).fit(disp=False)
+        return self
+
+    def forecast(self, horizon: int) -> Tuple[np.ndarray, np.ndarray]:
+        pred = self.result.get_prediction(start=self.n, end=self.n + horizon - 1)
+        return np.asarray(pred.predicted_mean), np.sqrt(np.asarray(pred.forecast_variance))
+
+
+class ARIMAEngine(ForecastEngine):
+    name = "arima"
+    min_points = 6
+
+    def __init__(self, order: Tuple[int, int, int] = (1, 1, 1)):
+        self.order = order
+
+    def fit(self, values: np.ndarray) -> "ARIMAEngine":
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            self.result = ARIMA(values, order=self.order).fit()
+        return self
+
+    def forecast(self, horizon: int) -> Tuple[np.ndarray, np.ndarray]:
+        pred = self.result.get_forecast(horizon)
+        return np.asarray(pred.predicted_mean), np.asarray(pred.se_mean)
+
+
+ENGINES: Dict[str, Type[ForecastEngine]] = {
+    engine.name: engine for engine in (LinearTrendEngine, HoltWintersEngine, ETSEngine, ARIMAEngine)
+}
+
+
+def holdout_errors(values: np.ndarray, candidates: Optional[List[str]] = None,
+                   holdout: Optional[int] = None) -> Dict[str, float]:
+    """Mean absolute error of each engine on the last ``holdout`` points, fitted on the rest."""
+    n = len(values)
+    holdout = holdout or max(1, min(4, n // 4))
+    train, test = values[:-holdout], values[-holdout:]
+    errors = {}
+    for name in candidates or list(ENGINES):
+        engine = ENGINES[name]()
+        if len(train) < max(engine.min_points, 2):
+            continue
+        try:
+            mean, _ = engine.fit(train).forecast(holdout)
+        except Exception:
+            continue
+        if np.all(np.isfinite(mean)):
+            errors[name] = float(np.mean(np.abs(mean - test)))
+    return errors
+
+
+def fit_engine(values: np.ndarray, engine: str = "auto", errors: Optional[Dict[str, float]] = None) -> ForecastEngine:
+    """Fit the named engine, or with ``auto`` the one with the lowest holdout error.
+
+    ``errors`` are precomputed ``holdout_errors`` to choose from. Falls back to
+    the linear trend when a series is too short for the requested model or its
+    fit fails.
+    """
+    if engine == "auto":
+        errors = holdout_errors(values) if errors is None else errors
+        engine = min(errors, key=errors.get) if errors else LinearTrendEngine.name
+    if engine not in ENGINES:
+        raise ValueError(f"Unknown forecast engine: {engine}. Valid: {['auto'] + list(ENGINES)}")
+    model = ENGINES[engine]()
+    if len(values) >= model.min_points:
+        try:
+            return model.fit(values)
+        except Exception:
+            pass
+    return LinearTrendEngine().fit(values)
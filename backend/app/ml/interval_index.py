@@ -0,0 +1,59 @@
+"""Static centred interval tree for range-overlap queries.
+
+Ranges overlapping ``[lo, hi]`` are those that contain ``lo`` plus those that
+start inside ``(lo, hi]``. The second set is a contiguous slice of the ranges
+sorted by lower endpoint; the first is a stabbing query on a centred interval
+tree, whose nodes keep their ranges sorted by each endpoint so every visited
+node reports a prefix. Both parts cost O(log n + k) for k results.
+"""
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+
+class IntervalIndex:
+    def __init__(self, lo: np.ndarray, hi: np.ndarray):
+        self.lo = np.asarray(lo, dtype=float)
+        self.hi = np.asarray(hi, dtype=float)
+        self._by_lo = np.argsort(self.lo, kind="stable")
+        self._sorted_lo = self.lo[self._by_lo]
+        # Node: (centre, ids by ascending lo, their lo, ids by descending hi, their hi, left, right)
+        self._root = self._build(np.arange(len(self.lo)))
+
+    def __len__(self):
+        return len(self.lo)
+
+    def _build(self, ids: np.ndarray) -> Optional[Tuple]:
+        if len(ids) == 0:
+            return None
+        centre = float(np.median(np.concatenate([self.lo[ids], self.hi[ids]])))
+        left, right = ids[self.hi[ids] < centre], ids[self.lo[ids] > centre]
+        here = ids[(self.lo[ids] <= centre) & (self.hi[ids] >= centre)]
+        by_lo = here[np.argsort(self.lo[here], kind="stable")]
+        by_hi = here[np.argsort(-self.hi[here], kind="stable")]
+        return (centre, by_lo, self.lo[by_lo], by_hi, self.hi[by_hi], self._build(left), self._build(right))
+
+    def stabbing(self, point: float) -> np.ndarray:
+        """Positions of ranges containing ``point``."""
+        chunks: List[np.ndarray] = []
+        node = self._root
+        while node is not None:
+            centre, by_lo, los, by_hi, his, left, right = node
+            if point < centre:
+                chunks.append(by_lo[:np.searchsorted(los, point, "right")])
+                node = left
+            elif point > centre:
+                chunks.append(by_hi[:np.searchsorted(-his, -point, "right")])
+                node = right
+            else:
+                chunks.append(by_lo)
+                break
+        return np.concatenate(chunks) if chunks else np.array([], dtype=int)
+
+    def overlapping(self, lo: float, hi: float) -> np.ndarray:
+        """Positions of ranges intersecting ``[lo, hi]`` (endpoints inclusive)."""
+        if lo > hi:
+            return np.array([], dtype=int)
+        start = np.searchsorted(self._sorted_lo, lo, "right")
+        end = np.searchsorted(self._sorted_lo, hi, "right")
+        return np.concatenate([self.stabbing(lo), self._by_lo[start:end]])
@@ -0,0 +1,129 @@
+"""Investment clustering on amount, location, origin and incentive features.
+
+Rows are encoded into one dense matrix: standardised log amount, one-hot
+sector/province/origin blocks (each scaled so a mismatch adds a unit squared
+distance) and SEZ/export/technology-transfer flags. Centroids come from
+mini-batch k-means; afterwards ``partial_fit`` absorbs new rows with the
+mini-batch update (each centroid moves towards its new members at a rate of
+one over its member count), which keeps refreshes incremental.
+
+The fitted state is plain arrays and lists, so ``to_params``/``from_params``
+round-trip it through JSON without unpickling anything.
+"""
+from typing import Dict, List
+
+import numpy as np
+import pandas as pd
+from sklearn.cluster import MiniBatchKMeans
+from sklearn.metrics.pairwise import euclidean_distances
+
+CATEGORICAL = ["sector", "province", "country"]
+FLAGS = ["in_sez", "export_oriented", "technology_transfer"]
+FEATURE_COLUMNS = ["amount"] + CATEGORICAL + FLAGS
+MAX_COUNTRIES = 25
+
+
+class InvestmentClusterer:
+    def __init__(self, n_clusters: int = 6, random_state: int = 0):
+        self.n_clusters = n_clusters
+        self.random_state = random_state
+        self.fitted = False
+
+    def _vocabulary(self, rows: pd.DataFrame):
+        self.vocab = {col: sorted(rows[col].dropna().unique().tolist()) for col in ("sector", "province")}
+        # Long-tail origins share the all-zero "other" encoding.
+        self.vocab["country"] = rows["country"].value_counts().index[:MAX_COUNTRIES].sort_values().tolist()
+        amounts = np.log1p(rows["amount"].to_numpy(dtype=float))
+        self.amount_mean, self.amount_std = float(amounts.mean()), float(amounts.std() or 1.0)
+
+    def encode(self, rows: pd.DataFrame) -> np.ndarray:
+        n = len(rows)
+        blocks = [((np.log1p(rows["amount"].to_numpy(dtype=float)) - self.amount_mean) / self.amount_std)[:, None]]
+        for col in CATEGORICAL:
+            codes = pd.Categorical(rows[col], categories=self.vocab[col]).codes
+            block = np.zeros((n, len(self.vocab[col])))
+            known = codes >= 0
+            block[np.flatnonzero(known), codes[known]] = np.sqrt(0.5)
+            blocks.append(block)
+        blocks.append(rows[FLAGS].to_numpy(dtype=float))
+        return np.hstack(blocks)
+
+    def unseen(self, rows: pd.DataFrame) -> int:
+        """Rows with a sector or province the encoding has no column for."""
+        return int(sum((rows[col].notna() & ~rows[col].isin(self.vocab[col])).sum()
+                       for col in ("sector", "province")))
+
+    def fit(self, rows: pd.DataFrame) -> "InvestmentClusterer":
+        self._vocabulary(rows)
+        model = MiniBatchKMeans(n_clusters=min(self.n_clusters, len(rows)), random_state=self.random_state,
+                                batch_size=1024, n_init=3).fit(self.encode(rows))
+        self.centers = model.cluster_centers_
+        self.counts = np.bincount(model.labels_, minlength=len(self.centers)).astype(float)
+        self.fitted_rows = len(rows)
+        self.fitted = True
+        return self
+
+    def partial_fit(self, rows: pd.DataFrame) -> "InvestmentClusterer":
+        encoded = self.encode(rows)
+        labels = euclidean_distances(encoded, self.centers).argmin(axis=1)
+        added = np.bincount(labels, minlength=len(self.centers))
+        sums = np.zeros_like(self.centers)
+        np.add.at(sums, labels, encoded)
+        self.counts = self.counts + added
+        moved = added > 0
+        self.centers = self.centers.copy()
+        self.centers[moved] += (sums[moved] - added[moved, None] * self.centers[moved]) / self.counts[moved, None]
+        return self
+
+    def predict(self, rows: pd.DataFrame):
+        """Cluster labels and distances to the assigned centroid."""
+        distances = euclidean_distances(self.encode(rows), self.centers)
+        labels = distances.argmin(axis=1)
+        return labels, distances[np.arange(len(labels)), labels]
+
+    def to_params(self) -> Dict:
+        return {"n_clusters": self.n_clusters, "random_state": self.random_state, "vocab": self.vocab,
+                "amount_mean": self.amount_mean, "amount_std": self.amount_std, "fitted_rows": self.fitted_rows,
+                "centers": self.centers.tolist(), "counts": self.counts.tolist()}
+
+    @classmethod
+    def from_params(cls, params: Dict) -> "InvestmentClusterer":
+        clusterer = cls(params["n_clusters"], params["random_state"])
+        clusterer.vocab = params["vocab"]
+        clusterer.amount_mean, clusterer.amount_std = params["amount_mean"], params["amount_std"]
+        clusterer.centers = np.asarray(params["centers"], dtype=float)
+        clusterer.counts = np.asarray(params["counts"], dtype=float)
+        clusterer.fitted_rows, clusterer.fitted = params["fitted_rows"], True
+        return clusterer
+
+
+def _size_label(cluster_median: float, overall_median: float) -> str:
+    if cluster_median > overall_median * 2:
+        return "Large"
+    return "Small" if cluster_median < overall_median / 2 else "Mid-size"
+
+
+def describe_clusters(rows: pd.DataFrame, labels: np.ndarray, top: int = 5) -> List[Dict]:
+    """Summaries of each cluster from its members' raw attributes."""
+    frame = rows.assign(cluster=labels)
+    median = frame["amount"].median()
+    patterns = []
+    for cluster_id, members in frame.groupby("cluster", sort=True):
+        sectors = members["sector_name"].fillna("Unknown").value_counts()
+        provinces = members["province"].dropna().value_counts()
+        origins = members["country"].dropna().value_counts()
+        avg = float(members["amount"].mean())
+        size = _size_label(members["amount"].median(), median)
+        lead = sectors.index[0]
+        where = f" in {provinces.index[0]}" if len(provinces) else ""
+        patterns.append({
+            "cluster_id": int(cluster_id), "pattern_name": f"{size} {lead} Investments{where}",
+            "description": f"Cluster of {len(members)} investments led by {lead} averaging ${avg / 1e6:.1f}M",
+            "investment_count": int(len(members)), "avg_amount": avg,
+            "top_sectors": sectors.index[:top].tolist(), "top_origins": origins.index[:top].tolist(),
+            "top_provinces": provinces.index[:top].tolist(),
+            "sez_share": round(float(members["in_sez"].mean()), 4),
+            "export_share": round(float(members["export_oriented"].mean()), 4),
+            "tech_transfer_share": round(float(members["technology_transfer"].mean()), 4),
+        })
+    return sorted(patterns, key=lambda p: p["investment_count"], reverse=True)
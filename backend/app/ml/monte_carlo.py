@@ -1,6 +1,6 @@
 """Monte Carlo simulation engine for probabilistic impact estimation."""
 import numpy as np
-from typing import Dict
+from typing import Dict, Optional
 
 
 class MonteCarloEngine:
@@ -26,7 +26,7 @@ class MonteCarloEngine:
 
     def run_simulation(
         self, investment_amount: float, sector: str, num_simulations: int = 10000,
-        scenario: str = "base", years: int = 5,
+        scenario: str = "base", years: int = 5, seed: Optional[int] = None,
     ) -> Dict:
         params = self.SCENARIO_PARAMS.get(scenario, self.SCENARIO_PARAMS["base"])
         sector_key = sector.lower().replace(" ", "_").replace("&", "and")
@@ -35,10 +35,10 @@ class MonteCarloEngine:
         mean_return = params["return_mean"] + adj["return_adj"]
         std_return = params["return_std"] + adj["vol_adj"]
 
-        np.random.seed(None)
-        annual_returns = np.random.normal(mean_return, std_return, (num_simulations, years))
-        fx_shocks = np.random.normal(0, params["fx_vol"], (num_simulations, years))
-        demand_shocks = np.random.normal(0, params["demand_var"], (num_simulations, years))
+        rng = np.random.default_rng(seed)
+        annual_returns = rng.normal(mean_return, std_return, (num_simulations, years))
+        fx_shocks = rng.normal(0, params["fx_vol"], (num_simulations, years))
+        demand_shocks = rng.normal(0, params["demand_var"], (num_simulations, years))
         effective_returns = annual_returns - 0.3 * np.abs(fx_shocks) - 0.2 * np.abs(demand_shocks)
         cumulative = np.prod(1 + effective_returns, axis=1)
         outcomes = investment_amount * cumulative
@@ -102,14 +102,13 @@ class MultiplierModel:
             "output_multiplier": total_output / amount if amount > 0 else 0,
         }
 
-    def calculate_job_creation(self, amount: float, sector: str) -> Dict:
+    def calculate_job_creation(self, amount: float, sector: str, impact: Optional[Dict] = None) -> Dict:
+        """Job counts; pass a precomputed ``calculate_total_impact`` result to skip recomputation."""
         sector = self._validate_sector(sector)
-        direct = self.calculate_direct_impact(amount, sector)
-        indirect = self.calculate_indirect_impact(amount, sector)
-        induced = self.calculate_induced_impact(amount, sector)
-        direct_jobs = direct["direct_jobs"]
-        indirect_jobs = indirect["indirect_jobs"]
-        induced_jobs = induced["induced_jobs"]
+        impact = impact or self.calculate_total_impact(amount, sector)
+        direct_jobs = impact["direct"]["direct_jobs"]
+        indirect_jobs = impact["indirect"]["indirect_jobs"]
+        induced_jobs = impact["induced"]["induced_jobs"]
         total_jobs = direct_jobs + indirect_jobs + induced_jobs
         skills = self.SKILLS_DISTRIBUTION.get(sector, self.SKILLS_DISTRIBUTION["manufacturing"])
         gender_female_pct = 0.40 if sector in ("tourism", "agriculture", "health") else 0.30
@@ -129,7 +128,7 @@ class MultiplierModel:
 
     def calculate_tax_revenue(
         self, amount: float, sector: str, is_sez: bool = False,
-        sez_incentives: Optional[Dict] = None,
+        sez_incentives: Optional[Dict] = None, jobs: Optional[Dict] = None,
     ) -> Dict:
         sector = self._validate_sector(sector)
         m = self.SECTOR_MULTIPLIERS[sector]
@@ -143,7 +142,7 @@ class MultiplierModel:
         profit_margin = 0.15
         corporate_tax = annual_revenue * profit_margin * corp_rate
         vat = annual_revenue * 0.075
-        jobs = self.calculate_job_creation(amount, sector)
+        jobs = jobs or self.calculate_job_creation(amount, sector)
         avg_salary = 8000
         paye = jobs["direct_jobs"] * avg_salary * 0.25
         withholding = annual_revenue * 0.02
@@ -1,6 +1,6 @@
 """Investment recommendation algorithms for matching engine."""
 import numpy as np
-from typing import List, Dict, Optional
+from typing import Callable, List, Dict, Optional, Tuple
 
 
 class InvestmentRecommender:
@@ -11,18 +11,25 @@ class InvestmentRecommender:
         "geographic_match": 10, "sez_alignment": 10,
         "historical_similarity": 10, "semantic_match": 10,
     }
+    SEMANTIC_NEUTRAL = 5.0  # investors without inquiry text
+    SEMANTIC_SATURATION = 0.4  # TF-IDF cosine that earns the full semantic weight
+    ADJACENT_SECTORS = {
+        "min": ["enr", "inf"], "agr": ["man", "hlt"], "tou": ["inf", "ict"],
+        "man": ["agr", "min"], "ict": ["fin", "man"], "enr": ["min", "inf"],
+        "inf": ["enr", "man"], "fin": ["ict", "man"], "hlt": ["agr", "man"],
+    }
+    HISTORY_PRIOR_STRENGTH = 5.0  # interactions at which collaborative history and the prior weigh equally
+
+    def __init__(self, history: Optional[Callable[[Dict, Dict], Optional[Tuple[float, float]]]] = None):
+        # Returns (sector affinity in [0, 1], supporting interactions) for an investor/opportunity pair.
+        self.history = history
 
     def _sector_score(self, investor: Dict, opportunity: Dict) -> float:
         inv_sectors = set(s.lower() for s in investor.get("sectors_of_interest", []))
         opp_sector = opportunity.get("sector_code", "").lower()
         if opp_sector in inv_sectors:
             return 25.0
-        adjacent = {
-            "min": ["enr", "inf"], "agr": ["man", "hlt"], "tou": ["inf", "ict"],
-            "man": ["agr", "min"], "ict": ["fin", "man"], "enr": ["min", "inf"],
-            "inf": ["enr", "man"], "fin": ["ict", "man"], "hlt": ["agr", "man"],
-        }
-        adj_sectors = adjacent.get(opp_sector, [])
+        adj_sectors = self.ADJACENT_SECTORS.get(opp_sector, [])
         if any(s in inv_sectors for s in adj_sectors):
             return 15.0
         return 0.0
@@ -62,15 +69,30 @@ class InvestmentRecommender:
             return 5.0
         return 2.0
 
-    def compute_match_score(self, investor: Dict, opportunity: Dict) -> Dict:
+    def _history_score(self, investor: Dict, opportunity: Dict) -> float:
+        prior = 5.0 + (3.0 if investor.get("previous_zimbabwe_investments") else 0)
+        found = self.history(investor, opportunity) if self.history else None
+        if found is None:
+            return prior
+        affinity, evidence = found
+        weight = evidence / (evidence + self.HISTORY_PRIOR_STRENGTH)
+        return round(weight * affinity * self.WEIGHTS["historical_similarity"] + (1 - weight) * prior, 2)
+
+    def _semantic_score(self, similarity: Optional[float]) -> float:
+        if similarity is None:
+            return self.SEMANTIC_NEUTRAL
+        return round(min(similarity / self.SEMANTIC_SATURATION, 1.0) * self.WEIGHTS["semantic_match"], 2)
+
+    def compute_match_score(self, investor: Dict, opportunity: Dict, similarity: Optional[float] = None) -> Dict:
+        """Weighted score; ``similarity`` is the inquiry-to-opportunity text cosine, if the investor wrote one."""
         scores = {
             "sector_alignment": self._sector_score(investor, opportunity),
             "size_fit": self._size_score(investor, opportunity),
             "risk_compatibility": self._risk_score(investor, opportunity),
             "geographic_match": self._geo_score(investor, opportunity),
             "sez_alignment": self._sez_score(investor, opportunity),
-            "historical_similarity": 5.0 + (3.0 if investor.get("previous_zimbabwe_investments") else 0),
-            "semantic_match": 5.0,
+            "historical_similarity": self._history_score(investor, opportunity),
+            "semantic_match": self._semantic_score(similarity),
         }
         total = sum(scores.values())
         return {"overall_score": round(total, 1), "breakdown": scores}
@@ -85,10 +107,11 @@ class InvestmentRecommender:
                 parts.append(f"{label} ({score:.0f}/{self.WEIGHTS[factor]})")
         return f"Top matching factors: {', '.join(parts)}" if parts else "Low overall compatibility"
 
-    def rank_opportunities(self, investor: Dict, opportunities: List[Dict]) -> List[Dict]:
+    def rank_opportunities(self, investor: Dict, opportunities: List[Dict],
+                           similarities: Optional[Dict[str, float]] = None) -> List[Dict]:
         results = []
         for opp in opportunities:
-            scores = self.compute_match_score(investor, opp)
+            scores = self.compute_match_score(investor, opp, similarities.get(opp.get("id")) if similarities else None)
             explanation = self.explain_match(investor, opp, scores)
             results.append({
                 "id": opp.get("id", ""),
@@ -102,10 +125,11 @@ class InvestmentRecommender:
             r["rank"] = i + 1
         return results
 
-    def rank_investors(self, opportunity: Dict, investors: List[Dict]) -> List[Dict]:
+    def rank_investors(self, opportunity: Dict, investors: List[Dict],
+                       similarities: Optional[Dict[str, float]] = None) -> List[Dict]:
         results = []
         for inv in investors:
-            scores = self.compute_match_score(inv, opportunity)
+            scores = self.compute_match_score(inv, opportunity, similarities.get(inv.get("id")) if similarities else None)
             explanation = self.explain_match(inv, opportunity, scores)
             results.append({
                 "id": inv.get("id", ""),
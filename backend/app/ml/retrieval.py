@@ -0,0 +1,111 @@
+"""Two-stage candidate retrieval over an opportunity catalogue.
+
+Stage one unions cheap prefilter indexes: sector buckets (interests and their
+adjacent sectors), province buckets and an interval tree over investment
+ranges. Stage two ranks the prefiltered rows with one inner product
+between a dense feature matrix (sector, province, risk and SEZ one-hots) and
+a query vector carrying the recommender's weights for the investor, plus the
+vectorised size fit. Only the best ``limit`` rows go on to full scoring.
+"""
+from typing import Dict, List
+
+import numpy as np
+
+from app.ml.interval_index import IntervalIndex
+from app.ml.recommender import InvestmentRecommender
+
+RISK_LEVELS = ["low", "medium", "high"]
+
+
+def _buckets(keys: List[str]) -> Dict[str, np.ndarray]:
+    positions: Dict[str, List[int]] = {}
+    for i, key in enumerate(keys):
+        positions.setdefault(key, []).append(i)
+    return {key: np.array(rows) for key, rows in positions.items()}
+
+
+class CandidateIndex:
+    def __init__(self, records: List[Dict]):
+        self.records = records
+        self.lo = np.array([r["minimum_investment"] for r in records], dtype=float)
+        self.hi = np.array([r["maximum_investment"] for r in records], dtype=float)
+        self.sizes = IntervalIndex(self.lo, self.hi)
+        sectors = [r["sector_code"].lower() for r in records]
+        provinces = [r["province"].lower() for r in records]
+        self.by_sector, self.by_province = _buckets(sectors), _buckets(provinces)
+        self.sector_vocab, self.province_vocab = sorted(self.by_sector), sorted(self.by_province)
+
+        n, n_sec, n_prov = len(records), len(self.sector_vocab), len(self.province_vocab)
+        self.features = np.zeros((n, n_sec + n_prov + len(RISK_LEVELS) + 1))
+        rows = np.arange(n)
+        sector_col = {s: i for i, s in enumerate(self.sector_vocab)}
+        province_col = {p: n_sec + i for i, p in enumerate(self.province_vocab)}
+        # Unknown risk levels score as medium, as in the recommender.
+        risk_col = [n_sec + n_prov + (RISK_LEVELS.index(r["risk_level"]) if r["risk_level"] in RISK_LEVELS else 1)
+                    for r in records]
+        self.features[rows, [sector_col[s] for s in sectors]] = 1.0
+        self.features[rows, [province_col[p] for p in provinces]] = 1.0
+        self.features[rows, risk_col] = 1.0
+        self.features[:, -1] = [1.0 if r["sez_id"] else 0.0 for r in records]
+
+    def __len__(self):
+        return len(self.records)
+
+    def _sector_weights(self, investor: Dict) -> Dict[str, float]:
+        interests = {s.lower() for s in investor.get("sectors_of_interest", [])}
+        weights = {}
+        for sector in self.sector_vocab:
+            if sector in interests:
+                weights[sector] = 25.0
+            elif interests & set(InvestmentRecommender.ADJACENT_SECTORS.get(sector, [])):
+                weights[sector] = 15.0
+        return weights
+
+    def query_vector(self, investor: Dict) -> np.ndarray:
+        """Weights reproducing the recommender's sector, geography, risk and SEZ scores up to a constant."""
+        sectors = self._sector_weights(investor)
+        prefs = {p.lower() for p in investor.get("geographic_preferences", [])}
+        appetite = RISK_LEVELS.index(investor["risk_appetite"]) if investor.get("risk_appetite") in RISK_LEVELS else 1
+        risk = [{0: 15.0, 1: 8.0, 2: 2.0}[abs(appetite - level)] for level in range(len(RISK_LEVELS))]
+        return np.concatenate([
+            [sectors.get(s, 0.0) for s in self.sector_vocab],
+            [8.0 if p in prefs else 0.0 for p in self.province_vocab],
+            risk, [8.0 if investor.get("sez_interest") else -3.0],
+        ])
+
+    def size_scores(self, investor: Dict, positions: np.ndarray) -> np.ndarray:
+        """Vectorised ``InvestmentRecommender._size_score`` for the given rows."""
+        inv_min, inv_max = investor["investment_range_min"], investor["investment_range_max"]
+        overlap = np.minimum(inv_max, self.hi[positions]) - np.maximum(inv_min, self.lo[positions])
+        inv_range = inv_max - inv_min if inv_max != np.inf else inv_min * 10
+        ratio = overlap / inv_range if inv_range > 0 else np.ones(len(positions))
+        return np.where(overlap >= 0, np.minimum(ratio * 20.0, 20.0), 0.0)
+
+    def size_overlapping(self, investor: Dict) -> np.ndarray:
+        """Positions of opportunities whose range overlaps the investor's, in catalogue order."""
+        return np.sort(self.sizes.overlapping(investor["investment_range_min"], investor["investment_range_max"]))
+
+    def prefilter(self, investor: Dict) -> np.ndarray:
+        parts = [self.size_overlapping(investor)]
+        parts += [self.by_sector[s] for s in self._sector_weights(investor)]
+        parts += [self.by_province[p] for p in {p.lower() for p in investor.get("geographic_preferences", [])}
+                  if p in self.by_province]
+        return np.unique(np.concatenate(parts))
+
+    def candidates(self, investor: Dict, limit: int, size_overlap: bool = False) -> List[Dict]:
+        """Up to ``limit`` records most likely to score highest for ``investor``.
+
+        With ``size_overlap`` only opportunities overlapping the investor's range are eligible.
+        """
+        if not self.records:
+            return []
+        if size_overlap:
+            positions = self.size_overlapping(investor)
+        else:
+            positions = self.prefilter(investor)
+            if len(positions) < limit:
+                positions = np.arange(len(self.records))
+        proxy = self.features[positions] @ self.query_vector(investor) + self.size_scores(investor, positions)
+        if len(positions) > limit:
+            positions = positions[np.argpartition(-proxy, limit - 1)[:limit]]
+        return [self.records[i] for i in positions]
@@ -1,7 +1,39 @@
 """Sector risk-return profiling using Modern Portfolio Theory."""
 import numpy as np
 from typing import List, Dict, Optional
+from numpy.lib.stride_tricks import sliding_window_view
 from scipy.optimize import minimize
+from scipy.stats import norm
+
+from app.ml.covariance import shrunk_correlation
+
+
+def downside_deviation(mean: np.ndarray, vol: np.ndarray, target: float) -> np.ndarray:
+    """sqrt(E[min(R - target, 0)^2]) for R ~ N(mean, vol^2), elementwise."""
+    d = target - mean
+    with np.errstate(divide="ignore", invalid="ignore"):
+        a = np.where(vol > 0, d / vol, np.where(d > 0, np.inf, -np.inf))
+        second_moment = (d ** 2 + vol ** 2) * norm.cdf(a) + np.where(vol > 0, d * vol * norm.pdf(a), 0.0)
+    return np.sqrt(np.maximum(second_moment, 0.0))
+
+
+def rolling_sharpe(history: np.ndarray, window: int, risk_free: float, periods_per_year: int = 4) -> np.ndarray:
+    """Annualised Sharpe ratio of each column over every trailing ``window`` (rows: windows, cols: series)."""
+    history = np.asarray(history, dtype=float)
+    if history.shape[0] < window or window < 2:
+        return np.empty((0, history.shape[1]))
+    windows = sliding_window_view(history, window, axis=0)  # (windows, series, window)
+    excess = windows - ((1 + risk_free) ** (1 / periods_per_year) - 1)
+    mean, std = excess.mean(axis=-1), excess.std(axis=-1, ddof=1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(std > 0, mean / std * np.sqrt(periods_per_year), 0.0)
+
+
+def metric_records(columns: Dict) -> List[Dict]:
+    """Turn columnar metrics into one dict per row (NumPy values as plain Python)."""
+    keys = list(columns)
+    values = [np.asarray(columns[k]).tolist() for k in keys]
+    return [dict(zip(keys, row)) for row in zip(*values)]
 
 
 class RiskScorer:
@@ -10,44 +42,63 @@ class RiskScorer:
     RISK_FREE_RATE = 0.08  # Zimbabwe T-bill rate
 
     def calculate_sector_metrics(self, sector_data: List[Dict]) -> List[Dict]:
-        results = []
-        all_returns = [s.get("avg_return_rate", 0.1) for s in sector_data]
-        market_return = np.mean(all_returns) if all_returns else 0.1
-        market_vol = np.std(all_returns) if len(all_returns) > 1 else 0.05
-
-        for s in sector_data:
-            ret = s.get("avg_return_rate", 0.1)
-            risk = s.get("risk_score", 50) / 100.0
-            vol = risk * 0.3
-            sharpe = (ret - self.RISK_FREE_RATE) / vol if vol > 0 else 0
-            beta = (ret - self.RISK_FREE_RATE) / (market_return - self.RISK_FREE_RATE) if (market_return - self.RISK_FREE_RATE) != 0 else 1.0
-            results.append({
-                "sector_name": s.get("name", ""),
-                "sector_code": s.get("code", ""),
-                "avg_return": round(ret, 4),
-                "volatility": round(vol, 4),
-                "sharpe_ratio": round(sharpe, 4),
-                "beta": round(beta, 4),
-                "total_investment": s.get("total_investment", 0),
-                "investment_count": s.get("investment_count", 0),
-            })
-        return results
+        columns = self.sector_metrics(
+            np.array([s.get("avg_return_rate", 0.1) for s in sector_data], dtype=float),
+            np.array([s.get("risk_score", 50) for s in sector_data], dtype=float),
+            np.array([s.get("total_investment", 0) for s in sector_data], dtype=float),
+            np.array([s.get("investment_count", 0) for s in sector_data], dtype=int),
+        )
+        return metric_records({"sector_name": [s.get("name", "") for s in sector_data],
+                               "sector_code": [s.get("code", "") for s in sector_data], **columns})
+
+    def sector_metrics(self, returns: np.ndarray, risk_scores: np.ndarray, totals: Optional[np.ndarray] = None,
+                       counts: Optional[np.ndarray] = None, history: Optional[np.ndarray] = None,
+                       window: int = 4, periods_per_year: int = 4) -> Dict[str, np.ndarray]:
+        """Risk-return metrics for every sector (or sub-sector/province) at once.
+
+        Inputs are parallel arrays; the result maps each metric to an array in
+        the same order. Volatility is modelled from the 0-100 risk score, and
+        downside deviation is the semideviation below the risk-free rate under
+        a normal model with that volatility, so Sharpe and Sortino share one
+        return model. ``history`` (periods x sectors) adds annualised rolling
+        Sharpe ratios over ``window`` periods.
+        """
+        n = len(returns)
+        market_return = returns.mean() if n else 0.1
+        vol = risk_scores / 100.0 * 0.3
+        excess = returns - self.RISK_FREE_RATE
+        market_excess = market_return - self.RISK_FREE_RATE
+        downside = downside_deviation(returns, vol, self.RISK_FREE_RATE)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            sharpe = np.where(vol > 0, excess / vol, 0.0)
+            sortino = np.where(downside > 0, excess / downside, 0.0)
+            beta = excess / market_excess if market_excess != 0 else np.ones(n)
+        columns = {
+            "avg_return": np.round(returns, 4), "volatility": np.round(vol, 4),
+            "sharpe_ratio": np.round(sharpe, 4), "beta": np.round(beta, 4),
+            "downside_deviation": np.round(downside, 4), "sortino_ratio": np.round(sortino, 4),
+            "total_investment": np.zeros(n) if totals is None else totals,
+            "investment_count": np.zeros(n, dtype=int) if counts is None else counts,
+        }
+        if history is not None:
+            columns["rolling_sharpe"] = np.round(
+                rolling_sharpe(history, window, self.RISK_FREE_RATE, periods_per_year), 4).T
+        return columns
 
-    def compute_correlation_matrix(self, returns_data: Dict[str, List[float]]) -> Dict:
+    def compute_correlation_matrix(self, returns_data: Dict[str, List[float]], shrink: bool = False) -> Dict:
+        """Correlation of all series at once, truncated to the shortest; ``shrink`` applies Ledoit-Wolf."""
         sectors = list(returns_data.keys())
         n = len(sectors)
-        matrix = np.eye(n)
-        for i in range(n):
-            for j in range(i + 1, n):
-                r1 = np.array(returns_data[sectors[i]])
-                r2 = np.array(returns_data[sectors[j]])
-                min_len = min(len(r1), len(r2))
-                if min_len > 1:
-                    corr = np.corrcoef(r1[:min_len], r2[:min_len])[0, 1]
-                else:
-                    corr = 0.0
-                matrix[i, j] = corr
-                matrix[j, i] = corr
+        length = min((len(v) for v in returns_data.values()), default=0)
+        if n < 2 or length < 2:
+            return {"sectors": sectors, "matrix": np.eye(n).tolist()}
+        aligned = np.array([returns_data[s][:length] for s in sectors], dtype=float).T
+        if shrink:
+            matrix, _ = shrunk_correlation(aligned)
+        else:
+            with np.errstate(invalid="ignore", divide="ignore"):
+                matrix = np.nan_to_num(np.corrcoef(aligned, rowvar=False))
+            np.fill_diagonal(matrix, 1.0)
         return {"sectors": sectors, "matrix": matrix.tolist()}
 
     def efficient_frontier(self, expected_returns: np.ndarray, cov_matrix: np.ndarray,
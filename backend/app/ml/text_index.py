@@ -0,0 +1,86 @@
+"""Incrementally maintained TF-IDF index over a keyed collection of documents.
+
+Terms are hashed, so there is no vocabulary to refit: adding, replacing or
+removing a document only updates its term-frequency row and the document
+frequency counts. IDF weights and L2 normalisation are applied when the
+matrix is next read, and a query is scored against every document with one
+sparse matrix product.
+"""
+import threading
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+from scipy.sparse import csr_matrix, diags, vstack
+from sklearn.feature_extraction.text import HashingVectorizer
+from sklearn.preprocessing import normalize
+
+
+class TextIndex:
+    def __init__(self, n_features: int = 2 ** 18):
+        self.vectorizer = HashingVectorizer(n_features=n_features, alternate_sign=False, norm=None,
+                                            stop_words="english")
+        self._rows: Dict[str, csr_matrix] = {}
+        self._df = np.zeros(n_features)
+        self._lock = threading.Lock()
+        self._ids: List[str] = []
+        self._positions: Dict[str, int] = {}
+        self._matrix: Optional[csr_matrix] = None
+
+    def __len__(self):
+        return len(self._rows)
+
+    def _tf(self, texts: List[str]) -> csr_matrix:
+        tf = self.vectorizer.transform(texts).tocsr()
+        tf.data = 1 + np.log(tf.data)  # sublinear term frequency
+        return tf
+
+    def _weigh(self, tf: csr_matrix) -> csr_matrix:
+        idf = np.log((1 + len(self._rows)) / (1 + self._df)) + 1
+        return normalize(tf @ diags(idf))
+
+    def upsert(self, docs: Dict[str, str]):
+        if not docs:
+            return
+        ids = list(docs)
+        tf = self._tf([docs[i] for i in ids])
+        with self._lock:
+            for k, doc_id in enumerate(ids):
+                old = self._rows.get(doc_id)
+                if old is not None:
+                    self._df[old.indices] -= 1
+                row = tf[k]
+                self._df[row.indices] += 1
+                self._rows[doc_id] = row
+            self._matrix = None
+
+    def remove(self, ids: Iterable[str]):
+        with self._lock:
+            for doc_id in ids:
+                old = self._rows.pop(doc_id, None)
+                if old is not None:
+                    self._df[old.indices] -= 1
+            self._matrix = None
+
+    def _snapshot(self):
+        with self._lock:
+            if self._matrix is None and self._rows:
+                self._ids = list(self._rows)
+                self._positions = {doc_id: i for i, doc_id in enumerate(self._ids)}
+                self._matrix = self._weigh(vstack([self._rows[i] for i in self._ids]).tocsr())
+            return self._positions, self._matrix
+
+    def scores(self, text: str) -> Dict[str, float]:
+        """Cosine similarity of ``text`` to every indexed document."""
+        positions, matrix = self._snapshot()
+        if matrix is None:
+            return {}
+        sims = (matrix @ self._weigh(self._tf([text])).T).toarray().ravel()
+        return dict(zip(positions, sims.tolist()))
+
+    def similarity_to(self, doc_id: str, texts: List[str]) -> np.ndarray:
+        """Cosine similarity of each of ``texts`` to one indexed document (zeros if it is not indexed)."""
+        positions, matrix = self._snapshot()
+        if matrix is None or doc_id not in positions or not texts:
+            return np.zeros(len(texts))
+        row = matrix[positions[doc_id]]
+        return (self._weigh(self._tf(texts)) @ row.T).toarray().ravel()
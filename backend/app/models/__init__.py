@@ -3,6 +3,9 @@ from app.models.investor import InvestorProfile, InvestmentOpportunity
 from app.models.sector import Sector
 from app.models.indicator import MacroeconomicIndicator
 from app.models.user import User
+from app.models.job import Job
+from app.models.backtest import BacktestResult
+from app.models.cluster import ClusterModel, InvestmentCluster
 
 __all__ = [
     "Investment",
@@ -12,4 +15,8 @@ __all__ = [
     "Sector",
     "MacroeconomicIndicator",
     "User",
+    "Job",
+    "BacktestResult",
+    "InvestmentCluster",
+    "ClusterModel",
 ]
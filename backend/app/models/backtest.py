@@ -0,0 +1,27 @@
+"""Stored rolling-origin backtest metrics per forecast model and series."""
+import uuid
+from datetime import datetime
+from sqlalchemy import Column, String, Float, Integer, DateTime, UniqueConstraint
+from app.database import Base
+
+
+def gen_uuid():
+    return str(uuid.uuid4())
+
+
+class BacktestResult(Base):
+    """Forecast accuracy of one model on one indicator series at one horizon."""
+    __tablename__ = "backtest_results"
+    __table_args__ = (UniqueConstraint("series", "model", "horizon", name="uq_backtest_series_model_horizon"),)
+
+    id = Column(String(36), primary_key=True, default=gen_uuid)
+    series = Column(String(100), nullable=False, index=True)  # indicator_name
+    model = Column(String(50), nullable=False)  # linear, holt_winters, ets, arima
+    horizon = Column(Integer, nullable=False)
+    folds = Column(Integer, default=0)
+    mape = Column(Float)
+    mase = Column(Float)
+    coverage = Column(Float)  # share of actuals inside the prediction interval
+    confidence = Column(Float)
+    fingerprint = Column(String(64), nullable=False)  # series fingerprint the metrics were computed on
+    evaluated_at = Column(DateTime, default=datetime.utcnow)
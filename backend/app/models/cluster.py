@@ -0,0 +1,32 @@
+"""Persisted investment cluster assignments and the models that produced them."""
+import uuid
+from datetime import datetime
+from sqlalchemy import Column, String, Float, Integer, DateTime, ForeignKey, JSON
+from app.database import Base
+
+
+def gen_uuid():
+    return str(uuid.uuid4())
+
+
+class InvestmentCluster(Base):
+    """Cluster an investment was assigned to by a given clustering model version."""
+    __tablename__ = "investment_clusters"
+
+    id = Column(String(36), primary_key=True, default=gen_uuid)
+    investment_id = Column(String(36), ForeignKey("investments.id"), nullable=False, unique=True)
+    cluster_id = Column(Integer, nullable=False, index=True)
+    distance = Column(Float)  # to the assigned centroid
+    model_version = Column(String(36), nullable=False)
+    assigned_at = Column(DateTime, default=datetime.utcnow)
+
+
+class ClusterModel(Base):
+    """Fitted clustering parameters (``InvestmentClusterer.to_params``), keyed by the version its assignments record."""
+    __tablename__ = "cluster_models"
+
+    version = Column(String(36), primary_key=True, default=gen_uuid)
+    revision = Column(Integer, nullable=False, default=0)  # bumped by each incremental partial_fit
+    fitted_rows = Column(Integer, nullable=False)
+    parameters = Column(JSON, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow, index=True)
@@ -1,7 +1,7 @@
 """Macroeconomic indicator model."""
 import uuid
 from datetime import datetime, date
-from sqlalchemy import Column, String, Float, Date, DateTime
+from sqlalchemy import Column, String, Float, Date, DateTime, Index
 from app.database import Base
 
 
@@ -12,6 +12,7 @@ def gen_uuid():
 class MacroeconomicIndicator(Base):
     """Zimbabwe macroeconomic indicators from ZIMSTAT, RBZ, World Bank, IMF."""
     __tablename__ = "macroeconomic_indicators"
+    __table_args__ = (Index("ix_macro_indicator_name_period", "indicator_name", "period"),)
 
     id = Column(String(36), primary_key=True, default=gen_uuid)
     indicator_name = Column(String(100), nullable=False)
@@ -20,3 +21,4 @@ class MacroeconomicIndicator(Base):
     source = Column(String(100))
     unit = Column(String(50))
     created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, onupdate=datetime.utcnow)
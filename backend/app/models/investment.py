@@ -19,7 +19,7 @@ class Investment(Base):
     investor_name = Column(String(255))
     investor_country = Column(String(100))
     sector_id = Column(String(36), ForeignKey("sectors.id"), nullable=True)
-    investment_amount_usd = Column(Float, nullable=False)
+    investment_amount_usd = Column(Float, nullable=False, index=True)
     jobs_created = Column(Integer, default=0)
     jobs_projected = Column(Integer)
     licence_type = Column(String(50))  # investment_licence, special_licence, sez_permit
@@ -19,7 +19,7 @@ class InvestorProfile(Base):
     country_of_origin = Column(String(100))
     investor_type = Column(String(50))  # corporate, private_equity, sovereign_fund, dfi, individual
     sectors_of_interest = Column(JSON)  # List of sector codes
-    investment_range_min = Column(Float)
+    investment_range_min = Column(Float, index=True)
     investment_range_max = Column(Float)
     risk_appetite = Column(String(20))  # low, medium, high
     geographic_preferences = Column(JSON)  # List of provinces
@@ -43,7 +43,7 @@ class InvestmentOpportunity(Base):
     sector_id = Column(String(36), ForeignKey("sectors.id"), nullable=True)
     province = Column(String(100))
     district = Column(String(100))
-    minimum_investment = Column(Float)
+    minimum_investment = Column(Float, index=True)
     maximum_investment = Column(Float)
     expected_return_rate = Column(Float)
     risk_level = Column(String(20))  # low, medium, high
@@ -0,0 +1,32 @@
+"""Background job model for long-running simulations and report exports."""
+import uuid
+from datetime import datetime
+from sqlalchemy import Boolean, Column, String, Integer, Text, DateTime, LargeBinary, JSON, UniqueConstraint
+from app.database import Base
+
+
+def gen_uuid():
+    return str(uuid.uuid4())
+
+
+class Job(Base):
+    """Queued computation whose result is fetched after it completes."""
+    __tablename__ = "jobs"
+    # At most one queued/running job per fingerprint; ``live`` is NULL once a job finishes.
+    __table_args__ = (UniqueConstraint("fingerprint", "live", name="uq_jobs_live_fingerprint"),)
+
+    id = Column(String(36), primary_key=True, default=gen_uuid)
+    kind = Column(String(50), nullable=False)  # monte_carlo, comprehensive_report, export_pdf, export_excel, investment_clusters
+    fingerprint = Column(String(64), nullable=False, index=True)  # sha256 of kind + canonical params
+    status = Column(String(20), nullable=False, default="queued", index=True)  # queued, running, succeeded, failed
+    live = Column(Boolean)  # True while queued or running
+    params = Column(JSON, nullable=False)
+    result = Column(JSON)
+    result_blob = Column(LargeBinary)
+    media_type = Column(String(100))
+    filename = Column(String(255))
+    error = Column(Text)
+    attempts = Column(Integer, default=0)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    started_at = Column(DateTime)
+    finished_at = Column(DateTime)
@@ -0,0 +1,275 @@
+"""Request profiling, SQL instrumentation and Prometheus-format metrics."""
+import sys
+import threading
+import time
+from collections import Counter, defaultdict, deque
+from contextvars import ContextVar
+from typing import Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SQL_COUNT_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200, 500)
+
+
+class MetricsRegistry:
+    """Thread-safe counters, gauges and histograms rendered in Prometheus text format."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._meta: Dict[str, Tuple[str, str, Tuple[float, ...]]] = {}
+        self._values: Dict[str, Dict[Tuple, float]] = defaultdict(dict)
+        self._histograms: Dict[str, Dict[Tuple, List[float]]] = defaultdict(dict)
+        self._collectors: List[Callable[["MetricsRegistry"], None]] = []
+
+    def describe(self, name: str, kind: str, help_text: str, buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        with self._lock:
+            self._meta.setdefault(name, (kind, help_text, tuple(buckets)))
+
+    def inc(self, name: str, value: float = 1.0, **labels):
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            series = self._values[name]
+            series[key] = series.get(key, 0.0) + value
+
+    def set(self, name: str, value: float, **labels):
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            self._values[name][key] = float(value)
+
+    def observe(self, name: str, value: float, **labels):
+        key = tuple(sorted(labels.items()))
+        buckets = self._meta.get(name, ("histogram", "", DEFAULT_BUCKETS))[2]
+        with self._lock:
+            state = self._histograms[name].get(key)
+            if state is None:
+                # Per-bucket counts followed by running sum and count.
+                state = self._histograms[name][key] = [0.0] * (len(buckets) + 2)
+            for i, bound in enumerate(buckets):
+                if value <= bound:
+                    state[i] += 1
+            state[-2] += value
+            state[-1] += 1
+
+    def get(self, name: str, **labels) -> float:
+        return self._values.get(name, {}).get(tuple(sorted(labels.items())), 0.0)
+
+    def add_collector(self, collector: Callable[["MetricsRegistry"], None]):
+        """Register a callback that refreshes gauges just before rendering."""
+        self._collectors.append(collector)
+
+    def reset(self):
+        with self._lock:
+            self._values.clear()
+            self._histograms.clear()
+
+    @staticmethod
+    def _format_labels(key: Tuple, extra: Optional[Tuple] = None) -> str:
+        pairs = list(key) + list(extra or ())
+        if not pairs:
+            return ""
+        escaped = []
+        for k, v in pairs:
+            v = str(v).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+            escaped.append(f'{k}="{v}"')
+        return "{" + ",".join(escaped) + "}"
+
+    def render(self) -> str:
+        for collector in self._collectors:
+            collector(self)
+        lines = []
+        with self._lock:
+            names = sorted(set(self._values) | set(self._histograms))
+            for name in names:
+                kind, help_text, buckets = self._meta.get(name, ("untyped", "", DEFAULT_BUCKETS))
+                if help_text:
+                    lines.append(f"# HELP {name} {help_text}")
+                lines.append(f"# TYPE {name} {kind}")
+                for key, value in sorted(self._values.get(name, {}).items()):
+                    lines.append(f"{name}{self._format_labels(key)} {value:g}")
+                for key, state in sorted(self._histograms.get(name, {}).items()):
+                    for i, bound in enumerate(buckets):
+                        lines.append(f"{name}_bucket{self._format_labels(key, (('le', f'{bound:g}'),))} {state[i]:g}")
+                    lines.append(f"{name}_bucket{self._format_labels(key, (('le', '+Inf'),))} {state[-1]:g}")
+                    lines.append(f"{name}_sum{self._format_labels(key)} {state[-2]:g}")
+                    lines.append(f"{name}_count{self._format_labels(key)} {state[-1]:g}")
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = MetricsRegistry()
+REGISTRY.describe("investiq_http_requests_total", "counter", "HTTP requests by method, route and status.")
+REGISTRY.describe("investiq_http_request_duration_seconds", "histogram", "Wall time per request.")
+REGISTRY.describe("investiq_sql_statements_total", "counter", "SQL statements executed per route.")
+REGISTRY.describe("investiq_sql_duration_seconds_total", "counter", "Time spent in SQL per route.")
+REGISTRY.describe("investiq_http_request_sql_statements", "histogram",
+                  "SQL statements issued by a single request (N+1 detector).", SQL_COUNT_BUCKETS)
+REGISTRY.describe("investiq_slow_request_profiles_total", "counter", "Sampling profiles captured for slow requests.")
+
+
+class RequestStats:
+    """Mutable per-request accumulator shared with worker threads through a context variable."""
+
+    __slots__ = ("sql_count", "sql_seconds")
+
+    def __init__(self):
+        self.sql_count = 0
+        self.sql_seconds = 0.0
+
+
+SLOW_PROFILES: deque = deque(maxlen=50)
+_current_request: ContextVar[Optional[RequestStats]] = ContextVar("investiq_request_stats", default=None)
+_sql_installed = False
+
+
+def current_request_stats() -> Optional[RequestStats]:
+    return _current_request.get()
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    # Kept on the execution context, which is discarded with a failed statement, not on the pooled connection.
+    context.investiq_query_start = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    start = getattr(context, "investiq_query_start", None)
+    if start is None:
+        return
+    elapsed = time.perf_counter() - start
+    stats = _current_request.get()
+    if stats is not None:
+        stats.sql_count += 1
+        stats.sql_seconds += elapsed
+
+
+def install_sql_instrumentation():
+    """Attach cursor timing hooks to every SQLAlchemy engine (idempotent)."""
+    global _sql_installed
+    if _sql_installed:
+        return
+    event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+    _sql_installed = True
+
+
+class StackSampler:
+    """Wall-clock sampling profiler that aggregates folded stacks of all busy threads.
+
+    Sync route handlers run on threadpool workers, so the sampler cannot target
+    a single thread; concurrent requests may therefore appear in each other's
+    profiles. Idle threads (waiting on locks, queues or selectors) are skipped.
+    """
+
+    IDLE_FUNCTIONS = {"wait", "select", "poll", "accept", "_worker"}
+
+    def __init__(self, interval: float = 0.005, max_depth: int = 64):
+        self.interval = interval
+        self.max_depth = max_depth
+        self.samples: Counter = Counter()
+        self.sample_count = 0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="investiq-profiler", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def _run(self):
+        own_id = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id or frame.f_code.co_name in self.IDLE_FUNCTIONS:
+                    continue
+                stack = []
+                while frame is not None and len(stack) < self.max_depth:
+                    code = frame.f_code
+                    stack.append(f"{code.co_name} ({code.co_filename.rsplit('/', 1)[-1]}:{frame.f_lineno})")
+                    frame = frame.f_back
+                self.samples[";".join(reversed(stack))] += 1
+            self.sample_count += 1
+
+    def top(self, limit: int = 25) -> List[Dict]:
+        return [{"stack": stack, "samples": count} for stack, count in self.samples.most_common(limit)]
+
+
+class InstrumentationMiddleware:
+    """ASGI middleware recording wall time and SQL usage per route.
+
+    When ``profile_threshold_ms`` is positive, each request is sampled and the
+    folded stacks of requests slower than the threshold are kept in
+    ``SLOW_PROFILES`` for ``/debug/profiles``.
+    """
+
+    def __init__(self, app, registry: MetricsRegistry = REGISTRY, profile_threshold_ms: float = 0.0,
+                 sample_interval_ms: float = 5.0):
+        self.app = app
+        self.registry = registry
+        self.profile_threshold = profile_threshold_ms / 1000.0
+        self.sample_interval = sample_interval_ms / 1000.0
+        self._route_paths: Dict[Callable, str] = {}
+        install_sql_instrumentation()
+
+    def _route_label(self, scope) -> str:
+        endpoint = scope.get("endpoint")
+        if endpoint is None:
+            return "unmatched"
+        path = self._route_paths.get(endpoint)
+        if path is None:
+            for route in getattr(scope.get("app"), "routes", []):
+                if getattr(route, "endpoint", None) is endpoint:
+                    path = route.path
+                    break
+            path = self._route_paths[endpoint] = path or getattr(endpoint, "__name__", "unknown")
+        return path
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        stats = RequestStats()
+        token = _current_request.set(stats)
+        sampler = StackSampler(self.sample_interval) if self.profile_threshold > 0 else None
+        status_code = 500
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        if sampler:
+            sampler.start()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - start
+            if sampler:
+                sampler.stop()
+            _current_request.reset(token)
+            self._record(scope, status_code, elapsed, stats, sampler)
+
+    def _record(self, scope, status_code: int, elapsed: float, stats: RequestStats,
+                sampler: Optional[StackSampler]):
+        route = self._route_label(scope)
+        method = scope.get("method", "GET")
+        reg = self.registry
+        reg.inc("investiq_http_requests_total", method=method, route=route, status=str(status_code))
+        reg.observe("investiq_http_request_duration_seconds", elapsed, method=method, route=route)
+        reg.inc("investiq_sql_statements_total", stats.sql_count, route=route)
+        reg.inc("investiq_sql_duration_seconds_total", stats.sql_seconds, route=route)
+        reg.observe("investiq_http_request_sql_statements", stats.sql_count, route=route)
+        if sampler and elapsed >= self.profile_threshold:
+            reg.inc("investiq_slow_request_profiles_total", route=route)
+            SLOW_PROFILES.append({
+                "method": method, "route": route, "path": scope.get("path"), "status": status_code,
+                "duration_ms": round(elapsed * 1000, 2), "sql_statements": stats.sql_count,
+                "sql_ms": round(stats.sql_seconds * 1000, 2), "samples": sampler.sample_count,
+                "stacks": sampler.top(),
+            })
@@ -0,0 +1,133 @@
+"""orjson-backed JSON responses and response compression.
+
+``FastJSONResponse`` is the application's default response class. orjson
+serialises numpy arrays and scalars, dates and NaN (as ``null``) natively, so
+routes returning large payloads build one directly from numpy/pandas data and
+skip FastAPI's per-element ``jsonable_encoder`` pass.
+
+``CompressionMiddleware`` compresses response bodies of at least
+``minimum_size`` bytes: Brotli when the client accepts ``br`` and the
+``brotli`` package is installed, otherwise gzip. Streamed bodies are
+compressed chunk by chunk; already-compressed media types pass through.
+"""
+import zlib
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, Callable, Optional, Tuple
+
+import numpy as np
+import orjson
+from fastapi.responses import JSONResponse
+from starlette.datastructures import Headers, MutableHeaders
+
+try:
+    import brotli
+except ImportError:  # gzip only
+    brotli = None
+
+ORJSON_OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+INCOMPRESSIBLE_TYPES = ("image/", "video/", "audio/", "application/pdf", "application/zip", "application/gzip",
+                        "application/vnd.openxmlformats")
+
+
+def _default(obj: Any):
+    if isinstance(obj, np.generic):
+        return obj.item()
+    if isinstance(obj, np.ndarray):  # object or non-contiguous arrays orjson rejects
+        return obj.tolist()
+    if isinstance(obj, (datetime, date)):  # subclasses such as pandas.Timestamp
+        return obj.isoformat()
+    if isinstance(obj, Decimal):
+        return float(obj)
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+
+def dumps(content: Any) -> bytes:
+    return orjson.dumps(content, default=_default, option=ORJSON_OPTIONS)
+
+
+class FastJSONResponse(JSONResponse):
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+def accepted_encodings(header: str) -> set:
+    """Content codings in an ``Accept-Encoding`` header, excluding those with ``q=0``."""
+    accepted = set()
+    for part in header.split(","):
+        coding, *params = [p.strip() for p in part.split(";")]
+        weights = [p.partition("=")[2] for p in params if p.replace(" ", "").startswith("q=")]
+        try:
+            if coding and (not weights or float(weights[0]) > 0):
+                accepted.add(coding.lower())
+        except ValueError:
+            pass
+    return accepted
+
+
+def _compressor(encoding: str, level: int) -> Tuple[Callable, Callable, Callable]:
+    """(compress, flush, finish) for one response body."""
+    if encoding == "br":
+        compressor = brotli.Compressor(quality=level)
+        return compressor.process, compressor.flush, compressor.finish
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)  # gzip container
+    return compressor.compress, lambda: compressor.flush(zlib.Z_SYNC_FLUSH), compressor.flush
+
+
+class CompressionMiddleware:
+    def __init__(self, app, minimum_size: int = 1024, gzip_level: int = 6, brotli_quality: int = 5):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.levels = {"gzip": gzip_level, "br": brotli_quality}
+
+    def _encoding(self, scope) -> Optional[str]:
+        accepted = accepted_encodings(Headers(scope=scope).get("accept-encoding", ""))
+        if brotli is not None and "br" in accepted:
+            return "br"
+        return "gzip" if "gzip" in accepted else None
+
+    async def __call__(self, scope, receive, send):
+        encoding = self._encoding(scope) if scope["type"] == "http" else None
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+        start: Optional[dict] = None
+        codec: Optional[Tuple[Callable, Callable, Callable]] = None
+        passthrough = False
+
+        async def send_compressed(message):
+            nonlocal start, codec, passthrough
+            if message["type"] == "http.response.start":
+                start = message
+                return
+            if message["type"] != "http.response.body" or passthrough:
+                await send(message)
+                return
+            body, more_body = message.get("body", b""), message.get("more_body", False)
+            if codec is None:
+                headers = MutableHeaders(raw=start["headers"])
+                content_type = headers.get("content-type", "")
+                if ("content-encoding" in headers or content_type.startswith(INCOMPRESSIBLE_TYPES)
+                        or (not more_body and len(body) < self.minimum_size)):
+                    passthrough = True
+                    await send(start)
+                    await send(message)
+                    return
+                codec = _compressor(encoding, self.levels[encoding])
+                headers["Content-Encoding"] = encoding
+                headers.add_vary_header("Accept-Encoding")
+                if more_body:
+                    del headers["Content-Length"]
+                else:
+                    body = codec[0](body) + codec[2]()
+                    headers["Content-Length"] = str(len(body))
+                    await send(start)
+                    await send({**message, "body": body})
+                    return
+                await send(start)
+            compress, flush, finish = codec
+            await send({**message, "body": compress(body) + (flush() if more_body else finish())})
+
+        await self.app(scope, receive, send_compressed)
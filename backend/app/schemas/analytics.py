@@ -9,6 +9,13 @@ class FDIForecastRequest(BaseModel):
     confidence_interval: float = Field(default=0.95, ge=0.5, le=0.99)
 
 
+class FDIScenarioRequest(BaseModel):
+    target: str = "fdi_inflow"
+    drivers: Dict[str, float] = {}  # e.g. {"inflation_rate": 30}
+    horizon: int = Field(default=3, ge=1, le=10)
+    frequency: str = "YE"  # YE, QE, ME
+
+
 class ForecastPoint(BaseModel):
     date: str
     value: float
@@ -32,8 +39,11 @@ class SectorRiskReturn(BaseModel):
     volatility: float
     sharpe_ratio: float
     beta: float
+    downside_deviation: float = 0.0
+    sortino_ratio: float = 0.0
     total_investment: float
     investment_count: int
+    rolling_sharpe: List[float] = []
 
 
 class PortfolioOptimisationRequest(BaseModel):
@@ -15,6 +15,7 @@ from app.seed.zimbabwe_sectors import SECTORS_DATA
 from app.seed.sez_data import SEZ_DATA
 from app.seed.macroeconomic_data import MACRO_INDICATORS
 from app.seed.sample_investments import SAMPLE_INVESTMENTS, SAMPLE_INVESTORS, SAMPLE_OPPORTUNITIES
+from app.services.clustering import InvestmentClusteringService
 
 
 def seed_all():
@@ -106,6 +107,8 @@ def seed_all():
             print(f"  Opportunities already seeded ({existing} found)")
 
         db.commit()
+        print("Fitting investment patterns...")
+        InvestmentClusteringService(db).refresh()
         print("\nSeeding complete!")
 
     except Exception as e:
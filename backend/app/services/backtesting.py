@@ -0,0 +1,96 @@
+"""Nightly rolling-origin backtests of every forecast engine on every indicator series.
+
+Series whose fingerprint has not changed since their stored metrics were
+computed are skipped, so a rerun only evaluates new or revised data. Schedule
+``python -m app.services.backtesting [horizon]`` from the backend directory.
+"""
+import sys
+from datetime import datetime
+from typing import Dict, List, Optional
+
+import pandas as pd
+from sqlalchemy.orm import Session
+
+from app.database import SessionLocal, Base, engine
+from app.executor import compute_executor
+from app.ml.forecast_engines import ENGINES
+from app.models.backtest import BacktestResult
+from app.services import compute_tasks
+from app.services.indicator_store import indicator_store
+from app.services.model_cache import series_fingerprint
+
+
+def check_models(models: Optional[List[str]]):
+    unknown = set(models or []) - set(ENGINES)
+    if unknown:
+        raise ValueError(f"Unknown forecast engine(s): {sorted(unknown)}. Valid: {list(ENGINES)}")
+
+
+class BacktestService:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def load_series(self, indicators: Optional[List[str]] = None) -> Dict[str, pd.DataFrame]:
+        """Indicator series from the columnar store, keyed by indicator name."""
+        snapshot = indicator_store.snapshot(self.db)
+        names = sorted(snapshot.names if indicators is None else set(indicators) & set(snapshot.names))
+        return {name: snapshot.series([name]) for name in names}
+
+    def run(self, indicators: Optional[List[str]] = None, models: Optional[List[str]] = None, horizon: int = 1,
+            confidence: float = 0.8, force: bool = False) -> Dict:
+        models = models or list(ENGINES)
+        check_models(models)
+        series = self.load_series(indicators)
+        existing = {(r.series, r.model): r for r in self.db.query(BacktestResult).filter(
+            BacktestResult.horizon == horizon, BacktestResult.series.in_(list(series)))}
+
+        work = []
+        for name, df in series.items():
+            fingerprint = series_fingerprint(df)
+            stale = [m for m in models if force or (name, m) not in existing
+                     or existing[(name, m)].fingerprint != fingerprint
+                     or existing[(name, m)].confidence != confidence]
+            if stale:
+                work.append((name, fingerprint, df["value"].tolist(), stale))
+
+        evaluated = compute_executor.map_chunked(
+            compute_tasks.backtest_series, [(values, stale) for _, _, values, stale in work], horizon, confidence)
+        now = datetime.utcnow()
+        for (name, fingerprint, _, _), metrics in zip(work, evaluated):
+            for m in metrics:
+                row = existing.get((name, m["model"])) or BacktestResult(series=name, model=m["model"], horizon=horizon)
+                row.folds, row.mape, row.mase, row.coverage = m["folds"], m["mape"], m["mase"], m["coverage"]
+                row.confidence, row.fingerprint, row.evaluated_at = confidence, fingerprint, now
+                self.db.add(row)
+        self.db.commit()
+        return {"series": len(series), "evaluated": len(work), "skipped": len(series) - len(work),
+                "models": models, "horizon": horizon}
+
+    def results(self, indicator: Optional[str] = None, model: Optional[str] = None,
+                horizon: Optional[int] = None) -> List[Dict]:
+        query = self.db.query(BacktestResult)
+        if indicator:
+            query = query.filter(BacktestResult.series == indicator)
+        if model:
+            query = query.filter(BacktestResult.model == model)
+        if horizon:
+            query = query.filter(BacktestResult.horizon == horizon)
+        return [{
+            "series": r.series, "model": r.model, "horizon": r.horizon, "folds": r.folds, "mape": r.mape,
+            "mase": r.mase, "coverage": r.coverage, "confidence": r.confidence, "evaluated_at": r.evaluated_at,
+        } for r in query.order_by(BacktestResult.series, BacktestResult.horizon, BacktestResult.mase).all()]
+
+
+def run_nightly(horizon: int = 1):
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    try:
+        summary = BacktestService(db).run(horizon=horizon)
+        print(f"Backtested {summary['evaluated']} of {summary['series']} series ({summary['skipped']} unchanged)")
+    finally:
+        db.close()
+        compute_executor.shutdown()
+
+
+if __name__ == "__main__":
+    run_nightly(int(sys.argv[1]) if len(sys.argv) > 1 else 1)
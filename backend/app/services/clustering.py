@@ -0,0 +1,159 @@
+"""Incremental clustering of investments into persisted patterns.
+
+Fitted model parameters are stored as JSON in ``cluster_models`` under a
+version, and assignments are stored per investment with the version that
+produced them, so every worker process sees the same current model. Processes
+keep a few rebuilt models keyed by ``(version, revision)``.
+
+``refresh`` is the only writer and runs as a background job (see
+``job_queue``). It only touches new or edited investments, fitting them into
+the current model with ``partial_fit``. It refits from scratch when there is no
+current model, the catalogue has grown by more than ``CLUSTER_REFIT_GROWTH``
+since the last full fit, or new rows bring sectors or provinces the encoding
+has no column for. ``patterns`` is read-only: investments added since the last
+refresh are labelled in memory with the current model, and until a model is
+stored (e.g. right after upgrading) one is fitted in memory per request.
+"""
+import copy
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+import pandas as pd
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.executor import compute_executor
+from app.ml.investment_clusterer import FEATURE_COLUMNS, FLAGS, InvestmentClusterer, describe_clusters
+from app.models.cluster import ClusterModel, InvestmentCluster
+from app.models.investment import Investment
+from app.models.sector import Sector
+from app.services import compute_tasks
+
+MODEL_CACHE_SIZE = 4
+REFRESH_ATTEMPTS = 3
+REFRESH_BACKOFF_SECONDS = 0.1
+
+_cache_lock = threading.Lock()
+_models: "OrderedDict[Tuple[str, int], InvestmentClusterer]" = OrderedDict()
+
+
+class InvestmentClusteringService:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def load_features(self) -> pd.DataFrame:
+        """Feature columns for every investment, streamed from one joined query."""
+        query = self.db.query(
+            Investment.id, Investment.investment_amount_usd, Sector.code, Sector.name, Investment.province,
+            Investment.investor_country, Investment.sez_id.isnot(None), Investment.export_oriented,
+            Investment.technology_transfer, func.coalesce(Investment.updated_at, Investment.created_at),
+        ).outerjoin(Sector, Investment.sector_id == Sector.id)
+        rows = pd.DataFrame(query.yield_per(2000), columns=[
+            "investment_id", "amount", "sector", "sector_name", "province", "country", *FLAGS, "modified_at"])
+        rows[FLAGS] = rows[FLAGS].fillna(False).astype(float)
+        return rows
+
+    def current_model(self) -> Tuple[Optional[str], int, Optional[InvestmentClusterer]]:
+        """``(version, revision, clusterer)`` of the latest persisted model, rebuilt at most once per process."""
+        latest = self.db.query(ClusterModel.version, ClusterModel.revision).order_by(
+            ClusterModel.created_at.desc()).first()
+        if latest is None:
+            return None, 0, None
+        key = (latest.version, latest.revision)
+        with _cache_lock:
+            clusterer = _models.get(key)
+        if clusterer is None:
+            params = self.db.query(ClusterModel.parameters).filter(ClusterModel.version == latest.version).scalar()
+            clusterer = InvestmentClusterer.from_params(params)
+            with _cache_lock:
+                _models[key] = clusterer
+                while len(_models) > MODEL_CACHE_SIZE:
+                    _models.popitem(last=False)
+        return latest.version, latest.revision, clusterer
+
+    def refresh(self, refit: bool = False) -> Dict:
+        """Assign new or edited investments, refitting when needed.
+
+        Retried with backoff if another worker updated the model meanwhile;
+        raises ``RuntimeError`` after ``REFRESH_ATTEMPTS`` conflicts so the job fails.
+        """
+        for attempt in range(REFRESH_ATTEMPTS):
+            if attempt:
+                time.sleep(REFRESH_BACKOFF_SECONDS * 2 ** (attempt - 1))
+            result = self._refresh(refit)
+            if result is not None:
+                return result
+        raise RuntimeError(f"Cluster model changed concurrently on {REFRESH_ATTEMPTS} attempts")
+
+    def _refresh(self, refit: bool) -> Optional[Dict]:
+        rows = self.load_features()
+        assignments = {a.investment_id: a for a in self.db.query(InvestmentCluster)}
+        orphaned = set(assignments) - set(rows["investment_id"])
+        if orphaned:
+            self.db.query(InvestmentCluster).filter(InvestmentCluster.investment_id.in_(orphaned)).delete(
+                synchronize_session=False)
+        assigned_at = rows["investment_id"].map(
+            {k: a.assigned_at for k, a in assignments.items()}).astype("datetime64[ns]")
+        stale = assigned_at.isna() | (pd.to_datetime(rows["modified_at"]) > assigned_at)
+        version, revision, clusterer = self.current_model()
+        versions = {a.model_version for k, a in assignments.items() if k not in orphaned}
+
+        if rows.empty or not (refit or stale.any()):
+            self.db.commit()
+            return {"investments": len(rows), "assigned": 0, "refit": False, "model_version": version}
+        refit = (refit or clusterer is None or versions - {version}
+                 or len(rows) > clusterer.fitted_rows * (1 + settings.CLUSTER_REFIT_GROWTH)
+                 or clusterer.unseen(rows[stale]) > 0)
+        if refit:
+            # The job worker waits here; no lock is held, so readers keep serving the previous model.
+            clusterer = compute_executor.submit(
+                compute_tasks.fit_investment_clusters, rows[FEATURE_COLUMNS], settings.INVESTMENT_CLUSTERS,
+            ).result()
+            model = ClusterModel(revision=0, fitted_rows=clusterer.fitted_rows, parameters=clusterer.to_params())
+            self.db.query(ClusterModel).delete(synchronize_session=False)
+            self.db.add(model)
+            self.db.flush()
+            version, target = model.version, rows
+        else:
+            target = rows[stale]
+            clusterer = copy.deepcopy(clusterer).partial_fit(target)
+            updated = self.db.query(ClusterModel).filter(
+                ClusterModel.version == version, ClusterModel.revision == revision,
+            ).update({"revision": revision + 1, "parameters": clusterer.to_params()}, synchronize_session=False)
+            if updated != 1:  # another worker changed the model since it was read
+                self.db.rollback()
+                return None
+        labels, distances = clusterer.predict(target)
+
+        now = datetime.utcnow()
+        for investment_id, label, distance in zip(target["investment_id"], labels, distances):
+            row = assignments.get(investment_id) or InvestmentCluster(investment_id=investment_id)
+            row.cluster_id, row.distance = int(label), float(distance)
+            row.model_version, row.assigned_at = version, now
+            self.db.add(row)
+        self.db.commit()
+        return {"investments": len(rows), "assigned": len(target), "refit": bool(refit), "model_version": version}
+
+    def patterns(self) -> List[Dict]:
+        rows = self.load_features()
+        if rows.empty:
+            return []
+        version, _, clusterer = self.current_model()
+        if clusterer is None:
+            clusterer = compute_executor.submit(
+                compute_tasks.fit_investment_clusters, rows[FEATURE_COLUMNS], settings.INVESTMENT_CLUSTERS,
+            ).result()
+        assigned = pd.DataFrame(
+            self.db.query(InvestmentCluster.investment_id, InvestmentCluster.cluster_id,
+                          InvestmentCluster.assigned_at).filter(InvestmentCluster.model_version == version).all(),
+            columns=["investment_id", "cluster_id", "assigned_at"]).set_index("investment_id")
+        labels = rows["investment_id"].map(assigned["cluster_id"])
+        assigned_at = rows["investment_id"].map(assigned["assigned_at"]).astype("datetime64[ns]")
+        pending = (labels.isna() | (pd.to_datetime(rows["modified_at"]) > assigned_at)).to_numpy()
+        if pending.any():
+            labels[pending] = clusterer.predict(rows[pending])[0]
+        return describe_clusters(rows, labels.to_numpy())
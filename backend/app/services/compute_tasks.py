@@ -0,0 +1,173 @@
+"""Picklable entry points for work dispatched to the compute executor.
+
+Each task takes plain data only (no sessions or ORM objects) so it can run in a
+worker process after the request has released its database connection.
+"""
+import os
+import re
+import tempfile
+import zipfile
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from app.ml.backtesting import rolling_origin_backtest
+from app.ml.fdi_forecaster import FDIForecaster
+from app.ml.investment_clusterer import InvestmentClusterer
+from app.ml.risk_scorer import RiskScorer
+from app.services.impact_calculator import InvestmentImpactCalculator
+from app.services.report_generator import ReportGenerator
+
+
+def monte_carlo_summary(investment_amount: float, sector: str, num_simulations: int = 10000,
+                        scenario: str = "base", seed: Optional[int] = None) -> Dict:
+    # Only the statistics cross the process boundary, not every simulated outcome.
+    return InvestmentImpactCalculator(None).monte_carlo_statistics(
+        investment_amount, sector, num_simulations, scenario, seed)
+
+
+def comprehensive_report(investment_amount: float, sector: str, province: str, is_sez: bool = False,
+                         sez_id: Optional[str] = None, sez: Optional[Dict] = None, seed: Optional[int] = None) -> Dict:
+    return InvestmentImpactCalculator(None).generate_comprehensive_report(
+        investment_amount, sector, province, is_sez, sez_id, sez=sez, seed=seed)
+
+
+def fit_forecasters(frames: List[pd.DataFrame], engine: str = "auto") -> List[FDIForecaster]:
+    """Fit one forecaster per ``(period, value)`` frame; fitted models are returned for caching."""
+    return [FDIForecaster(engine).fit(df, "period", "value") for df in frames]
+
+
+def backtest_series(items: List[Tuple[List[float], List[str]]], horizon: int = 1,
+                    confidence: float = 0.8) -> List[List[Dict]]:
+    """Backtest each ``(values, models)`` item; one list of per-model metrics per item."""
+    return [[rolling_origin_backtest(np.asarray(values), model, horizon, confidence=confidence) for model in models]
+            for values, models in items]
+
+
+def fit_investment_clusters(rows: pd.DataFrame, n_clusters: int) -> InvestmentClusterer:
+    return InvestmentClusterer(n_clusters).fit(rows)
+
+
+def optimise_portfolio(expected_returns: np.ndarray, cov_matrix: np.ndarray, risk_tolerance: str) -> Dict:
+    return RiskScorer().optimize_portfolio(expected_returns, cov_matrix, risk_tolerance)
+
+
+def efficient_frontier(expected_returns: np.ndarray, cov_matrix: np.ndarray, num_portfolios: int = 50) -> List[Dict]:
+    return RiskScorer().efficient_frontier(expected_returns, cov_matrix, num_portfolios)
+
+
+def render_impact_pdf(report: Dict) -> bytes:
+    return ReportGenerator().generate_impact_pdf(report)
+
+
+def render_impact_excel(report: Dict) -> bytes:
+    return ReportGenerator().generate_impact_excel(report)
+
+
+def _export_path(suffix: str) -> str:
+    fd, path = tempfile.mkstemp(prefix="investiq-export-", suffix=suffix)
+    os.close(fd)
+    return path
+
+
+def write_impact_export(report: Dict, fmt: str) -> str:
+    """Render ``report`` to a temporary ``pdf``/``xlsx`` file and return its path.
+
+    Only the path crosses the process boundary; the route streams the file
+    and deletes it.
+    """
+    generator = ReportGenerator()
+    path = _export_path(f".{fmt}")
+    try:
+        if fmt == "pdf":
+            generator.write_impact_pdf(report, path)
+        else:
+            generator.write_impact_excel(report, path)
+    except Exception:
+        os.unlink(path)
+        raise
+    return path
+
+
+def _portfolio_entries(investments: List[Dict], num_simulations: int, seed: Optional[int]) -> Iterator[Dict]:
+    calc = InvestmentImpactCalculator(None)
+    for inv in investments:
+        report = calc.generate_comprehensive_report(
+            inv["investment_amount_usd"], inv["sector"], inv.get("province") or "Harare",
+            seed=seed, parallel=False, num_simulations=num_simulations)
+        yield {"investment": inv, "report": report}
+
+
+def export_portfolio_excel(investments: List[Dict], num_simulations: int = 1000, seed: Optional[int] = None) -> str:
+    path = _export_path(".xlsx")
+    try:
+        ReportGenerator().write_portfolio_excel(_portfolio_entries(investments, num_simulations, seed), path)
+    except Exception:
+        os.unlink(path)
+        raise
+    return path
+
+
+def _pdf_filename(inv: Dict) -> str:
+    slug = re.sub(r"[^A-Za-z0-9]+", "-", inv["project_name"]).strip("-").lower() or "investment"
+    return f"{slug}-{inv['id'][:8]}.pdf"
+
+
+def render_portfolio_pdfs(investments: List[Dict], num_simulations: int = 1000,
+                          seed: Optional[int] = None) -> List[Tuple[str, str]]:
+    """Render one PDF per investment to temp files; returns ``(archive name, path)`` pairs."""
+    generator, files = ReportGenerator(), []
+    try:
+        for entry in _portfolio_entries(investments, num_simulations, seed):
+            path = _export_path(".pdf")
+            files.append((_pdf_filename(entry["investment"]), path))
+            generator.write_impact_pdf(entry["report"], path, subtitle=entry["investment"]["project_name"])
+    except Exception:
+        for _, path in files:
+            os.unlink(path)
+        raise
+    return files
+
+
+def portfolio_reports(investments: List[Dict], num_simulations: int = 1000,
+                      seed: Optional[int] = None) -> List[Tuple[str, Dict]]:
+    return [(entry["investment"]["project_name"], entry["report"])
+            for entry in _portfolio_entries(investments, num_simulations, seed)]
+
+
+def render_merged_pdf(reports: List[Tuple[str, Dict]]) -> str:
+    path = _export_path(".pdf")
+    try:
+        ReportGenerator().write_merged_pdf(reports, path)
+    except Exception:
+        os.unlink(path)
+        raise
+    return path
+
+
+def bundle_zip(files: List[Tuple[str, str]]) -> str:
+    """Pack rendered files into a ZIP on disk, consuming (deleting) the inputs."""
+    path = _export_path(".zip")
+    try:
+        # PDF page streams are already compressed, so store rather than deflate.
+        with zipfile.ZipFile(path, "w", zipfile.ZIP_STORED) as zf:
+            for name, file_path in files:
+                zf.write(file_path, name)
+    except Exception:
+        os.unlink(path)
+        raise
+    finally:
+        for _, file_path in files:
+            os.unlink(file_path)
+    return path
+
+
+def export_impact_pdf(investment_amount: float, sector: str, province: str, is_sez: bool = False,
+                      sez_id: Optional[str] = None, sez: Optional[Dict] = None, seed: Optional[int] = None) -> bytes:
+    return render_impact_pdf(comprehensive_report(investment_amount, sector, province, is_sez, sez_id, sez, seed))
+
+
+def export_impact_excel(investment_amount: float, sector: str, province: str, is_sez: bool = False,
+                        sez_id: Optional[str] = None, sez: Optional[Dict] = None, seed: Optional[int] = None) -> bytes:
+    return render_impact_excel(comprehensive_report(investment_amount, sector, province, is_sez, sez_id, sez, seed))
@@ -1,12 +1,37 @@
 """Investment impact calculation service."""
 import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+from functools import cached_property
 from typing import Optional, Dict, List
 from sqlalchemy.orm import Session
 
+from app.config import settings
 from app.models.investment import SpecialEconomicZone
 from app.models.sector import Sector
 from app.ml.multiplier_model import MultiplierModel
 from app.ml.monte_carlo import MonteCarloEngine
+from app.services.result_cache import result_cache
+
+
+class ReportIntermediates:
+    """Multiplier results shared by the sections of one report, each computed at most once."""
+
+    def __init__(self, multiplier: MultiplierModel, investment_amount: float, sector: str):
+        self.multiplier = multiplier
+        self.investment_amount = investment_amount
+        self.sector = sector
+
+    @cached_property
+    def impact(self) -> Dict:
+        return self.multiplier.calculate_total_impact(self.investment_amount, self.sector)
+
+    @cached_property
+    def jobs(self) -> Dict:
+        return self.multiplier.calculate_job_creation(self.investment_amount, self.sector, impact=self.impact)
+
+    @cached_property
+    def tax(self) -> Dict:
+        return self.multiplier.calculate_tax_revenue(self.investment_amount, self.sector, jobs=self.jobs)
 
 
 class InvestmentImpactCalculator:
@@ -34,20 +59,37 @@ class InvestmentImpactCalculator:
     def _resolve_sector(self, sector: str) -> str:
         return self.SECTOR_CODE_MAP.get(sector.upper(), sector.lower())
 
-    def calculate_job_creation(self, investment_amount, sector, province, is_sez=False) -> Dict:
+    def _intermediates(self, investment_amount, s, shared: Optional[ReportIntermediates]) -> ReportIntermediates:
+        return shared or ReportIntermediates(self.multiplier, investment_amount, s)
+
+    def calculate_job_creation(self, investment_amount, sector, province, is_sez=False,
+                               shared: Optional[ReportIntermediates] = None) -> Dict:
         s = self._resolve_sector(sector)
-        result = self.multiplier.calculate_job_creation(investment_amount, s)
+        # Province is only echoed back, so it is left out of the cache key.
+        result = result_cache.get_or_compute(
+            "job_creation", {"amount": float(investment_amount), "sector": s, "is_sez": bool(is_sez)},
+            lambda: self._job_creation(self._intermediates(investment_amount, s, shared), is_sez))
+        result["province"] = province
+        return result
+
+    def _job_creation(self, shared: ReportIntermediates, is_sez) -> Dict:
+        result = dict(shared.jobs)
         if is_sez:
             result["total_jobs"] = int(result["total_jobs"] * 1.1)
             result["direct_jobs"] = int(result["direct_jobs"] * 1.1)
-        result["province"] = province
-        result["sector"] = s
+        result["sector"] = shared.sector
         return result
 
-    def calculate_gdp_contribution(self, investment_amount, sector, years=10) -> Dict:
+    def calculate_gdp_contribution(self, investment_amount, sector, years=10,
+                                   shared: Optional[ReportIntermediates] = None) -> Dict:
         s = self._resolve_sector(sector)
-        impact = self.multiplier.calculate_total_impact(investment_amount, s)
-        tax = self.multiplier.calculate_tax_revenue(investment_amount, s)
+        return result_cache.get_or_compute(
+            "gdp_contribution", {"amount": float(investment_amount), "sector": s, "years": int(years)},
+            lambda: self._gdp_contribution(self._intermediates(investment_amount, s, shared), years))
+
+    def _gdp_contribution(self, shared: ReportIntermediates, years) -> Dict:
+        investment_amount, s = shared.investment_amount, shared.sector
+        impact, tax = shared.impact, shared.tax
         defaults = self.REVENUE_DEFAULTS.get(s, {"growth": 0.08, "op_ratio": 0.60, "ramp_years": 3})
         year_by_year = []
         cumulative = 0
@@ -65,27 +107,66 @@ class InvestmentImpactCalculator:
             "year_by_year": year_by_year,
         }
 
-    def run_monte_carlo_simulation(self, investment_amount, sector, num_simulations=10000, scenario="base") -> Dict:
+    def run_monte_carlo_simulation(self, investment_amount, sector, num_simulations=10000, scenario="base",
+                                   seed=None) -> Dict:
         s = self._resolve_sector(sector)
-        return self.monte_carlo.run_simulation(investment_amount, s, num_simulations, scenario)
+        return self.monte_carlo.run_simulation(investment_amount, s, num_simulations, scenario, seed=seed)
 
-    def calculate_sez_incentive_impact(self, investment_amount, sez_id, sector, years=10) -> Dict:
+    def monte_carlo_statistics(self, investment_amount, sector, num_simulations=10000, scenario="base",
+                               seed=None) -> Dict:
+        """Summary statistics only; memoized when a seed makes the run reproducible."""
         s = self._resolve_sector(sector)
+
+        def compute():
+            result = self.run_monte_carlo_simulation(investment_amount, s, num_simulations, scenario, seed)
+            return {"statistics": result["statistics"], "outcome_count": len(result["outcomes"])}
+
+        return result_cache.get_or_compute(
+            "monte_carlo", {"amount": float(investment_amount), "sector": s, "num_simulations": int(num_simulations),
+                            "scenario": scenario, "seed": seed},
+            compute, cacheable=seed is not None)
+
+    def get_sez_snapshot(self, sez_id) -> Dict:
+        """Plain-data view of an SEZ so incentive maths can run without a DB session."""
         sez = self.db.query(SpecialEconomicZone).filter(SpecialEconomicZone.id == sez_id).first()
-        incentives = sez.incentive_package if sez else {}
-        tax_with = self.multiplier.calculate_tax_revenue(investment_amount, s, is_sez=True, sez_incentives=incentives)
-        tax_without = self.multiplier.calculate_tax_revenue(investment_amount, s, is_sez=False)
+        if not sez:
+            return {"name": "N/A", "incentive_package": {}}
+        return {"name": sez.name, "incentive_package": sez.incentive_package or {}}
+
+    def calculate_sez_incentive_impact(self, investment_amount, sez_id, sector, years=10, sez=None,
+                                       shared: Optional[ReportIntermediates] = None) -> Dict:
+        s = self._resolve_sector(sector)
+        sez = sez if sez is not None else self.get_sez_snapshot(sez_id)
+        # The SEZ snapshot is part of the key, so results computed from stale
+        # data are unreachable even in processes that miss the invalidation.
+        return result_cache.get_or_compute(
+            "sez_incentive", {"amount": float(investment_amount), "sector": s, "years": int(years),
+                              "sez_id": str(sez_id), "sez": sez},
+            lambda: self._sez_incentive_impact(self._intermediates(investment_amount, s, shared), years, sez),
+            tags=[f"sez:{sez_id}"])
+
+    def _sez_incentive_impact(self, shared: ReportIntermediates, years, sez) -> Dict:
+        incentives = sez["incentive_package"]
+        tax_with = self.multiplier.calculate_tax_revenue(
+            shared.investment_amount, shared.sector, is_sez=True, sez_incentives=incentives, jobs=shared.jobs)
+        tax_without = shared.tax
         tax_savings = tax_without["total_tax"] - tax_with["total_tax"]
         return {
             "with_incentive": tax_with, "without_incentive": tax_without,
             "annual_tax_savings": round(tax_savings, 2),
             "total_savings_over_period": round(tax_savings * min(incentives.get("tax_holiday_years", 5), years), 2),
-            "sez_name": sez.name if sez else "N/A",
+            "sez_name": sez["name"],
             "incentive_package": incentives,
         }
 
     def generate_roi_timeline(self, investment_amount, sector, revenue_assumptions=None) -> Dict:
         s = self._resolve_sector(sector)
+        return result_cache.get_or_compute(
+            "roi_timeline", {"amount": float(investment_amount), "sector": s,
+                             "assumptions": {k: float(v) for k, v in (revenue_assumptions or {}).items()}},
+            lambda: self._roi_timeline(investment_amount, s, revenue_assumptions))
+
+    def _roi_timeline(self, investment_amount, s, revenue_assumptions=None) -> Dict:
         defaults = self.REVENUE_DEFAULTS.get(s, {"growth": 0.08, "op_ratio": 0.60, "ramp_years": 3})
         growth = revenue_assumptions.get("growth_rate", defaults["growth"]) if revenue_assumptions else defaults["growth"]
         op_ratio = revenue_assumptions.get("op_cost_ratio", defaults["op_ratio"]) if revenue_assumptions else defaults["op_ratio"]
@@ -139,12 +220,32 @@ class InvestmentImpactCalculator:
             "gdp_contribution": s.contribution_to_gdp, "growth_rate": s.growth_rate_5yr,
         } for s in sectors]
 
-    def generate_comprehensive_report(self, investment_amount, sector, province, is_sez=False, sez_id=None) -> Dict:
-        jobs = self.calculate_job_creation(investment_amount, sector, province, is_sez)
-        gdp = self.calculate_gdp_contribution(investment_amount, sector)
-        mc = self.run_monte_carlo_simulation(investment_amount, sector, 5000)
-        roi = self.generate_roi_timeline(investment_amount, sector)
-        result = {"job_creation": jobs, "gdp_contribution": gdp, "monte_carlo": mc["statistics"], "roi_timeline": roi}
+    def generate_comprehensive_report(self, investment_amount, sector, province, is_sez=False, sez_id=None,
+                                      sez=None, seed=None, parallel=None, num_simulations=5000) -> Dict:
+        """Assemble every report section from one set of shared multiplier results.
+
+        Sections are independent once the intermediates exist, so with
+        ``parallel`` (default ``REPORT_PARALLEL_SECTIONS``) they run on threads;
+        the Monte Carlo section is NumPy-bound and overlaps with the rest.
+        """
+        s = self._resolve_sector(sector)
+        if is_sez and sez_id and sez is None:
+            sez = self.get_sez_snapshot(sez_id)
+        shared = ReportIntermediates(self.multiplier, investment_amount, s)
+        sections = {
+            "job_creation": lambda: self.calculate_job_creation(investment_amount, s, province, is_sez, shared=shared),
+            "gdp_contribution": lambda: self.calculate_gdp_contribution(investment_amount, s, shared=shared),
+            "monte_carlo": lambda: self.monte_carlo_statistics(investment_amount, s, num_simulations, seed=seed)["statistics"],
+            "roi_timeline": lambda: self.generate_roi_timeline(investment_amount, s),
+        }
         if is_sez and sez_id:
-            result["sez_impact"] = self.calculate_sez_incentive_impact(investment_amount, sez_id, sector)
-        return result
+            sections["sez_impact"] = lambda: self.calculate_sez_incentive_impact(
+                investment_amount, sez_id, s, sez=sez, shared=shared)
+        parallel = settings.REPORT_PARALLEL_SECTIONS if parallel is None else parallel
+        if not parallel:
+            return {name: build() for name, build in sections.items()}
+        # Resolve the shared intermediates first so threads never race to compute them.
+        shared.tax
+        with ThreadPoolExecutor(len(sections), thread_name_prefix="investiq-report") as pool:
+            futures = {name: pool.submit(build) for name, build in sections.items()}
+            return {name: future.result() for name, future in futures.items()}
@@ -0,0 +1,154 @@
+"""Columnar in-memory store of the macroeconomic indicator table.
+
+The whole table is bulk-loaded with one ``read_sql`` (ordered by the
+``(indicator_name, period)`` index) into typed columns, so each indicator is
+a contiguous, period-sorted slice and date ranges resolve by binary search.
+The wide ``period x indicator`` pivot is built lazily from the same arrays.
+
+A snapshot is reused until the data changes: a commit that wrote indicator
+rows bumps the version (after commit, so no reader caches uncommitted rows),
+and a cheap signature of the row count and latest ``created_at``/``updated_at``
+catches rows written outside the ORM or by other worker processes. Frames
+handed out are shared and must be treated as read-only.
+"""
+import threading
+from functools import cached_property
+from typing import Dict, Iterable, Optional
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import event, func, select
+from sqlalchemy.orm import Session
+
+from app.models.indicator import MacroeconomicIndicator
+
+FREQUENCIES = ("ME", "QE", "YE")
+AGGREGATIONS = ("last", "mean", "sum")
+
+
+def check_resample(freq: Optional[str], how: str = "last"):
+    if freq is not None and freq not in FREQUENCIES:
+        raise ValueError(f"Unknown frequency: {freq}. Valid: {list(FREQUENCIES)}")
+    if how not in AGGREGATIONS:
+        raise ValueError(f"Unknown aggregation: {how}. Valid: {list(AGGREGATIONS)}")
+
+
+class IndicatorSnapshot:
+    """Typed columns for one data version, sorted by indicator then period."""
+
+    def __init__(self, signature: tuple, tall: pd.DataFrame):
+        self.signature = signature
+        self.tall = tall
+        self.periods = tall["period"].to_numpy()
+        names = tall["indicator_name"].to_numpy()
+        starts = np.flatnonzero(np.r_[True, names[1:] != names[:-1]]) if len(names) else np.array([], dtype=int)
+        ends = np.r_[starts[1:], len(names)]
+        self.slices: Dict[str, slice] = {names[s]: slice(s, e) for s, e in zip(starts, ends)}
+
+    @property
+    def names(self):
+        return list(self.slices)
+
+    def positions(self, names: Optional[Iterable[str]] = None, start=None, end=None) -> np.ndarray:
+        """Row positions of ``names`` (all by default) within ``[start, end]``."""
+        chunks = []
+        for name in (self.names if names is None else names):
+            s = self.slices.get(name)
+            if s is None:
+                continue
+            periods = self.periods[s]
+            lo = np.searchsorted(periods, np.datetime64(pd.Timestamp(start)), "left") if start is not None else 0
+            hi = np.searchsorted(periods, np.datetime64(pd.Timestamp(end)), "right") if end is not None else len(periods)
+            chunks.append(np.arange(s.start + lo, s.start + hi))
+        return np.concatenate(chunks) if chunks else np.array([], dtype=int)
+
+    def series(self, names: Iterable[str], start=None, end=None) -> pd.DataFrame:
+        """``(period, value)`` rows of the given indicators, ordered by period."""
+        rows = self.tall.iloc[self.positions(names, start, end)]
+        return rows[["period", "value"]].sort_values("period", kind="stable").reset_index(drop=True)
+
+    @cached_property
+    def wide(self) -> pd.DataFrame:
+        wide = self.tall.pivot_table(index="period", columns="indicator_name", values="value", aggfunc="last",
+                                     observed=True).sort_index()
+        wide.columns = wide.columns.astype(str)
+        wide.columns.name = None
+        return wide
+
+
+class IndicatorStore:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._version = 0
+        self._snapshot: Optional[IndicatorSnapshot] = None
+
+    def invalidate(self):
+        with self._lock:
+            self._version += 1
+            self._snapshot = None
+
+    def _signature(self, db: Session) -> tuple:
+        m = MacroeconomicIndicator
+        count, created, updated = db.query(func.count(m.id), func.max(m.created_at), func.max(m.updated_at)).one()
+        return self._version, count, str(created), str(updated)
+
+    def snapshot(self, db: Session) -> IndicatorSnapshot:
+        """The current snapshot; reloaded only when the signature changes."""
+        signature = self._signature(db)
+        current = self._snapshot
+        if current is not None and current.signature == signature:
+            return current
+        m = MacroeconomicIndicator
+        tall = pd.read_sql(
+            select(m.id, m.indicator_name, m.period, m.value, m.source, m.unit).order_by(m.indicator_name, m.period),
+            db.connection(), parse_dates=["period"], dtype={"value": "float64"})
+        for column in ("indicator_name", "source", "unit"):
+            tall[column] = tall[column].astype("category")
+        snapshot = IndicatorSnapshot(signature, tall)
+        with self._lock:
+            if signature[0] == self._version:
+                self._snapshot = snapshot
+        return snapshot
+
+    def series(self, db: Session, names: Iterable[str], start=None, end=None) -> pd.DataFrame:
+        return self.snapshot(db).series(names, start, end)
+
+    def records(self, db: Session, names: Optional[Iterable[str]] = None, start=None, end=None) -> pd.DataFrame:
+        """Full rows (id, source, unit included) ordered by period."""
+        snap = self.snapshot(db)
+        rows = snap.tall.iloc[snap.positions(names, start, end)]
+        return rows.sort_values("period", kind="stable").reset_index(drop=True)
+
+    def wide(self, db: Session, names: Optional[Iterable[str]] = None, start=None, end=None,
+             freq: Optional[str] = None, how: str = "last") -> pd.DataFrame:
+        """``period x indicator`` frame, optionally clipped to a date range and resampled."""
+        check_resample(freq, how)
+        wide = self.snapshot(db).wide
+        if names is not None:
+            wide = wide[[n for n in names if n in wide.columns]].dropna(how="all")
+        wide = wide.loc[pd.Timestamp(start) if start else None:pd.Timestamp(end) if end else None]
+        if freq and not wide.empty:
+            resampled = wide.resample(freq)
+            # min_count keeps empty buckets missing instead of summing to 0.
+            wide = resampled.sum(min_count=1) if how == "sum" else getattr(resampled, how)()
+        return wide
+
+
+indicator_store = IndicatorStore()
+
+
+@event.listens_for(Session, "after_flush")
+def _note_indicator_writes(session, flush_context):
+    if any(isinstance(obj, MacroeconomicIndicator) for obj in (*session.new, *session.dirty, *session.deleted)):
+        session.info["indicators_changed"] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_indicators(session):
+    if session.info.pop("indicators_changed", False):
+        indicator_store.invalidate()
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_indicator_writes(session):
+    session.info.pop("indicators_changed", None)
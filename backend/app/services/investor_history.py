@@ -0,0 +1,95 @@
+"""Process-wide collaborative sector-affinity model over recorded investments.
+
+Each investment contributes an interaction from its investor's origin country
+and, when the investor has a profile, its investor type to its sector. Syncs
+are incremental: only investments whose (groups, sector) key changed since
+the last sync are retracted and re-added.
+"""
+import threading
+from typing import Dict, Optional, Tuple
+
+from sqlalchemy import event, func, select
+from sqlalchemy.orm import Session
+
+from app.database import syncs_from_primary
+from app.ml.collaborative import SectorAffinity
+from app.models.investment import Investment
+from app.models.investor import InvestorProfile
+from app.models.sector import Sector
+
+
+def investor_groups(country: Optional[str], investor_type: Optional[str]) -> Tuple[str, ...]:
+    groups = []
+    if country:
+        groups.append(f"country:{country.strip().casefold()}")
+    if investor_type:
+        groups.append(f"type:{investor_type.strip().casefold()}")
+    return tuple(groups)
+
+
+class InvestorHistoryIndex:
+    def __init__(self):
+        self.model = SectorAffinity()
+        self._lock = threading.Lock()
+        self._version = 0
+        self._signature = None
+        self._indexed: Dict[str, Tuple[Tuple[str, ...], str]] = {}
+
+    def invalidate(self):
+        self._version += 1
+
+    def _signature_of(self, db: Session) -> tuple:
+        modified = func.coalesce(Investment.updated_at, Investment.created_at)
+        count, latest = db.query(func.count(Investment.id), func.max(modified)).one()
+        return self._version, count, str(latest), db.query(func.count(InvestorProfile.id)).scalar()
+
+    @syncs_from_primary
+    def sync(self, db: Session) -> SectorAffinity:
+        signature = self._signature_of(db)
+        if signature == self._signature:
+            return self.model
+        with self._lock:
+            types = select(InvestorProfile.company_name, func.min(InvestorProfile.investor_type).label("investor_type")
+                           ).group_by(InvestorProfile.company_name).subquery()
+            rows = db.query(Investment.id, Investment.investor_country, Sector.code, types.c.investor_type).join(
+                Sector, Sector.id == Investment.sector_id).outerjoin(
+                types, types.c.company_name == Investment.investor_name)
+            current = {inv_id: (investor_groups(country, inv_type), code.lower())
+                       for inv_id, country, code, inv_type in rows}
+            for inv_id, key in self._indexed.items():
+                if current.get(inv_id) != key:
+                    for group in key[0]:
+                        self.model.add(group, key[1], -1.0)
+            for inv_id, key in current.items():
+                if self._indexed.get(inv_id) != key:
+                    for group in key[0]:
+                        self.model.add(group, key[1])
+            self._indexed, self._signature = current, signature
+        return self.model
+
+    def lookup(self, db: Session):
+        """Pair scorer for the recommender; the model is synced on first use."""
+        model = None
+
+        def affinity(investor: Dict, opportunity: Dict) -> Optional[Tuple[float, float]]:
+            nonlocal model
+            if model is None:
+                model = self.sync(db)
+            groups = investor_groups(investor.get("country_of_origin"), investor.get("investor_type"))
+            return model.affinity(groups, opportunity.get("sector_code", "").lower())
+
+        return affinity
+
+
+investor_history = InvestorHistoryIndex()
+
+
+@event.listens_for(Investment, "after_insert")
+@event.listens_for(Investment, "after_update")
+@event.listens_for(Investment, "after_delete")
+@event.listens_for(InvestorProfile, "after_insert")
+@event.listens_for(InvestorProfile, "after_update")
+@event.listens_for(InvestorProfile, "after_delete")
+@event.listens_for(Sector, "after_update")
+def _invalidate_history(mapper, connection, target):
+    investor_history.invalidate()
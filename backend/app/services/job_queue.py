@@ -0,0 +1,230 @@
+"""Background job queue backed by the ``jobs`` table and a local worker pool."""
+import hashlib
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Callable, Dict, Optional, Tuple
+
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.database import SessionLocal
+from app.executor import compute_executor, ComputeSaturatedError
+from app.models.job import Job
+from app.monitoring import REGISTRY
+from app.services import compute_tasks
+from app.services.backtesting import BacktestService
+from app.services.clustering import InvestmentClusteringService
+from app.services.impact_calculator import InvestmentImpactCalculator
+from app.services.report_store import get_report, report_key
+
+REGISTRY.describe("investiq_jobs_total", "counter", "Background jobs by kind and final status.")
+REGISTRY.describe("investiq_jobs_deduplicated_total", "counter", "Submissions answered by an existing job.")
+
+XLSX_MEDIA_TYPE = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+TERMINAL_STATUSES = {"succeeded", "failed"}
+
+
+def job_fingerprint(kind: str, params: Dict) -> str:
+    canonical = json.dumps({"kind": kind, "params": params}, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+def _report_kwargs(db: Session, params: Dict) -> Dict:
+    sez = None
+    if params.get("is_sez") and params.get("sez_id"):
+        sez = InvestmentImpactCalculator(db).get_sez_snapshot(params["sez_id"])
+    return {"investment_amount": params["investment_amount"], "sector": params["sector"],
+            "province": params.get("province", "Harare"), "is_sez": params.get("is_sez", False),
+            "sez_id": params.get("sez_id"), "sez": sez, "seed": params.get("seed")}
+
+
+def _run_monte_carlo(db: Session, params: Dict) -> Tuple:
+    return (compute_tasks.monte_carlo_summary, (params["investment_amount"], params["sector"],
+            params.get("num_simulations", 10000), params.get("scenario", "base"), params.get("seed")), {}), None
+
+
+def _run_comprehensive_report(db: Session, params: Dict) -> Tuple:
+    return (compute_tasks.comprehensive_report, (), _report_kwargs(db, params)), None
+
+
+def _export_task(db: Session, params: Dict, export: Callable, render: Callable) -> Tuple:
+    # Render a stored report when one matches instead of recomputing it in the worker.
+    kwargs = _report_kwargs(db, params)
+    key = report_key(kwargs)
+    report = get_report(key) if key else None
+    return (render, (report,), {}) if report is not None else (export, (), kwargs)
+
+
+def _run_export_pdf(db: Session, params: Dict) -> Tuple:
+    task = _export_task(db, params, compute_tasks.export_impact_pdf, compute_tasks.render_impact_pdf)
+    return task, ("application/pdf", "impact_report.pdf")
+
+
+def _run_export_excel(db: Session, params: Dict) -> Tuple:
+    task = _export_task(db, params, compute_tasks.export_impact_excel, compute_tasks.render_impact_excel)
+    return task, (XLSX_MEDIA_TYPE, "impact_report.xlsx")
+
+
+def _refresh_investment_clusters(db: Session, params: Dict) -> Dict:
+    return InvestmentClusteringService(db).refresh(params.get("refit", False))
+
+
+def _run_backtests(db: Session, params: Dict) -> Dict:
+    return BacktestService(db).run(**params)
+
+
+class JobQueue:
+    """Persists submissions, deduplicates identical ones and executes them on worker threads.
+
+    Handlers resolve any DB inputs with a short-lived session and return the
+    compute task to run; the worker then waits on the compute executor, so the
+    CPU work itself happens in the process pool. ``SESSION_HANDLERS`` instead
+    run the whole job with the worker's session (for jobs that write results
+    back to the database) and return its JSON result.
+    """
+
+    HANDLERS: Dict[str, Callable] = {
+        "monte_carlo": _run_monte_carlo,
+        "comprehensive_report": _run_comprehensive_report,
+        "export_pdf": _run_export_pdf,
+        "export_excel": _run_export_excel,
+    }
+    SESSION_HANDLERS: Dict[str, Callable] = {
+        "investment_clusters": _refresh_investment_clusters,
+        "backtests": _run_backtests,
+    }
+
+    def __init__(self, session_factory: Callable[[], Session] = SessionLocal, workers: int = 2,
+                 result_ttl_hours: int = 24):
+        self.session_factory = session_factory
+        self.workers = workers
+        self.result_ttl = timedelta(hours=result_ttl_hours)
+        self._pool: Optional[ThreadPoolExecutor] = None
+
+    def configure(self, session_factory: Callable[[], Session]):
+        self.session_factory = session_factory
+
+    def _get_pool(self) -> ThreadPoolExecutor:
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(self.workers, thread_name_prefix="investiq-jobs")
+        return self._pool
+
+    def start(self):
+        """Purge expired jobs and re-dispatch work interrupted by a previous shutdown."""
+        db = self.session_factory()
+        try:
+            cutoff = datetime.utcnow() - self.result_ttl
+            db.query(Job).filter(Job.created_at < cutoff).delete(synchronize_session=False)
+            db.query(Job).filter(Job.status == "running").update({"status": "queued"}, synchronize_session=False)
+            db.commit()
+            pending = [j.id for j in db.query(Job.id).filter(Job.status == "queued").all()]
+        finally:
+            db.close()
+        for job_id in pending:
+            self.dispatch(job_id)
+
+    def shutdown(self, wait: bool = True):
+        if self._pool is not None:
+            self._pool.shutdown(wait=wait, cancel_futures=True)
+            self._pool = None
+
+    def _existing(self, db: Session, fingerprint: str, params: Dict) -> Optional[Job]:
+        # Finished results are only reproducible, and so reusable, for seeded runs.
+        statuses = ["queued", "running", "succeeded"] if params.get("seed") is not None else ["queued", "running"]
+        return db.query(Job).filter(
+            Job.fingerprint == fingerprint,
+            Job.status.in_(statuses),
+            Job.created_at >= datetime.utcnow() - self.result_ttl,
+        ).order_by(Job.created_at.desc()).first()
+
+    def submit(self, db: Session, kind: str, params: Dict) -> Tuple[Job, bool]:
+        """Create a job or return the live one (or, for seeded runs, the fresh one) with identical parameters."""
+        if kind not in self.HANDLERS and kind not in self.SESSION_HANDLERS:
+            raise ValueError(f"Unknown job kind: {kind}. Valid: {list(self.HANDLERS) + list(self.SESSION_HANDLERS)}")
+        params = jsonable_encoder(params)
+        fingerprint = job_fingerprint(kind, params)
+        existing = self._existing(db, fingerprint, params)
+        if existing is None:
+            job = Job(kind=kind, fingerprint=fingerprint, params=params, status="queued", live=True)
+            db.add(job)
+            try:
+                db.commit()
+            except IntegrityError:  # a concurrent submission created the live job first
+                db.rollback()
+                existing = self._existing(db, fingerprint, params)
+                if existing is None:
+                    raise
+            else:
+                db.refresh(job)
+                self.dispatch(job.id)
+                return job, False
+        REGISTRY.inc("investiq_jobs_deduplicated_total", kind=kind)
+        return existing, True
+
+    def dispatch(self, job_id: str):
+        self._get_pool().submit(self._process, job_id)
+
+    def _claim(self, db: Session, job_id: str) -> bool:
+        # Atomic conditional update so only one worker (or process) runs a given job.
+        claimed = db.query(Job).filter(Job.id == job_id, Job.status == "queued").update(
+            {"status": "running", "started_at": datetime.utcnow(), "attempts": Job.attempts + 1},
+            synchronize_session=False)
+        db.commit()
+        return claimed == 1
+
+    def _process(self, job_id: str):
+        db = self.session_factory()
+        try:
+            if not self._claim(db, job_id):
+                return
+            job = db.query(Job).filter(Job.id == job_id).first()
+            try:
+                if job.kind in self.SESSION_HANDLERS:
+                    output, file_info = self.SESSION_HANDLERS[job.kind](db, job.params), None
+                else:
+                    (fn, args, kwargs), file_info = self.HANDLERS[job.kind](db, job.params)
+                    db.close()  # release the connection while the compute pool works
+                    output = self._run_compute(fn, args, kwargs)
+                job = db.query(Job).filter(Job.id == job_id).first()
+                if file_info:
+                    job.result_blob = output
+                    job.media_type, job.filename = file_info
+                else:
+                    job.result = jsonable_encoder(output)
+                job.status = "succeeded"
+            except Exception as exc:
+                db.rollback()
+                job = db.query(Job).filter(Job.id == job_id).first()
+                job.status = "failed"
+                job.error = f"{type(exc).__name__}: {exc}"
+            job.finished_at, job.live = datetime.utcnow(), None
+            db.commit()
+            REGISTRY.inc("investiq_jobs_total", kind=job.kind, status=job.status)
+        finally:
+            db.close()
+
+    @staticmethod
+    def _run_compute(fn: Callable, args: tuple, kwargs: dict):
+        delay = 0.5
+        while True:
+            try:
+                return compute_executor.submit(fn, *args, task=fn.__name__, **kwargs).result()
+            except ComputeSaturatedError:
+                # Jobs are not latency-sensitive: back off instead of failing.
+                time.sleep(delay)
+                delay = min(delay * 2, 10.0)
+
+    @staticmethod
+    def describe(job: Job) -> Dict:
+        return {
+            "job_id": job.id, "kind": job.kind, "status": job.status, "error": job.error,
+            "created_at": job.created_at, "started_at": job.started_at, "finished_at": job.finished_at,
+            "result_url": f"{settings.API_V1_PREFIX}/jobs/{job.id}/result" if job.status == "succeeded" else None,
+        }
+
+
+job_queue = JobQueue(workers=settings.JOB_WORKERS, result_ttl_hours=settings.JOB_RESULT_TTL_HOURS)
@@ -7,12 +7,20 @@ from app.models.sector import Sector
 from app.models.investment import Investment
 from app.ml.recommender import InvestmentRecommender
 from app.ml.nlp_processor import NLPProcessor
+from app.config import settings
+from app.services.opportunity_catalog import opportunity_catalog, opportunity_record
+from app.services.investor_history import investor_history
+from app.services.semantic_index import opportunity_index
+from app.services.size_index import range_overlaps
+
+
+RETRIEVAL_MODES = ("auto", "exact", "ann")
 
 
 class InvestmentMatchingEngine:
     def __init__(self, db: Session):
         self.db = db
-        self.recommender = InvestmentRecommender()
+        self.recommender = InvestmentRecommender(history=investor_history.lookup(db))
         self.nlp = NLPProcessor()
 
     def _profile_to_dict(self, p: InvestorProfile) -> Dict:
@@ -28,69 +36,101 @@ class InvestmentMatchingEngine:
 
     def _opp_to_dict(self, o: InvestmentOpportunity) -> Dict:
         sector = self.db.query(Sector).filter(Sector.id == o.sector_id).first()
-        return {
-            "id": str(o.id), "title": o.title, "description": o.description or "",
-            "sector_code": sector.code.lower() if sector else "", "province": o.province or "",
-            "minimum_investment": o.minimum_investment or 0, "maximum_investment": o.maximum_investment or 1e12,
-            "expected_return_rate": o.expected_return_rate or 0, "risk_level": o.risk_level,
-            "sez_id": str(o.sez_id) if o.sez_id else None, "jv_available": o.jv_available,
-            "tags": o.tags or [],
-        }
+        return opportunity_record(o, sector.code if sector else None)
 
-    def match_investor_to_opportunities(self, investor_id, top_n=10) -> List[Dict]:
+    def _semantic_scores(self, inv_dict: Dict) -> Optional[Dict[str, float]]:
+        """Inquiry similarity to every opportunity in one sparse product; None without inquiry text."""
+        if not inv_dict["inquiry_text"].strip():
+            return None
+        return opportunity_index.scores(self.db, inv_dict["inquiry_text"])
+
+    def _investor_similarities(self, opportunity_id: str, inv_dicts: List[Dict]) -> Dict[str, float]:
+        with_text = [d for d in inv_dicts if d["inquiry_text"].strip()]
+        sims = opportunity_index.similarity_to(self.db, opportunity_id, [d["inquiry_text"] for d in with_text])
+        return {d["id"]: float(sim) for d, sim in zip(with_text, sims)}
+
+    def match_investor_to_opportunities(self, investor_id, top_n=10, retrieval="auto", size_overlap=False) -> List[Dict]:
+        """Rank available opportunities; "ann" fully scores only a prefiltered, vector-ranked candidate set.
+
+        ``size_overlap`` restricts ranking to opportunities whose investment range overlaps the investor's.
+        """
+        if retrieval not in RETRIEVAL_MODES:
+            raise ValueError(f"Unknown retrieval mode: {retrieval}. Valid: {list(RETRIEVAL_MODES)}")
         investor = self.db.query(InvestorProfile).filter(InvestorProfile.id == investor_id).first()
         if not investor:
             return []
-        opportunities = self.db.query(InvestmentOpportunity).filter(
-            InvestmentOpportunity.status == "available").all()
+        catalog = opportunity_catalog.sync(self.db)
         inv_dict = self._profile_to_dict(investor)
-        opp_dicts = [self._opp_to_dict(o) for o in opportunities]
-        ranked = self.recommender.rank_opportunities(inv_dict, opp_dicts)
+        if retrieval == "ann" or (retrieval == "auto" and len(catalog) >= settings.MATCH_ANN_MIN_CATALOG):
+            opp_dicts = catalog.candidates(inv_dict, max(settings.MATCH_ANN_CANDIDATES, top_n), size_overlap)
+        elif size_overlap:
+            opp_dicts = [catalog.records[i] for i in catalog.size_overlapping(inv_dict)]
+        else:
+            opp_dicts = catalog.records
+        ranked = self.recommender.rank_opportunities(inv_dict, opp_dicts, self._semantic_scores(inv_dict))
         return ranked[:top_n]
 
-    def match_opportunity_to_investors(self, opportunity_id, top_n=10) -> List[Dict]:
+    def match_opportunity_to_investors(self, opportunity_id, top_n=10, size_overlap=False) -> List[Dict]:
         opp = self.db.query(InvestmentOpportunity).filter(InvestmentOpportunity.id == opportunity_id).first()
         if not opp:
             return []
-        investors = self.db.query(InvestorProfile).all()
+        query = self.db.query(InvestorProfile)
+        if size_overlap:
+            query = query.filter(range_overlaps(InvestorProfile.investment_range_min,
+                                                InvestorProfile.investment_range_max,
+                                                opp.minimum_investment or 0, opp.maximum_investment or float("inf")))
+        investors = query.all()
         opp_dict = self._opp_to_dict(opp)
         inv_dicts = [self._profile_to_dict(i) for i in investors]
-        ranked = self.recommender.rank_investors(opp_dict, inv_dicts)
+        ranked = self.recommender.rank_investors(opp_dict, inv_dicts,
+                                                 self._investor_similarities(opp_dict["id"], inv_dicts))
         return ranked[:top_n]
 
     def analyse_investor_inquiry(self, inquiry_text: str) -> Dict:
         return self.nlp.full_analysis(inquiry_text)
 
-    def build_similarity_network(self) -> Dict:
-        investments = self.db.query(Investment).limit(50).all()
-        opportunities = self.db.query(InvestmentOpportunity).limit(20).all()
-        nodes, edges = [], []
-        for inv in investments:
-            sector = self.db.query(Sector).filter(Sector.id == inv.sector_id).first()
-            nodes.append({
-                "id": str(inv.id), "label": inv.project_name, "type": "investment",
-                "cluster": hash(sector.code) % 5 if sector else 0, "size": inv.investment_amount_usd / 1e9,
-            })
-        for opp in opportunities:
-            sector = self.db.query(Sector).filter(Sector.id == opp.sector_id).first()
-            nodes.append({
-                "id": str(opp.id), "label": opp.title, "type": "opportunity",
-                "cluster": hash(sector.code) % 5 if sector else 0, "size": (opp.maximum_investment or 1e7) / 1e9,
-            })
-        for i, n1 in enumerate(nodes):
-            for j, n2 in enumerate(nodes):
-                if i < j and n1["cluster"] == n2["cluster"]:
-                    edges.append({"source": n1["id"], "target": n2["id"], "weight": 0.7})
-        clusters = [{"id": c, "name": f"Cluster {c}", "count": sum(1 for n in nodes if n["cluster"] == c)} for c in set(n["cluster"] for n in nodes)]
-        return {"nodes": nodes, "edges": edges[:100], "clusters": clusters}
+    def build_similarity_network(self, columnar: bool = False) -> Dict:
+        """Investments and opportunities linked when they fall in the same sector cluster.
+
+        With ``columnar`` nodes and edges are returned as parallel arrays, and
+        edge ``source``/``target`` are positions in the node arrays rather than ids.
+        """
+        investments = self.db.query(Investment.id, Investment.project_name, Sector.code,
+                                    Investment.investment_amount_usd).outerjoin(
+            Sector, Sector.id == Investment.sector_id).limit(50).all()
+        opportunities = self.db.query(InvestmentOpportunity.id, InvestmentOpportunity.title, Sector.code,
+                                      InvestmentOpportunity.maximum_investment).outerjoin(
+            Sector, Sector.id == InvestmentOpportunity.sector_id).limit(20).all()
+        nodes = {"id": [], "label": [], "type": [], "cluster": [], "size": []}
+        for node_type, rows, default_size in (("investment", investments, 0), ("opportunity", opportunities, 1e7)):
+            for node_id, label, code, amount in rows:
+                nodes["id"].append(str(node_id))
+                nodes["label"].append(label)
+                nodes["type"].append(node_type)
+                nodes["cluster"].append(hash(code) % 5 if code else 0)
+                nodes["size"].append((amount or default_size) / 1e9)
+        members: Dict[int, List[int]] = {}
+        for i, cluster in enumerate(nodes["cluster"]):
+            members.setdefault(cluster, []).append(i)
+        pairs = sorted((i, j) for group in members.values() for k, i in enumerate(group) for j in group[k + 1:])[:100]
+        clusters = [{"id": c, "name": f"Cluster {c}", "count": len(group)} for c, group in members.items()]
+        if columnar:
+            edges = {"source": [i for i, _ in pairs], "target": [j for _, j in pairs], "weight": [0.7] * len(pairs)}
+            return {"nodes": nodes, "edges": edges, "clusters": clusters}
+        ids = nodes["id"]
+        return {"nodes": [dict(zip(nodes, values)) for values in zip(*nodes.values())],
+                "edges": [{"source": ids[i], "target": ids[j], "weight": 0.7} for i, j in pairs],
+                "clusters": clusters}
 
     def compute_match_score(self, investor_id, opportunity_id) -> Dict:
         investor = self.db.query(InvestorProfile).filter(InvestorProfile.id == investor_id).first()
         opp = self.db.query(InvestmentOpportunity).filter(InvestmentOpportunity.id == opportunity_id).first()
         if not investor or not opp:
             return {"overall_score": 0, "breakdown": {}}
-        scores = self.recommender.compute_match_score(self._profile_to_dict(investor), self._opp_to_dict(opp))
-        explanation = self.recommender.explain_match(self._profile_to_dict(investor), self._opp_to_dict(opp), scores)
+        inv_dict, opp_dict = self._profile_to_dict(investor), self._opp_to_dict(opp)
+        similarity = self._investor_similarities(opp_dict["id"], [inv_dict]).get(inv_dict["id"])
+        scores = self.recommender.compute_match_score(inv_dict, opp_dict, similarity)
+        explanation = self.recommender.explain_match(inv_dict, opp_dict, scores)
         return {**scores, "explanation": explanation}
 
     def get_proactive_recommendations(self) -> List[Dict]:
@@ -99,10 +139,11 @@ class InvestmentMatchingEngine:
         results = []
         for investor in investors:
             inv_dict = self._profile_to_dict(investor)
+            similarities = self._semantic_scores(inv_dict) or {}
             best_score, best_opp = 0, None
             for opp in opportunities:
                 opp_dict = self._opp_to_dict(opp)
-                score = self.recommender.compute_match_score(inv_dict, opp_dict)
+                score = self.recommender.compute_match_score(inv_dict, opp_dict, similarities.get(opp_dict["id"]))
                 if score["overall_score"] > best_score:
                     best_score = score["overall_score"]
                     best_opp = opp
@@ -0,0 +1,68 @@
+"""In-process cache of fitted forecasting models keyed by series fingerprint.
+
+A fingerprint hashes the exact periods and values a model was fitted on, so a
+model is reused until the underlying rows change and never goes stale.
+"""
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Optional
+
+import numpy as np
+import pandas as pd
+
+from app.config import settings
+from app.monitoring import REGISTRY
+
+REGISTRY.describe("investiq_model_cache_requests_total", "counter", "Fitted-model cache lookups by outcome.")
+REGISTRY.describe("investiq_model_cache_entries", "gauge", "Fitted models held in memory.")
+
+
+def series_fingerprint(data: pd.DataFrame, date_col: str = "period", value_col: str = "value") -> str:
+    digest = hashlib.sha256()
+    digest.update(data[date_col].astype(str).str.cat(sep="|").encode())
+    digest.update(np.ascontiguousarray(data[value_col].to_numpy(dtype=float)).tobytes())
+    return digest.hexdigest()
+
+
+class FittedModelCache:
+    def __init__(self, max_entries: int = 256):
+        self.max_entries = max_entries
+        self._models: "OrderedDict[str, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._models)
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            model = self._models.get(key)
+            if model is not None:
+                self._models.move_to_end(key)
+        REGISTRY.inc("investiq_model_cache_requests_total", outcome="miss" if model is None else "hit")
+        return model
+
+    def put(self, key: str, model: Any):
+        with self._lock:
+            self._models[key] = model
+            self._models.move_to_end(key)
+            while len(self._models) > self.max_entries:
+                self._models.popitem(last=False)
+
+    def get_or_fit(self, key: str, fit: Callable[[], Any]) -> Any:
+        model = self.get(key)
+        if model is None:
+            model = fit()
+            self.put(key, model)
+        return model
+
+    def clear(self):
+        with self._lock:
+            self._models.clear()
+
+    def collect(self, registry):
+        registry.set("investiq_model_cache_entries", len(self._models))
+
+
+fitted_models = FittedModelCache(settings.FORECAST_MODEL_CACHE_SIZE)
+REGISTRY.add_collector(fitted_models.collect)
@@ -0,0 +1,63 @@
+"""Process-wide retrieval index over available investment opportunities.
+
+The catalogue is loaded with one sector-joined query and rebuilt only when a
+count/last-modified signature (or a version bumped by mapper events) changes,
+so matching requests no longer look up each opportunity's sector separately.
+"""
+import threading
+from typing import Dict, Optional
+
+from sqlalchemy import event, func
+from sqlalchemy.orm import Session
+
+from app.database import syncs_from_primary
+from app.ml.retrieval import CandidateIndex
+from app.models.investor import InvestmentOpportunity
+from app.models.sector import Sector
+
+
+def opportunity_record(o: InvestmentOpportunity, sector_code: Optional[str]) -> Dict:
+    return {
+        "id": str(o.id), "title": o.title, "description": o.description or "",
+        "sector_code": sector_code.lower() if sector_code else "", "province": o.province or "",
+        "minimum_investment": o.minimum_investment or 0, "maximum_investment": o.maximum_investment or 1e12,
+        "expected_return_rate": o.expected_return_rate or 0, "risk_level": o.risk_level,
+        "sez_id": str(o.sez_id) if o.sez_id else None, "jv_available": o.jv_available,
+        "tags": o.tags or [],
+    }
+
+
+class OpportunityCatalog:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._version = 0
+        self._index: Optional[CandidateIndex] = None
+        self._signature = None
+
+    def invalidate(self):
+        self._version += 1
+
+    @syncs_from_primary
+    def sync(self, db: Session) -> CandidateIndex:
+        modified = func.coalesce(InvestmentOpportunity.updated_at, InvestmentOpportunity.created_at)
+        count, latest = db.query(func.count(InvestmentOpportunity.id), func.max(modified)).one()
+        signature = (self._version, count, str(latest))
+        with self._lock:
+            if signature != self._signature:
+                rows = db.query(InvestmentOpportunity, Sector.code).outerjoin(
+                    Sector, Sector.id == InvestmentOpportunity.sector_id).filter(
+                    InvestmentOpportunity.status == "available")
+                self._index = CandidateIndex([opportunity_record(o, code) for o, code in rows])
+                self._signature = signature
+            return self._index
+
+
+opportunity_catalog = OpportunityCatalog()
+
+
+@event.listens_for(InvestmentOpportunity, "after_insert")
+@event.listens_for(InvestmentOpportunity, "after_update")
+@event.listens_for(InvestmentOpportunity, "after_delete")
+@event.listens_for(Sector, "after_update")
+def _invalidate_catalog(mapper, connection, target):
+    opportunity_catalog.invalidate()
@@ -1,16 +1,25 @@
 """Predictive analytics service for FDI forecasting and sector analysis."""
+import hashlib
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
-from typing import Optional, List, Dict
+from typing import Optional, List, Dict, Tuple
 from sqlalchemy.orm import Session
 from sqlalchemy import func, extract
 
+from app.config import settings
+from app.executor import compute_executor
 from app.models.investment import Investment
 from app.models.sector import Sector
-from app.models.indicator import MacroeconomicIndicator
+from app.ml.covariance import align_returns, correlation_estimate, covariance_from_correlation
+from app.ml.driver_model import DriverModel
 from app.ml.fdi_forecaster import FDIForecaster
-from app.ml.risk_scorer import RiskScorer
+from app.ml.risk_scorer import RiskScorer, metric_records
+from app.services import compute_tasks
+from app.services.backtesting import BacktestService
+from app.services.clustering import InvestmentClusteringService
+from app.services.indicator_store import indicator_store
+from app.services.model_cache import fitted_models, series_fingerprint
 
 
 class PredictiveAnalyticsService:
@@ -19,54 +28,209 @@ class PredictiveAnalyticsService:
         self.forecaster = FDIForecaster()
         self.risk_scorer = RiskScorer()
 
-    def forecast_fdi_trends(self, sector_id=None, horizon_months=24, confidence_interval=0.95) -> Dict:
-        indicators = self.db.query(MacroeconomicIndicator).filter(
-            MacroeconomicIndicator.indicator_name.in_(["fdi_inflow", "fdi_inflow_quarterly"])
-        ).order_by(MacroeconomicIndicator.period).all()
+    FDI_INDICATORS = ["fdi_inflow", "fdi_inflow_quarterly"]
 
-        if not indicators:
-            dates = pd.date_range("2018-01-01", periods=28, freq="QE")
-            values = np.random.normal(100, 20, 28).cumsum() / 28 + 80
-            df = pd.DataFrame({"period": dates, "value": values})
-        else:
-            df = pd.DataFrame([{"period": i.period, "value": i.value} for i in indicators])
+    def load_series(self, sector_id=None, indicator=None) -> Tuple[pd.DataFrame, str]:
+        """Return the ``(period, value)`` series a forecast is fitted on and a label for its source.
 
-        self.forecaster.fit(df, "period", "value")
-        result = self.forecaster.predict(horizon_months, confidence_interval)
-        return {
-            "predictions": result.get("predictions", []),
-            "history": result.get("history", []),
-            "model_accuracy": result.get("model_accuracy", 0),
-            "key_drivers": ["GDP Growth", "Exchange Rate Stability", "Commodity Prices", "Regional Trade Agreements"],
-        }
+        Raises ``ValueError`` when both a sector and an indicator are given.
+        """
+        if sector_id and indicator:
+            raise ValueError("Pass either sector or indicator, not both")
+        if indicator:
+            return self._indicator_series([indicator]), f"indicator:{indicator}"
+        if sector_id:
+            return self._investment_series(sector_id), "investments"
+        df = self._indicator_series(self.FDI_INDICATORS)
+        if df.empty:
+            return self._investment_series(), "investments"
+        return df, "indicator:fdi_inflow"
+
+    def driver_model(self, target: str = "fdi_inflow", freq: str = "YE") -> DriverModel:
+        """Driver regression on the wide indicator store, refitted only when indicator data changes.
+
+        Raises ``ValueError`` when the target has too little overlapping data.
+        """
+        snapshot = indicator_store.snapshot(self.db)
+        return fitted_models.get_or_fit(f"drivers:{target}:{freq}:{snapshot.signature}",
+                                        lambda: DriverModel(target, freq=freq).fit(snapshot.wide))
 
-    def compute_sector_risk_return(self) -> List[Dict]:
-        sectors = self.db.query(Sector).all()
-        if not sectors:
+    def key_drivers(self) -> List[str]:
+        try:
+            return [d["label"] for d in self.driver_model().key_drivers()]
+        except ValueError:
             return []
-        sector_data = []
-        for s in sectors:
-            total_inv = self.db.query(func.sum(Investment.investment_amount_usd)).filter(
-                Investment.sector_id == s.id).scalar() or 0
-            count = self.db.query(func.count(Investment.id)).filter(Investment.sector_id == s.id).scalar() or 0
-            sector_data.append({
-                "name": s.name, "code": s.code, "avg_return_rate": s.avg_return_rate or 0.1,
-                "risk_score": s.risk_score or 50, "total_investment": total_inv, "investment_count": count,
-            })
-        return self.risk_scorer.calculate_sector_metrics(sector_data)
+
+    def _indicator_series(self, names: List[str]) -> pd.DataFrame:
+        return indicator_store.series(self.db, names)
+
+    def _investment_rows(self, sector_id=None) -> pd.DataFrame:
+        query = self.db.query(Investment.sector_id, Investment.date_received, Investment.created_at,
+                              Investment.investment_amount_usd)
+        if sector_id:
+            query = query.filter(Investment.sector_id == sector_id)
+        return pd.DataFrame(query.all(), columns=["sector_id", "date_received", "created_at", "value"])
+
+    def _investment_series(self, sector_id=None) -> pd.DataFrame:
+        return _quarterly_inflows(self._investment_rows(sector_id))
+
+    def forecast_fdi_trends(self, sector_id=None, horizon_months=24, confidence_interval=0.95,
+                            columnar=False, indicator=None, model=None) -> Dict:
+        df, source = self.load_series(sector_id, indicator)
+        result = self.forecast_many({"series": (df, source)}, horizon_months, confidence_interval, columnar,
+                                    model)["series"]
+        # Accuracy is out-of-sample: 100 - MAPE of the latest stored backtest when the series has one,
+        # otherwise the fitted engine's holdout figure.
+        backtest = None
+        if source.startswith("indicator:") and result["model"]:
+            stored = BacktestService(self.db).results(source.split(":", 1)[1], result["model"], horizon=1)
+            backtest = stored[0] if stored else None
+        accuracy_source = "holdout"
+        if backtest and backtest["mape"] is not None:
+            result["model_accuracy"], accuracy_source = round(max(100 - backtest["mape"], 0), 1), "backtest"
+        return {**result, "backtest": backtest, "accuracy_source": accuracy_source}
+
+    def forecast_many(self, series: Dict[str, Tuple[pd.DataFrame, str]], horizon_months=24, confidence_interval=0.95,
+                      columnar=False, model=None) -> Dict[str, Dict]:
+        """Forecast several labelled series, fitting uncached models in parallel on the compute pool.
+
+        Fitted models are cached by engine and series fingerprint, so a model
+        is refitted only when its underlying rows change.
+        """
+        model = model or settings.FORECAST_ENGINE
+        keys = {label: f"{model}:{series_fingerprint(df)}" for label, (df, _) in series.items() if not df.empty}
+        fitted = {label: fitted_models.get(key) for label, key in keys.items()}
+        missing = [label for label, forecaster in fitted.items() if forecaster is None]
+        if len(missing) == 1:
+            # A single fit is cheaper inline than a round trip to a worker process.
+            fitted[missing[0]] = compute_tasks.fit_forecasters([series[missing[0]][0]], model)[0]
+        elif missing:
+            fitted.update(zip(missing, compute_executor.map_chunked(
+                compute_tasks.fit_forecasters, [series[label][0] for label in missing], model)))
+        for label in missing:
+            fitted_models.put(keys[label], fitted[label])
+
+        key_drivers = self.key_drivers()
+        results = {}
+        for label, (df, source) in series.items():
+            response = {"key_drivers": key_drivers, "source": source, "data_points": len(df)}
+            if df.empty:
+                empty = {"step": [], "value": []} if columnar else []
+                results[label] = {"predictions": empty, "history": empty, "model_accuracy": 0, "model": None,
+                                  **response}
+                continue
+            # predict() does not mutate the model, so cached instances are shared safely.
+            result = fitted[label].predict(horizon_months, confidence_interval, columnar=columnar)
+            results[label] = {
+                "predictions": result.get("predictions", []),
+                "history": result.get("history", []),
+                "model_accuracy": result.get("model_accuracy", 0),
+                "model": result.get("model"),
+                **response,
+            }
+        return results
+
+    def forecast_sectors(self, horizon_months=24, confidence_interval=0.95, columnar=False, model=None) -> List[Dict]:
+        """Per-sector investment forecasts from a single investment query."""
+        sectors = self.db.query(Sector).order_by(Sector.code).all()
+        rows = self._investment_rows()
+        series = {s.id: (_quarterly_inflows(rows[rows["sector_id"] == s.id]), "investments") for s in sectors}
+        results = self.forecast_many(series, horizon_months, confidence_interval, columnar, model)
+        return [{"sector": s.code, "name": s.name, **results[s.id]} for s in sectors]
+
+    def compute_sector_risk_return(self, columnar: bool = False):
+        """Sector risk-return metrics from one grouped query; ``columnar`` returns one list per metric."""
+        rows = self.db.query(
+            Sector.name, Sector.code, Sector.avg_return_rate, Sector.risk_score,
+            func.coalesce(func.sum(Investment.investment_amount_usd), 0), func.count(Investment.id),
+        ).outerjoin(Investment, Investment.sector_id == Sector.id).group_by(Sector.id).order_by(Sector.code).all()
+        if not rows:
+            return {} if columnar else []
+        names, codes, returns, risks, totals, counts = (list(c) for c in zip(*rows))
+        history = self.sector_return_series()
+        columns = self.risk_scorer.sector_metrics(
+            np.array([r or 0.1 for r in returns], dtype=float), np.array([r or 50 for r in risks], dtype=float),
+            np.array(totals, dtype=float), np.array(counts, dtype=int),
+            history=align_returns(history, codes) if history else None)
+        return _metric_output({"sector_name": names, "sector_code": codes, **columns}, columnar)
+
+    def compute_province_risk_return(self, columnar: bool = False):
+        """Province profiles: investment-weighted sector return and risk, scored with the sector metrics."""
+        amount = Investment.investment_amount_usd
+        rows = self.db.query(
+            Investment.province, func.sum(amount), func.count(Investment.id),
+            func.sum(amount * func.coalesce(Sector.avg_return_rate, 0.1)),
+            func.sum(amount * func.coalesce(Sector.risk_score, 50)),
+        ).join(Sector, Investment.sector_id == Sector.id).group_by(Investment.province).order_by(Investment.province).all()
+        if not rows:
+            return {} if columnar else []
+        provinces, totals, counts, weighted_returns, weighted_risks = (np.array(c) for c in zip(*rows))
+        totals = totals.astype(float)
+        safe = np.where(totals > 0, totals, 1.0)
+        columns = self.risk_scorer.sector_metrics(
+            np.where(totals > 0, weighted_returns.astype(float) / safe, 0.1),
+            np.where(totals > 0, weighted_risks.astype(float) / safe, 50.0), totals, counts.astype(int))
+        return _metric_output({"province": [p or "N/A" for p in provinces], **columns}, columnar)
 
     def optimise_portfolio_allocation(self, total_budget, risk_tolerance, constraints=None) -> Dict:
         metrics = self.compute_sector_risk_return()
         if not metrics:
-            return {"allocations": [], "expected_portfolio_return": 0, "portfolio_risk": 0, "sharpe_ratio": 0}
+            return self.build_allocation_response(metrics, None, total_budget)
+        returns, cov_matrix = self.portfolio_inputs(metrics)
+        result = self.risk_scorer.optimize_portfolio(returns, cov_matrix, risk_tolerance)
+        return self.build_allocation_response(metrics, result, total_budget)
+
+    def portfolio_inputs(self, metrics: List[Dict]):
+        """Expected returns and covariance: sector volatilities scaled by the empirical correlation."""
         returns = np.array([m["avg_return"] for m in metrics])
         vols = np.array([m["volatility"] for m in metrics])
-        n = len(returns)
-        cov_matrix = np.diag(vols ** 2)
-        for i in range(n):
-            for j in range(i + 1, n):
-                cov_matrix[i, j] = cov_matrix[j, i] = 0.3 * vols[i] * vols[j]
-        result = self.risk_scorer.optimize_portfolio(returns, cov_matrix, risk_tolerance)
+        corr = self.sector_correlation([m["sector_code"] for m in metrics])["matrix"]
+        return returns, covariance_from_correlation(corr, vols)
+
+    def investment_signature(self) -> str:
+        """Cheap fingerprint of the investment table and sector codes, for keying data derived from them."""
+        modified = func.coalesce(Investment.updated_at, Investment.created_at)
+        count, latest = self.db.query(func.count(Investment.id), func.max(modified)).one()
+        sectors = self.db.query(Sector.id, Sector.code).order_by(Sector.id).all()
+        return hashlib.sha256(repr((count, str(latest), sectors)).encode()).hexdigest()
+
+    def sector_return_series(self, signature: Optional[str] = None) -> Dict[str, pd.Series]:
+        """Quarterly growth of each sector's cumulative invested capital, keyed by sector code.
+
+        Cached on ``investment_signature``, so the table load and pivot run only
+        when investments or sector codes change. Callers must not mutate the result.
+        """
+        signature = signature or self.investment_signature()
+        return fitted_models.get_or_fit(f"sector-returns:{signature}", self._load_sector_return_series)
+
+    def _load_sector_return_series(self) -> Dict[str, pd.Series]:
+        rows = self._investment_rows()
+        codes = dict(self.db.query(Sector.id, Sector.code).all())
+        rows = rows[rows["sector_id"].isin(list(codes))]
+        if rows.empty:
+            return {}
+        periods = pd.to_datetime(rows["date_received"]).fillna(pd.to_datetime(rows["created_at"]))
+        inflows = rows.pivot_table(index=periods, columns="sector_id", values="value", aggfunc="sum")
+        capital = inflows.resample("QE").sum().cumsum()
+        growth = (capital.diff() / capital.shift()).replace([np.inf, -np.inf], np.nan).iloc[1:]
+        return {codes[sector_id]: growth[sector_id] for sector_id in growth.columns}
+
+    def sector_correlation(self, codes: Optional[List[str]] = None) -> Dict:
+        """Shrunk empirical sector correlation, cached on the investment signature and requested sectors."""
+        signature = self.investment_signature()
+        if codes is None:
+            codes = sorted(self.sector_return_series(signature))
+
+        def estimate():
+            series = self.sector_return_series(signature)
+            returns = align_returns(series, codes) if series else None
+            return correlation_estimate(returns, len(codes))
+
+        return {"sectors": codes, **fitted_models.get_or_fit(f"correlation:{signature}:{','.join(codes)}", estimate)}
+
+    def build_allocation_response(self, metrics: List[Dict], result: Optional[Dict], total_budget) -> Dict:
+        if not metrics or result is None:
+            return {"allocations": [], "expected_portfolio_return": 0, "portfolio_risk": 0, "sharpe_ratio": 0}
         allocations = []
         for i, m in enumerate(metrics):
             w = result["weights"][i]
@@ -83,29 +247,7 @@ class PredictiveAnalyticsService:
         }
 
     def detect_investment_patterns(self) -> List[Dict]:
-        investments = self.db.query(Investment).all()
-        if not investments:
-            return []
-        patterns = {}
-        for inv in investments:
-            sector = self.db.query(Sector).filter(Sector.id == inv.sector_id).first()
-            key = sector.code if sector else "UNK"
-            if key not in patterns:
-                patterns[key] = {"name": sector.name if sector else "Unknown", "count": 0, "total": 0, "countries": [], "amounts": []}
-            patterns[key]["count"] += 1
-            patterns[key]["total"] += inv.investment_amount_usd
-            if inv.investor_country and inv.investor_country not in patterns[key]["countries"]:
-                patterns[key]["countries"].append(inv.investor_country)
-            patterns[key]["amounts"].append(inv.investment_amount_usd)
-        result = []
-        for i, (code, p) in enumerate(patterns.items()):
-            result.append({
-                "cluster_id": i, "pattern_name": f"{p['name']} Investments",
-                "description": f"Cluster of {p['count']} investments in {p['name']} averaging ${p['total']/p['count']/1e6:.1f}M",
-                "investment_count": p["count"], "avg_amount": p["total"] / p["count"],
-                "top_sectors": [p["name"]], "top_origins": p["countries"][:5],
-            })
-        return result
+        return InvestmentClusteringService(self.db).patterns()
 
     def get_dashboard_summary(self) -> Dict:
         current_year = datetime.now().year
@@ -118,14 +260,12 @@ class PredictiveAnalyticsService:
         ).join(Investment, Investment.sector_id == Sector.id).group_by(Sector.name).all()
         sector_breakdown = [{"name": s[0], "value": s[1] or 0, "count": s[2]} for s in sectors]
 
-        top_inv = self.db.query(Investment).order_by(Investment.investment_amount_usd.desc()).limit(10).all()
-        top_investors = []
-        for inv in top_inv:
-            sector = self.db.query(Sector).filter(Sector.id == inv.sector_id).first()
-            top_investors.append({
-                "name": inv.investor_name or inv.project_name, "country": inv.investor_country or "N/A",
-                "amount": inv.investment_amount_usd, "sector": sector.name if sector else "N/A",
-            })
+        top_inv = self.db.query(Investment, Sector.name).outerjoin(Sector, Sector.id == Investment.sector_id
+        ).order_by(Investment.investment_amount_usd.desc()).limit(10).all()
+        top_investors = [{
+            "name": inv.investor_name or inv.project_name, "country": inv.investor_country or "N/A",
+            "amount": inv.investment_amount_usd, "sector": sector_name or "N/A",
+        } for inv, sector_name in top_inv]
 
         provinces = self.db.query(Investment.province, func.sum(Investment.investment_amount_usd), func.count(Investment.id)
         ).group_by(Investment.province).all()
@@ -136,15 +276,32 @@ class PredictiveAnalyticsService:
             "total_jobs": jobs or 0, "pending_inquiries": pending,
             "sector_breakdown": sector_breakdown, "monthly_trend": [],
             "top_investors": top_investors, "province_distribution": province_dist,
+            "sector_risk_return": self.compute_sector_risk_return(columnar=True),
         }
 
-    def get_trend_decomposition(self, indicator_name: str) -> Dict:
-        indicators = self.db.query(MacroeconomicIndicator).filter(
-            MacroeconomicIndicator.indicator_name == indicator_name
-        ).order_by(MacroeconomicIndicator.period).all()
-        if not indicators:
+    def get_trend_decomposition(self, indicator_name: str, start=None, end=None, freq=None, how="last") -> Dict:
+        if freq:
+            wide = indicator_store.wide(self.db, [indicator_name], start, end, freq, how)
+            values = wide[indicator_name].dropna() if indicator_name in wide else pd.Series(dtype=float)
+            df = pd.DataFrame({"period": values.index, "value": values.to_numpy()})
+        else:
+            df = indicator_store.series(self.db, [indicator_name], start, end)
+        if df.empty:
             return {"dates": [], "trend": [], "seasonal": [], "residual": []}
-        df = pd.DataFrame([{"period": i.period, "value": i.value} for i in indicators])
         result = self.forecaster.decompose_trend(df, "value", min(4, len(df)))
-        dates = [str(i.period) for i in indicators]
-        return {"dates": dates, **result}
+        return {"dates": df["period"].dt.strftime("%Y-%m-%d").tolist(), **result}
+
+
+def _metric_output(columns: Dict, columnar: bool):
+    if columnar:
+        return {key: np.asarray(values).tolist() for key, values in columns.items()}
+    return metric_records(columns)
+
+
+def _quarterly_inflows(rows: pd.DataFrame) -> pd.DataFrame:
+    """Quarterly investment inflows in USD millions, with empty quarters as zero."""
+    if rows.empty:
+        return pd.DataFrame(columns=["period", "value"])
+    periods = pd.to_datetime(rows["date_received"]).fillna(pd.to_datetime(rows["created_at"]))
+    quarterly = rows["value"].groupby(periods).sum().resample("QE").sum() / 1_000_000
+    return pd.DataFrame({"period": quarterly.index.date, "value": quarterly.to_numpy()})
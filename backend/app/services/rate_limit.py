@@ -0,0 +1,47 @@
+"""In-memory token-bucket rate limiting.
+
+Each key owns a bucket holding up to ``capacity`` tokens that refills at
+``rate`` tokens per second; a request spends one token or is refused with
+the time until one becomes available. Buckets idle long enough to be full
+again carry no state and are pruned.
+"""
+import threading
+import time
+from typing import Dict, Tuple
+
+from app.monitoring import REGISTRY
+
+REGISTRY.describe("investiq_rate_limited_total", "counter", "Requests refused by a rate limiter.")
+
+
+class TokenBucketLimiter:
+    def __init__(self, name: str, capacity: float, per_minute: float, max_keys: int = 100_000):
+        self.name = name
+        self.capacity = float(capacity)
+        self.rate = per_minute / 60.0
+        self.max_keys = max_keys
+        self._buckets: Dict[str, Tuple[float, float]] = {}  # key -> (tokens, last refill)
+        self._lock = threading.Lock()
+
+    def acquire(self, key: str) -> Tuple[bool, float]:
+        """Spend a token for ``key``; returns (allowed, seconds until a retry can succeed)."""
+        now = time.monotonic()
+        with self._lock:
+            tokens, last = self._buckets.get(key, (self.capacity, now))
+            tokens = min(self.capacity, tokens + (now - last) * self.rate)
+            if tokens >= 1:
+                self._buckets[key] = (tokens - 1, now)
+                if len(self._buckets) > self.max_keys:
+                    self._prune(now)
+                return True, 0.0
+            self._buckets[key] = (tokens, now)
+        REGISTRY.inc("investiq_rate_limited_total", limiter=self.name)
+        return False, (1 - tokens) / self.rate if self.rate > 0 else float("inf")
+
+    def _prune(self, now: float):
+        full_after = self.capacity / self.rate if self.rate > 0 else float("inf")
+        self._buckets = {k: v for k, v in self._buckets.items() if now - v[1] < full_after}
+
+    def reset(self):
+        with self._lock:
+            self._buckets.clear()
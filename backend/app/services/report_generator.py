@@ -1,21 +1,86 @@
-"""Report generation service for PDF and Excel exports."""
+"""Report generation service for PDF and Excel exports.
+
+Exports are written straight to a file (or file-like object) and Excel output
+uses openpyxl's write-only mode, so rows are flushed as they are produced and
+large portfolio exports never hold a full workbook in memory.
+"""
+import contextlib
 import io
-from typing import Dict
+import os
+from functools import lru_cache
+from typing import BinaryIO, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+from xml.sax.saxutils import escape
 from reportlab.lib.pagesizes import A4
 from reportlab.lib import colors
-from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
+from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer, PageBreak
 from reportlab.lib.styles import getSampleStyleSheet
 from openpyxl import Workbook
-from openpyxl.styles import Font, Alignment, PatternFill
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Font, PatternFill
+
+CHUNK_SIZE = 64 * 1024
+Output = Union[str, BinaryIO]
+
+MONTE_CARLO_COLUMNS = [
+    ("Mean", "mean"), ("Median", "median"), ("Std Dev", "std"), ("P5", "percentile_5"), ("P25", "percentile_25"),
+    ("P75", "percentile_75"), ("P95", "percentile_95"), ("VaR 95%", "var_95"),
+    ("Expected Shortfall", "expected_shortfall"),
+]
+
+# Styles are immutable once built, so one set is shared by every PDF a process renders.
+GDP_TABLE_STYLE = TableStyle([
+    ("BACKGROUND", (0, 0), (-1, 0), colors.HexColor("#009739")),
+    ("TEXTCOLOR", (0, 0), (-1, 0), colors.white),
+    ("GRID", (0, 0), (-1, -1), 1, colors.grey),
+])
+JOB_TABLE_STYLE = TableStyle([("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold")], parent=GDP_TABLE_STYLE)
+
+
+@lru_cache(maxsize=1)
+def _pdf_styles():
+    return getSampleStyleSheet()
+
+
+def iter_file(path: str, chunk_size: int = CHUNK_SIZE) -> Iterator[bytes]:
+    """Yield a file in chunks. Removal is the caller's job (see ``remove_file``)."""
+    with open(path, "rb") as f:
+        while chunk := f.read(chunk_size):
+            yield chunk
+
+
+def remove_file(path: str):
+    """Delete a streamed export; run as the response's background task, which also runs on disconnect."""
+    with contextlib.suppress(FileNotFoundError):
+        os.unlink(path)
 
 
 class ReportGenerator:
+    HEADER_FILL = PatternFill(start_color="009739", end_color="009739", fill_type="solid")
+    HEADER_FONT = Font(color="FFFFFF", bold=True)
+
     def generate_impact_pdf(self, impact_data: Dict) -> bytes:
         buffer = io.BytesIO()
-        doc = SimpleDocTemplate(buffer, pagesize=A4)
-        styles = getSampleStyleSheet()
+        self.write_impact_pdf(impact_data, buffer)
+        return buffer.getvalue()
+
+    def write_impact_pdf(self, impact_data: Dict, out: Output, subtitle: Optional[str] = None):
+        SimpleDocTemplate(out, pagesize=A4).build(self.impact_pdf_elements(impact_data, subtitle))
+
+    def write_merged_pdf(self, reports: Iterable[Tuple[str, Dict]], out: Output):
+        """One PDF with a section per ``(subtitle, report)`` pair, each starting on a new page."""
+        elements = []
+        for subtitle, report in reports:
+            if elements:
+                elements.append(PageBreak())
+            elements.extend(self.impact_pdf_elements(report, subtitle))
+        SimpleDocTemplate(out, pagesize=A4).build(elements)
+
+    def impact_pdf_elements(self, impact_data: Dict, subtitle: Optional[str] = None) -> List:
+        styles = _pdf_styles()
         elements = []
         elements.append(Paragraph("InvestIQ Africa - Investment Impact Report", styles["Title"]))
+        if subtitle:
+            elements.append(Paragraph(escape(subtitle), styles["Heading3"]))
         elements.append(Spacer(1, 20))
         elements.append(Paragraph("ZIDA Investment Intelligence Platform", styles["Normal"]))
         elements.append(Spacer(1, 30))
@@ -28,14 +93,7 @@ class ReportGenerator:
                     ["Indirect Jobs", str(jc.get("indirect_jobs", 0))],
                     ["Induced Jobs", str(jc.get("induced_jobs", 0))],
                     ["Total Jobs", str(jc.get("total_jobs", 0))]]
-            table = Table(data, colWidths=[200, 200])
-            table.setStyle(TableStyle([
-                ("BACKGROUND", (0, 0), (-1, 0), colors.HexColor("#009739")),
-                ("TEXTCOLOR", (0, 0), (-1, 0), colors.white),
-                ("GRID", (0, 0), (-1, -1), 1, colors.grey),
-                ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
-            ]))
-            elements.append(table)
+            elements.append(Table(data, colWidths=[200, 200], style=JOB_TABLE_STYLE))
             elements.append(Spacer(1, 20))
 
         if "gdp_contribution" in impact_data:
@@ -45,37 +103,45 @@ class ReportGenerator:
                     ["Direct GDP", f"${gdp.get('direct_gdp', 0):,.0f}"],
                     ["Multiplier Effect", f"${gdp.get('multiplier_effect', 0):,.0f}"],
                     ["Total GDP Impact", f"${gdp.get('total_gdp', 0):,.0f}"]]
-            table = Table(data, colWidths=[200, 200])
-            table.setStyle(TableStyle([
-                ("BACKGROUND", (0, 0), (-1, 0), colors.HexColor("#009739")),
-                ("TEXTCOLOR", (0, 0), (-1, 0), colors.white),
-                ("GRID", (0, 0), (-1, -1), 1, colors.grey),
-            ]))
-            elements.append(table)
+            elements.append(Table(data, colWidths=[200, 200], style=GDP_TABLE_STYLE))
 
         elements.append(Spacer(1, 30))
         elements.append(Paragraph("Generated by InvestIQ Africa | 7Square Inc.", styles["Normal"]))
-        doc.build(elements)
-        return buffer.getvalue()
+        return elements
 
     def generate_impact_excel(self, impact_data: Dict) -> bytes:
-        wb = Workbook()
-        ws = wb.active
-        ws.title = "Impact Report"
-        header_fill = PatternFill(start_color="009739", end_color="009739", fill_type="solid")
-        header_font = Font(color="FFFFFF", bold=True)
-        ws.append(["InvestIQ Africa - Investment Impact Report"])
-        ws.merge_cells("A1:D1")
-        ws["A1"].font = Font(size=16, bold=True)
+        buffer = io.BytesIO()
+        self.write_impact_excel(impact_data, buffer)
+        return buffer.getvalue()
+
+    def _header(self, ws, values):
+        cells = []
+        for value in values:
+            cell = WriteOnlyCell(ws, value=value)
+            cell.fill = self.HEADER_FILL
+            cell.font = self.HEADER_FONT
+            cells.append(cell)
+        ws.append(cells)
+
+    def _sheet(self, wb: Workbook, title: str, widths: Iterable[int]):
+        ws = wb.create_sheet(title)
+        # Column widths must be set before the first row in write-only mode.
+        for i, width in enumerate(widths):
+            ws.column_dimensions[chr(ord("A") + i)].width = width
+        return ws
+
+    def write_impact_excel(self, impact_data: Dict, out: Output):
+        wb = Workbook(write_only=True)
+        ws = self._sheet(wb, "Impact Report", [25, 20, 20, 20, 20])
+        title = WriteOnlyCell(ws, value="InvestIQ Africa - Investment Impact Report")
+        title.font = Font(size=16, bold=True)
+        ws.append([title])
         ws.append([])
 
         if "job_creation" in impact_data:
             jc = impact_data["job_creation"]
             ws.append(["Job Creation Impact"])
-            ws.append(["Metric", "Value"])
-            for cell in ws[ws.max_row]:
-                cell.fill = header_fill
-                cell.font = header_font
+            self._header(ws, ["Metric", "Value"])
             ws.append(["Direct Jobs", jc.get("direct_jobs", 0)])
             ws.append(["Indirect Jobs", jc.get("indirect_jobs", 0)])
             ws.append(["Induced Jobs", jc.get("induced_jobs", 0)])
@@ -85,18 +151,49 @@ class ReportGenerator:
         if "roi_timeline" in impact_data:
             roi = impact_data["roi_timeline"]
             ws.append(["ROI Timeline"])
-            ws.append(["Year", "Revenue", "Operating Cost", "Cash Flow", "Cumulative"])
-            for cell in ws[ws.max_row]:
-                cell.fill = header_fill
-                cell.font = header_font
+            self._header(ws, ["Year", "Revenue", "Operating Cost", "Cash Flow", "Cumulative"])
             for i, y in enumerate(roi.get("years", [])):
                 ws.append([y, roi["revenue"][i], roi["opex"][i], roi["cash_flow"][i], roi["cumulative_cash_flow"][i]])
 
-        ws.column_dimensions["A"].width = 25
-        ws.column_dimensions["B"].width = 20
-        ws.column_dimensions["C"].width = 20
-        ws.column_dimensions["D"].width = 20
-        ws.column_dimensions["E"].width = 20
-        buffer = io.BytesIO()
-        wb.save(buffer)
-        return buffer.getvalue()
+        if "monte_carlo" in impact_data:
+            mc_ws = self._sheet(wb, "Monte Carlo", [25, 20])
+            self._header(mc_ws, ["Statistic", "Value (USD)"])
+            for label, key in MONTE_CARLO_COLUMNS:
+                mc_ws.append([label, impact_data["monte_carlo"].get(key)])
+
+        if "gdp_contribution" in impact_data:
+            yby_ws = self._sheet(wb, "Year by Year", [10, 20, 20])
+            self._header(yby_ws, ["Year", "GDP", "Cumulative GDP"])
+            for row in impact_data["gdp_contribution"].get("year_by_year", []):
+                yby_ws.append([row["year"], row["gdp"], row["cumulative"]])
+        wb.save(out)
+
+    def write_portfolio_excel(self, entries: Iterable[Dict], out: Output):
+        """Write a multi-investment workbook from ``{"investment": ..., "report": ...}`` entries.
+
+        ``entries`` may be a generator; each report is consumed once and
+        appended to every sheet before the next one is produced.
+        """
+        wb = Workbook(write_only=True)
+        summary = self._sheet(wb, "Portfolio", [40, 30, 12, 22, 18, 12, 18, 10, 18, 12, 18])
+        self._header(summary, ["Project", "Investor", "Sector", "Province", "Investment (USD)", "Total Jobs",
+                               "Total GDP (USD)", "IRR %", "NPV @10% (USD)", "Breakeven Year", "MC Mean (USD)"])
+        mc_ws = self._sheet(wb, "Monte Carlo", [40] + [18] * len(MONTE_CARLO_COLUMNS))
+        self._header(mc_ws, ["Project"] + [label for label, _ in MONTE_CARLO_COLUMNS])
+        yby_ws = self._sheet(wb, "Year by Year", [40, 8, 18, 18, 18, 18, 18])
+        self._header(yby_ws, ["Project", "Year", "GDP", "Cumulative GDP", "Revenue", "Cash Flow",
+                              "Cumulative Cash Flow"])
+
+        for entry in entries:
+            inv, report = entry["investment"], entry["report"]
+            name = inv["project_name"]
+            jobs, gdp, roi, mc = (report["job_creation"], report["gdp_contribution"], report["roi_timeline"],
+                                  report["monte_carlo"])
+            summary.append([name, inv.get("investor_name"), inv["sector"], inv.get("province"),
+                            inv["investment_amount_usd"], jobs["total_jobs"], gdp["total_gdp"], roi["irr"],
+                            roi["npv"].get("10%"), roi["breakeven_year"], mc["mean"]])
+            mc_ws.append([name] + [mc.get(key) for _, key in MONTE_CARLO_COLUMNS])
+            roi_by_year = dict(zip(roi["years"], zip(roi["revenue"], roi["cash_flow"], roi["cumulative_cash_flow"])))
+            for row in gdp["year_by_year"]:
+                yby_ws.append([name, row["year"], row["gdp"], row["cumulative"], *roi_by_year.get(row["year"], ())])
+        wb.save(out)
@@ -0,0 +1,35 @@
+"""Finished comprehensive reports, addressable by id for later exports.
+
+Reports live in the result cache. Seeded reports are content-addressed, so an
+identical request reuses the stored report; unseeded ones get a random id
+because their Monte Carlo section is not reproducible, and are only worth
+storing when that id is returned to the caller.
+
+The in-process cache is per worker: with several workers, set
+``RESULT_CACHE_PATH`` so its shared SQLite level makes a report id resolvable
+on any of them; otherwise a lookup can 404 on a worker that did not build it.
+"""
+import uuid
+from typing import Dict, Optional
+
+from app.services.result_cache import cache_key, result_cache
+
+REPORT_NAMESPACE = "comprehensive_report"
+
+
+def report_key(params: Dict) -> Optional[str]:
+    if params.get("seed") is None:
+        return None
+    return cache_key(REPORT_NAMESPACE, params)
+
+
+def get_report(report_id: str) -> Optional[Dict]:
+    hit, report = result_cache.get(report_id)
+    return report if hit else None
+
+
+def save_report(params: Dict, report: Dict) -> str:
+    report_id = report_key(params) or uuid.uuid4().hex
+    tags = [f"sez:{params['sez_id']}"] if params.get("sez_id") else []
+    result_cache.set(report_id, report, tags)
+    return report_id
@@ -0,0 +1,194 @@
+"""Content-addressed memoization for pure impact calculations.
+
+Entries are keyed on a SHA-256 of the namespace and canonicalised parameters,
+evicted by LRU and TTL, and optionally mirrored to a SQLite file so several
+worker processes share results. Entries can carry tags (e.g. ``sez:<id>``)
+for targeted invalidation when the underlying reference data changes.
+"""
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+
+from sqlalchemy import event
+
+from app.config import settings
+from app.models.investment import SpecialEconomicZone
+from app.monitoring import REGISTRY
+
+REGISTRY.describe("investiq_result_cache_requests_total", "counter", "Result cache lookups by namespace and outcome.")
+REGISTRY.describe("investiq_result_cache_entries", "gauge", "Entries held in the in-process result cache.")
+
+
+def cache_key(namespace: str, params: Dict) -> str:
+    canonical = json.dumps(params, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(f"{namespace}:{canonical}".encode()).hexdigest()
+
+
+class _SQLiteStore:
+    """Shared second-level store; tags are kept comma-delimited for LIKE matching."""
+
+    def __init__(self, path: str, max_entries: int):
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=5)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS result_cache (key TEXT PRIMARY KEY, value TEXT NOT NULL, "
+            "tags TEXT NOT NULL, expires_at REAL NOT NULL, last_access REAL NOT NULL)")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS ix_result_cache_last_access ON result_cache (last_access)")
+        self._conn.commit()
+
+    def get(self, key: str) -> Optional[Tuple[float, str, Tuple[str, ...]]]:
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, tags, expires_at FROM result_cache WHERE key = ? AND expires_at > ?", (key, now)
+            ).fetchone()
+            if row is None:
+                return None
+            self._conn.execute("UPDATE result_cache SET last_access = ? WHERE key = ?", (now, key))
+            self._conn.commit()
+        return row[2], row[0], tuple(t for t in row[1].split(",") if t)
+
+    def set(self, key: str, value: str, tags: Tuple[str, ...], expires_at: float):
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO result_cache (key, value, tags, expires_at, last_access) VALUES (?, ?, ?, ?, ?)",
+                (key, value, "," + ",".join(tags) + ",", expires_at, now))
+            self._conn.execute("DELETE FROM result_cache WHERE expires_at <= ?", (now,))
+            self._conn.execute(
+                "DELETE FROM result_cache WHERE key IN (SELECT key FROM result_cache ORDER BY last_access DESC "
+                "LIMIT -1 OFFSET ?)", (self.max_entries,))
+            self._conn.commit()
+
+    def invalidate_tag(self, tag: str):
+        with self._lock:
+            self._conn.execute("DELETE FROM result_cache WHERE tags LIKE ?", (f"%,{tag},%",))
+            self._conn.commit()
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM result_cache")
+            self._conn.commit()
+
+
+class ResultCache:
+    def __init__(self, max_entries: int = 2048, ttl_seconds: float = 3600, sqlite_path: Optional[str] = None,
+                 enabled: bool = True):
+        self.max_entries = max_entries
+        self.ttl = ttl_seconds
+        self.enabled = enabled
+        self._entries: "OrderedDict[str, Tuple[float, str, Tuple[str, ...]]]" = OrderedDict()
+        self._tags: Dict[str, set] = {}
+        self._lock = threading.Lock()
+        self._store = _SQLiteStore(sqlite_path, max_entries) if sqlite_path else None
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key: str) -> Tuple[bool, Any]:
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry[0] > now:
+                    self._entries.move_to_end(key)
+                    return True, json.loads(entry[1])
+                self._drop(key)
+        if self._store is not None:
+            entry = self._store.get(key)
+            if entry is not None:
+                with self._lock:
+                    self._put(key, entry)
+                return True, json.loads(entry[1])
+        return False, None
+
+    def set(self, key: str, value: Any, tags: Iterable[str] = ()) -> str:
+        tags = tuple(tags)
+        entry = (time.time() + self.ttl, json.dumps(value, default=_json_default), tags)
+        with self._lock:
+            self._put(key, entry)
+        if self._store is not None:
+            self._store.set(key, entry[1], tags, entry[0])
+        return entry[1]
+
+    def get_or_compute(self, namespace: str, params: Dict, compute: Callable[[], Any],
+                       tags: Iterable[str] = (), cacheable: bool = True) -> Any:
+        """Return the cached result for ``params`` or compute, store and return it.
+
+        Hits are decoded from stored JSON, so callers always receive a fresh copy
+        they are free to mutate.
+        """
+        if not (self.enabled and cacheable):
+            return compute()
+        key = cache_key(namespace, params)
+        hit, value = self.get(key)
+        REGISTRY.inc("investiq_result_cache_requests_total", namespace=namespace, outcome="hit" if hit else "miss")
+        if hit:
+            return value
+        # Round-trip misses too so hits and misses return identical types.
+        return json.loads(self.set(key, compute(), tags))
+
+    def invalidate_tag(self, tag: str):
+        with self._lock:
+            for key in list(self._tags.get(tag, ())):
+                self._drop(key)
+            self._tags.pop(tag, None)
+        if self._store is not None:
+            self._store.invalidate_tag(tag)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._tags.clear()
+        if self._store is not None:
+            self._store.clear()
+
+    def _put(self, key: str, entry: Tuple[float, str, Tuple[str, ...]]):
+        if key in self._entries:
+            self._drop(key)
+        self._entries[key] = entry
+        for tag in entry[2]:
+            self._tags.setdefault(tag, set()).add(key)
+        while len(self._entries) > self.max_entries:
+            self._drop(next(iter(self._entries)))
+
+    def _drop(self, key: str):
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        for tag in entry[2]:
+            keys = self._tags.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tags[tag]
+
+    def collect(self, registry):
+        registry.set("investiq_result_cache_entries", len(self._entries))
+
+
+def _json_default(value):
+    # NumPy scalars and arrays produced by the ML layer.
+    if hasattr(value, "tolist"):
+        return value.tolist()
+    return str(value)
+
+
+result_cache = ResultCache(
+    max_entries=settings.RESULT_CACHE_MAX_ENTRIES, ttl_seconds=settings.RESULT_CACHE_TTL_SECONDS,
+    sqlite_path=settings.RESULT_CACHE_PATH, enabled=settings.RESULT_CACHE_ENABLED,
+)
+REGISTRY.add_collector(result_cache.collect)
+
+
+@event.listens_for(SpecialEconomicZone, "after_insert")
+@event.listens_for(SpecialEconomicZone, "after_update")
+@event.listens_for(SpecialEconomicZone, "after_delete")
+def _invalidate_sez_results(mapper, connection, target):
+    result_cache.invalidate_tag(f"sez:{target.id}")
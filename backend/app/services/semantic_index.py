@@ -0,0 +1,71 @@
+"""Process-wide TF-IDF index over investment opportunity text.
+
+The index is synchronised lazily: a cheap count/last-modified signature (and
+a version bumped by mapper events) tells whether anything changed, and only
+opportunities whose modification time differs from the indexed one are
+re-read and re-indexed.
+"""
+import threading
+from typing import Dict, List, Optional
+
+import numpy as np
+from sqlalchemy import event, func
+from sqlalchemy.orm import Session
+
+from app.database import syncs_from_primary
+from app.ml.text_index import TextIndex
+from app.models.investor import InvestmentOpportunity
+
+SYNC_CHUNK = 500
+
+
+def opportunity_text(title: Optional[str], description: Optional[str], tags: Optional[List[str]]) -> str:
+    return " ".join([title or "", description or "", " ".join(tags or [])])
+
+
+class OpportunitySemanticIndex:
+    def __init__(self):
+        self.index = TextIndex()
+        self._lock = threading.Lock()
+        self._version = 0
+        self._signature = None
+        self._indexed: Dict[str, str] = {}  # opportunity id -> modification time it was indexed at
+
+    def invalidate(self):
+        self._version += 1
+
+    @syncs_from_primary
+    def sync(self, db: Session) -> TextIndex:
+        modified = func.coalesce(InvestmentOpportunity.updated_at, InvestmentOpportunity.created_at)
+        count, latest = db.query(func.count(InvestmentOpportunity.id), func.max(modified)).one()
+        signature = (self._version, count, str(latest))
+        if signature == self._signature:
+            return self.index
+        with self._lock:
+            current = {oid: str(ts) for oid, ts in db.query(InvestmentOpportunity.id, modified)}
+            changed = [oid for oid, ts in current.items() if self._indexed.get(oid) != ts]
+            for start in range(0, len(changed), SYNC_CHUNK):
+                rows = db.query(InvestmentOpportunity.id, InvestmentOpportunity.title, InvestmentOpportunity.description,
+                                InvestmentOpportunity.tags).filter(
+                    InvestmentOpportunity.id.in_(changed[start:start + SYNC_CHUNK])).all()
+                self.index.upsert({oid: opportunity_text(title, desc, tags) for oid, title, desc, tags in rows})
+            self.index.remove(set(self._indexed) - set(current))
+            self._indexed, self._signature = current, signature
+        return self.index
+
+    def scores(self, db: Session, text: str) -> Dict[str, float]:
+        """Similarity of ``text`` to every opportunity, keyed by opportunity id."""
+        return self.sync(db).scores(text)
+
+    def similarity_to(self, db: Session, opportunity_id: str, texts: List[str]) -> np.ndarray:
+        return self.sync(db).similarity_to(opportunity_id, texts)
+
+
+opportunity_index = OpportunitySemanticIndex()
+
+
+@event.listens_for(InvestmentOpportunity, "after_insert")
+@event.listens_for(InvestmentOpportunity, "after_update")
+@event.listens_for(InvestmentOpportunity, "after_delete")
+def _invalidate_opportunities(mapper, connection, target):
+    opportunity_index.invalidate()
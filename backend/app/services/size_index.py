@@ -0,0 +1,33 @@
+"""Investment-size range filters.
+
+Database listings filter with the plain predicate ``min <= :hi AND max >= :lo``
+(missing bounds are open-ended), which the lower-bound indexes serve without
+materialising id lists. The interval tree in ``app.ml.interval_index`` is used
+only for in-memory candidate retrieval over the opportunity catalogue.
+"""
+from typing import Tuple
+
+import numpy as np
+from sqlalchemy import and_, or_
+
+
+def parse_size_range(value: str) -> Tuple[float, float]:
+    """``"min:max"`` with either side optional, e.g. ``"1e6:5e7"`` or ``"2000000:"``."""
+    lo, sep, hi = value.partition(":")
+    if not sep:
+        raise ValueError("size_overlap must be 'min:max' (either bound may be empty)")
+    try:
+        bounds = float(lo) if lo.strip() else 0.0, float(hi) if hi.strip() else np.inf
+    except ValueError:
+        raise ValueError(f"Invalid size_overlap bounds: {value}")
+    if bounds[0] > bounds[1]:
+        raise ValueError("size_overlap minimum exceeds maximum")
+    return bounds
+
+
+def range_overlaps(lo_column, hi_column, lo: float, hi: float):
+    """SQL predicate for rows whose ``[lo_column, hi_column]`` range intersects ``[lo, hi]``."""
+    clauses = [or_(hi_column.is_(None), hi_column >= lo)]
+    if hi != np.inf:
+        clauses.append(or_(lo_column.is_(None), lo_column <= hi))
+    return and_(*clauses)
@@ -0,0 +1,112 @@
+"""Short-lived cache of authenticated users resolved from verified JWT claims.
+
+Users are cached as detached snapshots by token id and by email for
+``AUTH_CACHE_TTL_SECONDS``. Once a session commits an ORM update or delete of
+a user, its entries are dropped and the change time recorded, so tokens
+issued before a role change or account disable are no longer trusted on their
+claims alone. Users are collected at flush but invalidated only after commit:
+a concurrent request cannot re-cache the old row in between, and a rollback
+invalidates nothing.
+"""
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.models.user import User
+from app.monitoring import REGISTRY
+
+REGISTRY.describe("investiq_auth_cache_requests_total", "counter", "Authenticated-user cache lookups by outcome.")
+
+
+@dataclass(frozen=True)
+class CachedUser:
+    id: str
+    email: str
+    full_name: Optional[str]
+    role: str
+    is_active: bool
+    organization: Optional[str]
+
+    @classmethod
+    def from_user(cls, user: User) -> "CachedUser":
+        return cls(id=str(user.id), email=user.email, full_name=user.full_name, role=user.role,
+                   is_active=bool(user.is_active), organization=user.organization)
+
+
+class UserCache:
+    def __init__(self, ttl_seconds: float = 60.0):
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._by_token: Dict[str, Tuple[CachedUser, float]] = {}
+        self._by_email: Dict[str, Tuple[CachedUser, float]] = {}
+        self._changed: Dict[str, float] = {}  # email -> when the user was last modified
+
+    def get(self, token_id: Optional[str], email: str) -> Optional[CachedUser]:
+        now = time.monotonic()
+        with self._lock:
+            for store, key in ((self._by_token, token_id), (self._by_email, email)):
+                entry = store.get(key) if key else None
+                if entry is not None and entry[1] > now:
+                    if token_id and store is self._by_email:
+                        self._by_token[token_id] = entry
+                    REGISTRY.inc("investiq_auth_cache_requests_total", outcome="hit")
+                    return entry[0]
+        REGISTRY.inc("investiq_auth_cache_requests_total", outcome="miss")
+        return None
+
+    def put(self, token_id: Optional[str], user: CachedUser):
+        entry = (user, time.monotonic() + self.ttl_seconds)
+        with self._lock:
+            self._by_email[user.email] = entry
+            if token_id:
+                self._by_token[token_id] = entry
+            if len(self._by_token) > 4 * len(self._by_email) + 1024:
+                now = time.monotonic()
+                self._by_token = {k: v for k, v in self._by_token.items() if v[1] > now}
+
+    def invalidate(self, user_id: str, email: Optional[str] = None):
+        with self._lock:
+            for store in (self._by_token, self._by_email):
+                for key in [k for k, (user, _) in store.items() if user.id == user_id]:
+                    del store[key]
+            if email:
+                self._changed[email] = time.time()
+                horizon = time.time() - settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60
+                self._changed = {k: t for k, t in self._changed.items() if t > horizon}
+
+    def changed_since(self, email: str, issued_at: Optional[float]) -> bool:
+        """Whether the user was modified at or after a token's ``iat`` (or the token has none)."""
+        changed = self._changed.get(email)
+        return issued_at is None or (changed is not None and changed >= issued_at)
+
+    def clear(self):
+        with self._lock:
+            self._by_token.clear()
+            self._by_email.clear()
+            self._changed.clear()
+
+
+user_cache = UserCache(settings.AUTH_CACHE_TTL_SECONDS)
+
+
+@event.listens_for(Session, "after_flush")
+def _note_user_writes(session, flush_context):
+    changed = [(str(obj.id), obj.email) for obj in (*session.dirty, *session.deleted) if isinstance(obj, User)]
+    if changed:
+        session.info.setdefault("changed_users", set()).update(changed)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_users(session):
+    for user_id, email in session.info.pop("changed_users", ()):
+        user_cache.invalidate(user_id, email)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_user_writes(session):
+    session.info.pop("changed_users", None)
@@ -1,11 +1,21 @@
 """Test configuration and fixtures."""
+import os
+
+# Run compute tasks on threads in the API tests; test_executor covers the process pool.
+os.environ.setdefault("COMPUTE_BACKEND", "thread")
+
 import pytest
 from fastapi.testclient import TestClient
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
 
 from app.main import app
-from app.database import Base, get_db
+from app.database import (Base, async_database_url, get_async_db, get_async_read_db, get_db, get_read_db,
+                          get_session_factory)
+from app.services.job_queue import job_queue
+from app.services.user_cache import user_cache
 
 SQLALCHEMY_TEST_DATABASE_URL = "sqlite:///./test.db"
 
@@ -14,6 +24,9 @@ engine = create_engine(
     connect_args={"check_same_thread": False},
 )
 TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# NullPool: each TestClient context runs its own event loop, so async connections must not outlive it.
+async_engine = create_async_engine(async_database_url(SQLALCHEMY_TEST_DATABASE_URL), poolclass=NullPool)
+TestingAsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
 
 
 @pytest.fixture(scope="function")
@@ -35,9 +48,21 @@ def client(db_session):
         finally:
             pass
 
+    async def override_get_async_db():
+        async with TestingAsyncSessionLocal() as session:
+            yield session
+
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_async_db] = override_get_async_db
+    app.dependency_overrides[get_read_db] = override_get_db
+    app.dependency_overrides[get_async_read_db] = override_get_async_db
+    app.dependency_overrides[get_session_factory] = lambda: TestingSessionLocal
+    user_cache.clear()
+    default_factory = job_queue.session_factory
+    job_queue.configure(TestingSessionLocal)
     with TestClient(app) as c:
         yield c
+    job_queue.configure(default_factory)
     app.dependency_overrides.clear()
 
 
@@ -1,6 +1,8 @@
 """Tests for API endpoints."""
 import pytest
 
+from app.services.result_cache import result_cache
+
 
 class TestHealthEndpoint:
     def test_health_check(self, client):
@@ -91,3 +93,58 @@ class TestMatchingEndpoints:
     def test_opportunities_list(self, client):
         response = client.get("/api/v1/matching/opportunities")
         assert response.status_code == 200
+
+
+class TestComputeOffloadEndpoints:
+    def test_monte_carlo(self, client):
+        response = client.post(
+            "/api/v1/impact/monte-carlo",
+            json={"investment_amount": 50000000, "sector": "MIN", "num_simulations": 1000},
+        )
+        assert response.status_code == 200
+        data = response.json()
+        assert data["outcome_count"] == 1000
+        assert data["statistics"]["percentile_5"] <= data["statistics"]["percentile_95"]
+
+    def test_comprehensive_report(self, client):
+        response = client.post(
+            "/api/v1/impact/comprehensive-report",
+            json={"investment_amount": 50000000, "sector": "AGR", "province": "Manicaland"},
+        )
+        assert response.status_code == 200
+        data = response.json()
+        assert {"job_creation", "gdp_contribution", "monte_carlo", "roi_timeline"} <= set(data)
+
+    def test_export_pdf(self, client):
+        response = client.post(
+            "/api/v1/impact/export/pdf",
+            json={"investment_amount": 50000000, "sector": "ICT"},
+        )
+        assert response.status_code == 200
+        assert response.content.startswith(b"%PDF")
+
+    def test_stored_report_exports(self, client):
+        payload = {"investment_amount": 50000000, "sector": "TOU", "seed": 11}
+        first = client.post("/api/v1/impact/comprehensive-report", json=payload).json()
+        second = client.post("/api/v1/impact/comprehensive-report", json=payload).json()
+        assert first["report_id"] == second["report_id"]
+        assert first["monte_carlo"] == second["monte_carlo"]
+
+        report_id = first["report_id"]
+        assert client.get(f"/api/v1/impact/reports/{report_id}").json()["roi_timeline"] == first["roi_timeline"]
+        assert client.get(f"/api/v1/impact/reports/{report_id}/pdf").content.startswith(b"%PDF")
+        assert client.get(f"/api/v1/impact/reports/{report_id}/excel").status_code == 200
+        assert client.get("/api/v1/impact/reports/missing/pdf").status_code == 404
+
+    def test_unseeded_exports_are_not_stored(self, client):
+        before = len(result_cache)
+        client.post("/api/v1/impact/export/excel", json={"investment_amount": 50000000, "sector": "ICT"})
+        assert len(result_cache) == before
+
+    def test_portfolio_optimisation_without_sectors(self, client):
+        response = client.post(
+            "/api/v1/analytics/portfolio-optimisation",
+            json={"total_budget": 1000000, "risk_tolerance": "moderate"},
+        )
+        assert response.status_code == 200
+        assert response.json()["allocations"] == []
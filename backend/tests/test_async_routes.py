@@ -0,0 +1,53 @@
+"""Tests for the async-session dashboard, listing and sector routes."""
+import inspect
+
+import pytest
+
+from app.api.routes import analytics, dashboard
+from app.database import async_database_url
+from app.models.investment import Investment
+from app.models.sector import Sector
+
+
+def _seed(db_session):
+    mining = Sector(name="Mining", code="MIN")
+    db_session.add(mining)
+    db_session.flush()
+    for i, (amount, status) in enumerate([(5e8, "active"), (2e7, "approved"), (1e6, "inquiry"), (3e6, "active")]):
+        db_session.add(Investment(project_name=f"P{i}", investor_name=f"I{i}", sector_id=mining.id if i % 2 == 0
+                                  else None, investment_amount_usd=amount, status=status, province="Midlands"))
+    db_session.commit()
+
+
+class TestAsyncRoutes:
+    def test_database_url_mapping(self):
+        assert async_database_url("sqlite:///./x.db") == "sqlite+aiosqlite:///./x.db"
+        assert async_database_url("postgresql+psycopg2://u@h/db") == "postgresql+asyncpg://u@h/db"
+        with pytest.raises(ValueError):
+            async_database_url("mysql://u@h/db")
+
+    def test_listing_filters_and_pages(self, client, db_session):
+        _seed(db_session)
+        page = client.get("/api/v1/investments/", params={"min_amount": 2e6, "per_page": 2}).json()
+        assert page["total"] == 3
+        assert [i["project_name"] for i in page["items"]] == ["P0", "P1"]
+        mining = client.get("/api/v1/investments/", params={"sector": "min"}).json()
+        assert {i["project_name"] for i in mining["items"]} == {"P0", "P2"}
+
+    def test_aggregations(self, client, db_session):
+        _seed(db_session)
+        stats = client.get("/api/v1/investments/stats/summary").json()
+        assert stats == {"total": 4, "total_amount": 5.24e8, "active": 2, "approved": 1, "inquiry": 1}
+        top = client.get("/api/v1/dashboard/top-investors").json()
+        assert [t["sector"] for t in top[:2]] == ["Mining", "N/A"]
+        assert client.get("/api/v1/investments/by-sector").json()[0]["count"] == 2
+        assert client.get("/api/v1/dashboard/province-distribution").json()[0]["count"] == 4
+
+    def test_service_routes_stay_off_the_event_loop(self, client, db_session):
+        for route in (dashboard.dashboard_overview, dashboard.fdi_trend, analytics.dashboard_summary,
+                      analytics.sector_risk_return):
+            assert not inspect.iscoroutinefunction(route)
+        _seed(db_session)
+        summary = client.get("/api/v1/dashboard/summary")
+        assert summary.status_code == 200
+        assert client.get("/api/v1/analytics/sector-risk-return").json()[0]["sector_code"] == "MIN"
@@ -0,0 +1,94 @@
+"""Tests for the verified-claims user cache."""
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+
+from sqlalchemy import update
+
+from app.api.dependencies import require_role
+from app.api.routes.auth import create_access_token
+from app.config import settings
+from app.database import get_session_factory
+from app.models.user import User
+from app.monitoring import REGISTRY
+from app.services.user_cache import user_cache
+from tests.conftest import TestingSessionLocal
+
+admin_app = FastAPI()
+admin_app.dependency_overrides[get_session_factory] = lambda: TestingSessionLocal
+
+
+@admin_app.get("/admin-only")
+def _admin_only(claims=Depends(require_role("admin"))):
+    return {"sub": claims["sub"]}
+
+
+def _user(db_session, role="analyst"):
+    user = User(email="ana@zida.co.zw", hashed_password="x", full_name="Ana", role=role)
+    db_session.add(user)
+    db_session.commit()
+    token = create_access_token({"sub": user.email, "role": user.role, "uid": user.id})
+    return user, {"Authorization": f"Bearer {token}"}
+
+
+def _lookups(outcome):
+    return REGISTRY.get("investiq_auth_cache_requests_total", outcome=outcome)
+
+
+class TestAuthCache:
+    def test_profile_is_served_from_cache(self, client, db_session):
+        user, headers = _user(db_session)
+        hits = _lookups("hit")
+        assert client.get("/api/v1/auth/me", headers=headers).json()["role"] == "analyst"
+        assert client.get("/api/v1/auth/me", headers=headers).json()["email"] == user.email
+        assert _lookups("hit") == hits + 1
+
+    def test_update_and_disable_invalidate(self, client, db_session):
+        user, headers = _user(db_session)
+        client.get("/api/v1/auth/me", headers=headers)
+        user.role = "admin"
+        db_session.commit()
+        assert client.get("/api/v1/auth/me", headers=headers).json()["role"] == "admin"
+        user.is_active = False
+        db_session.commit()
+        assert client.get("/api/v1/auth/me", headers=headers).status_code == 401
+
+    def test_anonymous_and_invalid_tokens(self, client):
+        assert client.get("/api/v1/auth/me").status_code == 401
+        assert client.get("/api/v1/auth/me", headers={"Authorization": "Bearer nope"}).status_code == 401
+
+    def test_role_from_claims_until_user_changes(self, client, db_session):
+        user, headers = _user(db_session, role="admin")
+        admin = TestClient(admin_app)
+        misses = _lookups("miss")
+        assert admin.get("/admin-only", headers=headers).status_code == 200
+        assert _lookups("miss") == misses
+        user.role = "public"
+        db_session.commit()
+        assert admin.get("/admin-only", headers=headers).status_code == 403
+        assert admin.get("/admin-only").status_code == 401
+
+    def test_invalidated_on_commit_not_flush(self, client, db_session):
+        user, headers = _user(db_session, role="admin")
+        client.get("/api/v1/auth/me", headers=headers)
+        user.role = "public"
+        db_session.flush()
+        assert user_cache.get(None, user.email).role == "admin"
+        db_session.rollback()
+        assert user_cache.get(None, user.email).role == "admin"
+        user.role = "public"
+        db_session.commit()
+        assert user_cache.get(None, user.email) is None
+
+    def test_claims_expire_after_cache_ttl(self, client, db_session, monkeypatch):
+        user, headers = _user(db_session, role="admin")
+        admin = TestClient(admin_app)
+        # A change made elsewhere (another worker, direct SQL) fires no event in this process.
+        db_session.execute(update(User).where(User.id == user.id).values(role="public"))
+        db_session.commit()
+        assert admin.get("/admin-only", headers=headers).status_code == 200
+        monkeypatch.setattr(settings, "AUTH_CACHE_TTL_SECONDS", 0)
+        assert admin.get("/admin-only", headers=headers).status_code == 403
+        db_session.execute(update(User).where(User.id == user.id).values(role="admin", is_active=False))
+        db_session.commit()
+        user_cache.clear()  # the cached record expires
+        assert admin.get("/admin-only", headers=headers).status_code == 401
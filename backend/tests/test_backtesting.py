@@ -0,0 +1,74 @@
+"""Tests for rolling-origin backtesting."""
+from datetime import date
+
+import numpy as np
+import pytest
+
+from app.ml.backtesting import _engine_folds, _linear_folds, rolling_origin_backtest
+from app.models.indicator import MacroeconomicIndicator
+from app.services.backtesting import BacktestService
+from app.services.predictive_analytics import PredictiveAnalyticsService
+from tests.test_jobs import wait_for
+
+
+SERIES = np.random.default_rng(0).normal(size=24).cumsum() + 50
+
+
+class TestRollingOrigin:
+    def test_vectorized_linear_folds_match_refits(self):
+        origins = np.arange(3, 20)
+        fast = _linear_folds(SERIES, origins, 3)
+        slow = _engine_folds(SERIES, origins, 3, "linear")
+        assert np.allclose(fast[0], slow[0]) and np.allclose(fast[1], slow[1])
+
+    def test_perfect_trend_scores_zero_error(self):
+        result = rolling_origin_backtest(np.arange(10.0) * 2 + 5, "linear", horizon=2)
+        assert result["folds"] == 6
+        assert result["mape"] == pytest.approx(0, abs=1e-6) and result["mase"] == pytest.approx(0, abs=1e-6)
+        assert result["coverage"] == 1.0
+
+    def test_short_series_has_no_folds(self):
+        assert rolling_origin_backtest(np.array([1.0, 2.0]), "ets")["folds"] == 0
+
+
+class TestBacktestService:
+    def _seed(self, db_session, name, values):
+        for i, value in enumerate(values):
+            db_session.add(MacroeconomicIndicator(indicator_name=name, value=float(value), period=date(2000 + i, 12, 31)))
+        db_session.commit()
+
+    def test_run_stores_metrics_and_skips_unchanged(self, db_session):
+        self._seed(db_session, "gdp_growth", SERIES[:12])
+        self._seed(db_session, "fdi_inflow", SERIES[12:])
+        service = BacktestService(db_session)
+
+        summary = service.run(models=["linear", "holt_winters"])
+        assert summary["evaluated"] == 2
+        results = service.results()
+        assert {(r["series"], r["model"]) for r in results} == {
+            (s, m) for s in ("gdp_growth", "fdi_inflow") for m in ("linear", "holt_winters")}
+        assert all(r["mase"] is not None for r in results)
+
+        assert service.run(models=["linear", "holt_winters"])["skipped"] == 2
+        self._seed(db_session, "gdp_growth", [99.0])
+        assert service.run(models=["linear", "holt_winters"])["evaluated"] == 1
+
+    def test_forecast_accuracy_from_backtest(self, db_session):
+        self._seed(db_session, "fdi_inflow", SERIES)
+        service = PredictiveAnalyticsService(db_session)
+        assert service.forecast_fdi_trends(indicator="fdi_inflow", model="linear")["accuracy_source"] == "holdout"
+        BacktestService(db_session).run(models=["linear"])
+        result = service.forecast_fdi_trends(indicator="fdi_inflow", model="linear")
+        assert result["accuracy_source"] == "backtest"
+        assert result["model_accuracy"] == round(max(100 - result["backtest"]["mape"], 0), 1)
+
+    def test_endpoints(self, client, db_session):
+        self._seed(db_session, "fdi_inflow", SERIES[:10])
+        response = client.post("/api/v1/analytics/backtests/run", params={"model": ["linear"], "horizon": 2})
+        assert response.status_code == 202 and response.json()["kind"] == "backtests"
+        job_id = response.json()["job_id"]
+        assert wait_for(client, job_id)["status"] == "succeeded"
+        assert client.get(f"/api/v1/jobs/{job_id}/result").json()["evaluated"] == 1
+        (row,) = client.get("/api/v1/analytics/backtests", params={"indicator": "fdi_inflow"}).json()
+        assert row["model"] == "linear" and row["horizon"] == 2
+        assert client.post("/api/v1/analytics/backtests/run", params={"model": ["prophet"]}).status_code == 400
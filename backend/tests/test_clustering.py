@@ -0,0 +1,125 @@
+"""Tests for investment clustering and persisted pattern assignments."""
+import json
+
+import pandas as pd
+import pytest
+
+from app.ml.investment_clusterer import InvestmentClusterer
+from app.models.cluster import ClusterModel, InvestmentCluster
+from app.models.investment import Investment
+from app.models.job import Job
+from app.models.sector import Sector
+from app.services import clustering
+from app.services.clustering import InvestmentClusteringService
+from tests.test_jobs import wait_for
+
+
+def _rows(n=6):
+    return pd.DataFrame({
+        "amount": [5e8] * n + [2e5] * n,
+        "sector": ["MIN"] * n + ["AGR"] * n,
+        "province": ["Midlands"] * n + ["Manicaland"] * n,
+        "country": ["China"] * n + ["Zambia"] * n,
+        "in_sez": [1.0] * n + [0.0] * n,
+        "export_oriented": [1.0] * n + [0.0] * n,
+        "technology_transfer": [0.0] * 2 * n,
+    })
+
+
+class TestInvestmentClusterer:
+    def test_separates_distinct_groups(self):
+        rows = _rows()
+        labels, distances = InvestmentClusterer(n_clusters=2).fit(rows).predict(rows)
+        assert len(set(labels[:6])) == 1 and len(set(labels[6:])) == 1 and labels[0] != labels[6]
+        assert distances.max() < 1e-6
+
+    def test_unknown_categories_encode_as_zero(self):
+        clusterer = InvestmentClusterer(n_clusters=2).fit(_rows())
+        new = _rows(1).assign(sector="ENE", country="Peru")
+        assert clusterer.unseen(new) == 2
+        assert clusterer.encode(new)[:, 1:3].sum() == 0
+
+
+    def test_params_round_trip_through_json(self):
+        rows = _rows()
+        clusterer = InvestmentClusterer(n_clusters=2).fit(rows)
+        restored = InvestmentClusterer.from_params(json.loads(json.dumps(clusterer.to_params())))
+        assert (restored.predict(rows)[0] == clusterer.predict(rows)[0]).all()
+        new = _rows(1).iloc[[0]].assign(amount=4e8)
+        label = clusterer.predict(new)[0][0]
+        moved = restored.partial_fit(new)
+        assert moved.counts[label] == clusterer.counts[label] + 1
+        assert 0 < moved.predict(new)[1][0] < clusterer.predict(new)[1][0]
+
+
+class TestClusteringService:
+    def _seed(self, db_session, n=8):
+        mining = Sector(name="Mining", code="MIN")
+        farming = Sector(name="Agriculture", code="AGR")
+        db_session.add_all([mining, farming])
+        db_session.flush()
+        for i in range(n):
+            big = i % 2 == 0
+            db_session.add(Investment(project_name=f"P{i}", sector_id=(mining if big else farming).id,
+                                      investment_amount_usd=5e8 if big else 2e5,
+                                      province="Midlands" if big else "Manicaland",
+                                      investor_country="China" if big else "Zambia", export_oriented=big))
+        db_session.commit()
+        return mining
+
+    def test_incremental_refresh(self, db_session):
+        mining = self._seed(db_session)
+        service = InvestmentClusteringService(db_session)
+        first = service.refresh()
+        assert first["refit"] and first["assigned"] == 8
+        assert service.refresh()["assigned"] == 0
+
+        db_session.add(Investment(project_name="P9", sector_id=mining.id, investment_amount_usd=4e8,
+                                  province="Midlands", investor_country="China"))
+        db_session.commit()
+        clustering._models.clear()  # as in another worker process: the model is loaded by version
+        second = service.refresh()
+        assert not second["refit"] and second["assigned"] == 1
+        assert second["model_version"] == first["model_version"]
+        assert db_session.query(InvestmentCluster).count() == 9
+        assert db_session.query(ClusterModel.revision).one() == (1,)
+
+        investment = db_session.query(Investment).filter(Investment.project_name == "P9").one()
+        db_session.delete(investment)
+        db_session.commit()
+        service.refresh()
+        assert db_session.query(InvestmentCluster).count() == 8
+
+    def test_refresh_gives_up_after_repeated_conflicts(self, db_session, monkeypatch):
+        service = InvestmentClusteringService(db_session)
+        calls = []
+        monkeypatch.setattr(clustering, "REFRESH_BACKOFF_SECONDS", 0)
+        monkeypatch.setattr(service, "_refresh", lambda refit: calls.append(refit))
+        with pytest.raises(RuntimeError):
+            service.refresh()
+        assert len(calls) == clustering.REFRESH_ATTEMPTS
+
+    def test_patterns_endpoint(self, client, db_session):
+        mining = self._seed(db_session)
+        # Without a stored model (e.g. after upgrading) patterns are fitted in memory and a refresh is queued.
+        patterns = client.get("/api/v1/analytics/investment-patterns").json()
+        assert sum(p["investment_count"] for p in patterns) == 8
+        (job_id,) = db_session.query(Job.id).filter(Job.kind == "investment_clusters").one()
+        assert wait_for(client, job_id)["status"] == "succeeded"
+        assert db_session.query(ClusterModel).count() == 1
+        patterns = client.get("/api/v1/analytics/investment-patterns").json()
+        assert db_session.query(Job).count() == 1
+        assert sum(p["investment_count"] for p in patterns) == 8
+        mining_pattern = next(p for p in patterns if p["top_sectors"] == ["Mining"])
+        assert mining_pattern["top_provinces"] == ["Midlands"] and mining_pattern["export_share"] == 1.0
+
+        # New investments are labelled in memory without writing from the GET.
+        db_session.add(Investment(project_name="P9", sector_id=mining.id, investment_amount_usd=4e8,
+                                  province="Midlands", investor_country="China"))
+        db_session.commit()
+        patterns = client.get("/api/v1/analytics/investment-patterns").json()
+        assert sum(p["investment_count"] for p in patterns) == 9
+        assert db_session.query(InvestmentCluster).count() == 8
+        job = client.post("/api/v1/analytics/investment-patterns/refresh", params={"refit": True}).json()
+        assert wait_for(client, job["job_id"])["status"] == "succeeded"
+        assert db_session.query(InvestmentCluster).count() == 9
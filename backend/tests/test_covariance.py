@@ -0,0 +1,76 @@
+"""Tests for the empirical correlation/covariance engine."""
+from datetime import date
+
+import numpy as np
+import pytest
+
+from app.ml.covariance import correlation_estimate, shrunk_correlation
+from app.ml.risk_scorer import RiskScorer
+from app.models.investment import Investment
+from app.models.sector import Sector
+from app.services.predictive_analytics import PredictiveAnalyticsService
+
+
+class TestShrunkCorrelation:
+    def test_close_to_sample_with_long_history(self):
+        rng = np.random.default_rng(0)
+        returns = rng.multivariate_normal([0, 0, 0], [[1, .8, 0], [.8, 1, 0], [0, 0, 1]], size=5000)
+        corr, shrinkage = shrunk_correlation(returns)
+        assert shrinkage < 0.05
+        assert np.allclose(corr, np.corrcoef(returns, rowvar=False), atol=0.05)
+
+    def test_short_history_is_shrunk_and_positive_definite(self):
+        returns = np.random.default_rng(1).normal(size=(4, 10))
+        corr, shrinkage = shrunk_correlation(returns)
+        assert shrinkage > 0
+        assert np.allclose(np.diag(corr), 1) and np.linalg.eigvalsh(corr).min() > 0
+
+    def test_constant_column_is_uncorrelated(self):
+        returns = np.column_stack([np.arange(6.0), np.arange(6.0) ** 2, np.zeros(6)])
+        corr, _ = shrunk_correlation(returns)
+        assert corr[2].tolist() == [0, 0, 1]
+
+    def test_prior_without_history(self):
+        estimate = correlation_estimate(None, 3)
+        assert estimate["method"] == "prior" and estimate["matrix"][0, 1] == 0.3
+
+    def test_matrix_matches_pairwise(self):
+        data = {k: np.random.default_rng(i).normal(size=8).tolist() for i, k in enumerate("abc")}
+        matrix = np.array(RiskScorer().compute_correlation_matrix(data)["matrix"])
+        assert matrix[0, 2] == pytest.approx(np.corrcoef(data["a"], data["c"])[0, 1])
+
+
+class TestCorrelationEndpoints:
+    def _seed(self, db_session):
+        rng = np.random.default_rng(2)
+        for code, risk in (("MIN", 65.0), ("AGR", 40.0), ("MFG", 50.0)):
+            sector = Sector(name=code, code=code, avg_return_rate=0.1 + risk / 1000, risk_score=risk)
+            db_session.add(sector)
+            db_session.flush()
+            for quarter in range(8):
+                db_session.add(Investment(project_name=f"{code}-{quarter}", sector_id=sector.id,
+                                          investment_amount_usd=float(rng.uniform(1e6, 5e6)),
+                                          date_received=date(2022 + quarter // 4, quarter % 4 * 3 + 1, 15)))
+        db_session.commit()
+
+    def test_correlations_feed_optimizer_and_frontier(self, client, db_session):
+        self._seed(db_session)
+        body = client.get("/api/v1/analytics/sector-correlations").json()
+        assert body["sectors"] == ["AGR", "MFG", "MIN"] and body["method"] == "ledoit_wolf"
+        assert body["observations"] == 7
+
+        frontier = client.get("/api/v1/analytics/efficient-frontier", params={"points": 5}).json()
+        assert len(frontier["sectors"]) == 3 and frontier["points"]
+        risks = [p["risk"] for p in frontier["points"]]
+        assert all(r > 0 for r in risks)
+
+        response = client.post("/api/v1/analytics/portfolio-optimisation",
+                               json={"total_budget": 1000000, "risk_tolerance": "moderate"})
+        assert sum(a["percentage"] for a in response.json()["allocations"]) == pytest.approx(100, abs=0.1)
+
+    def test_cached_correlation_skips_the_load(self, db_session, monkeypatch):
+        self._seed(db_session)
+        service = PredictiveAnalyticsService(db_session)
+        first = service.sector_correlation(["AGR", "MIN"])
+        monkeypatch.setattr(service, "_investment_rows", lambda *args: pytest.fail("investments reloaded"))
+        assert service.sector_correlation(["AGR", "MIN"])["matrix"].tolist() == first["matrix"].tolist()
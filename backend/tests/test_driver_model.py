@@ -0,0 +1,63 @@
+"""Tests for the macro driver regression."""
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.ml.driver_model import DriverModel
+from app.models.indicator import MacroeconomicIndicator
+
+
+def _wide(n=12):
+    rng = np.random.default_rng(1)
+    periods = pd.date_range("2010-12-31", periods=n, freq="YE")
+    gdp, inflation = rng.normal(4, 2, n), rng.normal(50, 20, n)
+    fdi = 100 + 20 * np.r_[np.nan, gdp[:-1]] - 0.5 * np.r_[np.nan, inflation[:-1]]
+    return pd.DataFrame({"gdp_growth": gdp, "inflation_rate": inflation, "fdi_inflow": fdi}, index=periods)
+
+
+class TestDriverModel:
+    def test_recovers_lagged_coefficients(self):
+        model = DriverModel(ridge=0).fit(_wide())
+        raw = model.coef_ / model.scale_
+        assert dict(zip(model.feature_names, raw)) == pytest.approx(
+            {"gdp_growth_lag1": 20, "inflation_rate_lag1": -0.5})
+        assert model.r_squared == pytest.approx(1)
+        assert model.key_drivers()[0]["indicator"] == "gdp_growth"
+        assert {d["indicator"]: d["direction"] for d in model.key_drivers()}["inflation_rate"] == "negative"
+
+    def test_scenario_moves_forecast_by_coefficient(self):
+        wide = _wide()
+        model = DriverModel(ridge=0).fit(wide)
+        result = model.forecast(2, {"inflation_rate": wide["inflation_rate"].iloc[-1] + 10})
+        assert result["delta"] == pytest.approx([-5, -5], abs=0.01)
+        assert result["periods"] == ["2022-12-31", "2023-12-31"]
+        with pytest.raises(ValueError):
+            model.forecast(1, {"oil_price": 80})
+
+    def test_too_little_data(self):
+        with pytest.raises(ValueError):
+            DriverModel().fit(_wide(3))
+
+
+class TestDriverEndpoints:
+    def _seed(self, db_session, wide):
+        for period, row in wide.iterrows():
+            for name, value in row.dropna().items():
+                db_session.add(MacroeconomicIndicator(indicator_name=name, value=float(value), period=period.date()))
+        db_session.commit()
+
+    def test_drivers_and_scenario(self, client, db_session):
+        self._seed(db_session, _wide())
+        summary = client.get("/api/v1/analytics/fdi-drivers").json()
+        assert summary["observations"] == 11
+        assert [d["indicator"] for d in summary["key_drivers"]] == ["gdp_growth", "inflation_rate"]
+
+        forecast = client.get("/api/v1/analytics/fdi-forecast").json()
+        assert forecast["key_drivers"] == ["GDP Growth", "Inflation Rate"]
+
+        response = client.post("/api/v1/analytics/fdi-forecast/scenario",
+                               json={"drivers": {"inflation_rate": 30}, "horizon": 2})
+        assert response.status_code == 200 and len(response.json()["scenario"]) == 2
+        assert client.post("/api/v1/analytics/fdi-forecast/scenario",
+                           json={"drivers": {"oil_price": 80}}).status_code == 400
+        assert client.get("/api/v1/analytics/fdi-drivers", params={"target": "missing"}).status_code == 404
@@ -0,0 +1,59 @@
+"""Tests for the bounded compute executor."""
+import asyncio
+import threading
+
+import pytest
+
+from app.executor import ComputeExecutor, ComputeSaturatedError
+from app.monitoring import REGISTRY
+from app.services import compute_tasks
+
+
+class TestComputeExecutor:
+    def test_rejects_unknown_backend(self):
+        with pytest.raises(ValueError):
+            ComputeExecutor("gpu")
+
+    def test_process_pool_runs_monte_carlo(self):
+        executor = ComputeExecutor("process", workers=1)
+        try:
+            result = executor.submit(compute_tasks.monte_carlo_summary, 50_000_000, "MIN", 500).result(timeout=120)
+        finally:
+            executor.shutdown()
+        assert result["outcome_count"] == 500
+        assert result["statistics"]["mean"] > 0
+        assert executor.pending == 0
+
+    def test_async_run_returns_result(self):
+        executor = ComputeExecutor("thread", workers=2)
+        try:
+            result = asyncio.run(executor.run(sum, [1, 2, 3]))
+        finally:
+            executor.shutdown()
+        assert result == 6
+
+    def test_queue_limit_rejects_excess_work(self):
+        executor = ComputeExecutor("thread", workers=1, max_queue=1)
+        release = threading.Event()
+        try:
+            first = executor.submit(release.wait, task="blocker")
+            second = executor.submit(release.wait, task="blocker")
+            assert executor.running == 1
+            assert executor.queued == 1
+            with pytest.raises(ComputeSaturatedError):
+                executor.submit(release.wait, task="blocker")
+            release.set()
+            first.result(timeout=5)
+            second.result(timeout=5)
+        finally:
+            release.set()
+            executor.shutdown()
+        assert executor.pending == 0
+        assert REGISTRY.get("investiq_compute_tasks_total", task="blocker", status="rejected") >= 1
+
+    def test_task_errors_propagate(self):
+        executor = ComputeExecutor("inline")
+        future = executor.submit(compute_tasks.monte_carlo_summary, 1_000_000, "MIN", -1)
+        with pytest.raises(ValueError):
+            future.result()
+        assert executor.pending == 0
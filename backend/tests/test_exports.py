@@ -0,0 +1,82 @@
+"""Tests for streamed PDF/Excel exports."""
+import asyncio
+import io
+import os
+import zipfile
+
+from openpyxl import load_workbook
+
+from app.api.routes.impact import _file_response
+from app.models.investment import Investment
+from app.models.sector import Sector
+from app.services.impact_calculator import InvestmentImpactCalculator
+from app.services.report_generator import ReportGenerator, iter_file
+
+
+class TestReportGenerator:
+    def test_impact_workbook_has_detail_sheets(self):
+        report = InvestmentImpactCalculator(None).generate_comprehensive_report(
+            20_000_000, "ICT", "Harare", seed=1, num_simulations=200)
+        wb = load_workbook(io.BytesIO(ReportGenerator().generate_impact_excel(report)))
+        assert wb.sheetnames == ["Impact Report", "Monte Carlo", "Year by Year"]
+        assert wb["Year by Year"].max_row == 1 + len(report["gdp_contribution"]["year_by_year"])
+
+    def test_iter_file_streams(self, tmp_path):
+        path = tmp_path / "export.bin"
+        path.write_bytes(b"x" * 10)
+        assert list(iter_file(str(path), chunk_size=4)) == [b"xxxx", b"xxxx", b"xx"]
+
+    def test_file_response_removes_file_without_iterating(self, tmp_path):
+        path = tmp_path / "export.bin"
+        path.write_bytes(b"x" * 10)
+        response = _file_response(str(path), "application/octet-stream", "export.bin")
+        asyncio.run(response.background())
+        assert not os.path.exists(path)
+
+
+def _seed_portfolio(db_session, sector_data, investment_data, count=3):
+    sector = Sector(**sector_data)
+    db_session.add(sector)
+    db_session.flush()
+    for i in range(count):
+        db_session.add(Investment(**{**investment_data, "project_name": f"Project {i}",
+                                     "investment_amount_usd": 1e6 * (i + 1)}, sector_id=sector.id))
+    db_session.commit()
+
+
+class TestPortfolioExport:
+    def test_portfolio_workbook(self, client, db_session, sample_sector_data, sample_investment_data):
+        _seed_portfolio(db_session, sample_sector_data, sample_investment_data)
+        response = client.post("/api/v1/impact/export/portfolio/excel",
+                               json={"sector": "MIN", "num_simulations": 100, "seed": 5})
+        assert response.status_code == 200
+        wb = load_workbook(io.BytesIO(response.content))
+        assert wb.sheetnames == ["Portfolio", "Monte Carlo", "Year by Year"]
+        assert [row[0] for row in wb["Portfolio"].iter_rows(min_row=2, values_only=True)] == \
+            ["Project 2", "Project 1", "Project 0"]
+        assert wb["Year by Year"].max_row == 1 + 3 * 10
+
+    def test_portfolio_without_matches(self, client):
+        response = client.post("/api/v1/impact/export/portfolio/excel", json={"sector": "ICT"})
+        assert response.status_code == 404
+
+    def test_portfolio_pdf_zip(self, client, db_session, sample_sector_data, sample_investment_data):
+        _seed_portfolio(db_session, sample_sector_data, sample_investment_data)
+        response = client.post("/api/v1/impact/export/portfolio/pdf", json={"num_simulations": 100})
+        assert response.status_code == 200
+        with zipfile.ZipFile(io.BytesIO(response.content)) as zf:
+            names = zf.namelist()
+            assert len(names) == 3 and names[0].startswith("project-2-")
+            assert all(zf.read(name).startswith(b"%PDF") for name in names)
+
+    def test_portfolio_pdf_merged(self, client, db_session, sample_sector_data, sample_investment_data):
+        _seed_portfolio(db_session, sample_sector_data, sample_investment_data)
+        response = client.post("/api/v1/impact/export/portfolio/pdf",
+                               json={"num_simulations": 100, "bundle": "merged"})
+        assert response.status_code == 200
+        assert response.content.startswith(b"%PDF")
+        assert response.content.count(b"/Type /Page\n") >= 3
+
+    def test_portfolio_pdf_rejects_unknown_bundle(self, client):
+        response = client.post("/api/v1/impact/export/portfolio/pdf", json={"bundle": "tar"})
+        assert response.status_code == 400
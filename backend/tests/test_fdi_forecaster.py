@@ -0,0 +1,115 @@
+"""Tests for the FDI forecaster."""
+from datetime import date
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.ml.fdi_forecaster import FDIForecaster
+from app.ml.forecast_engines import holdout_errors
+from app.models.investment import Investment
+from app.models.sector import Sector
+from app.services.model_cache import fitted_models
+from app.services.predictive_analytics import PredictiveAnalyticsService
+
+
+class TestFDIForecaster:
+    def setup_method(self):
+        self.data = pd.DataFrame({"period": range(16), "value": np.linspace(100, 160, 16) + np.tile([5, -5, 3, -3], 4)})
+        self.model = FDIForecaster()
+        self.model.fit(self.data)
+
+    def test_predict_requires_fit(self):
+        with pytest.raises(RuntimeError):
+            FDIForecaster().predict()
+
+    def test_predictions_follow_trend_with_widening_bounds(self):
+        result = self.model.predict(12)
+        preds = result["predictions"]
+        assert [p["step"] for p in preds] == list(range(1, 13))
+        assert preds[-1]["value"] > preds[0]["value"]
+        widths = [p["upper_bound"] - p["lower_bound"] for p in preds]
+        assert widths == sorted(widths)
+        assert all(p["is_forecast"] for p in preds)
+        assert len(result["history"]) == 16 and not result["history"][0]["is_forecast"]
+
+    def test_columnar_matches_records(self):
+        records = self.model.predict(6)
+        columns = self.model.predict(6, columnar=True)
+        assert columns["predictions"]["value"] == [p["value"] for p in records["predictions"]]
+        assert columns["predictions"]["upper_bound"] == [p["upper_bound"] for p in records["predictions"]]
+        assert columns["history"]["value"] == [h["value"] for h in records["history"]]
+        assert columns["model_accuracy"] == records["model_accuracy"]
+
+    def test_single_point_series(self):
+        model = FDIForecaster()
+        model.fit(self.data.iloc[:1])
+        result = model.predict(3)
+        assert len(result["predictions"]) == 3 and result["model_accuracy"] is None
+
+    def test_accuracy_from_fitted_engine_holdout(self):
+        values = self.data["value"].to_numpy(dtype=float)
+        for engine in ("linear", "holt_winters"):
+            model = FDIForecaster(engine).fit(self.data)
+            error = holdout_errors(values, [engine])[engine]
+            assert model.predict(3)["model_accuracy"] == round((1 - error / values.mean()) * 100, 1)
+
+    def test_decompose_seasonal_repeats_per_period(self):
+        result = self.model.decompose_trend(self.data, period=4)
+        seasonal = np.array(result["seasonal"])
+        assert np.allclose(seasonal[:4], seasonal[4:8])
+        assert np.allclose(np.array(result["trend"]) + seasonal + np.array(result["residual"]), self.data["value"])
+
+
+class TestForecastService:
+    def test_sector_forecast_uses_investment_aggregates(self, db_session, sample_sector_data, sample_investment_data):
+        sector = Sector(**sample_sector_data)
+        db_session.add(sector)
+        db_session.flush()
+        for month, amount in [(1, 2e6), (5, 4e6), (11, 6e6)]:
+            db_session.add(Investment(**{**sample_investment_data, "investment_amount_usd": amount},
+                                      sector_id=sector.id, date_received=date(2023, month, 10)))
+        db_session.commit()
+
+        service = PredictiveAnalyticsService(db_session)
+        fitted_models.clear()
+        first = service.forecast_fdi_trends(sector.id, horizon_months=4)
+        assert first["source"] == "investments" and first["data_points"] == 4
+        assert [h["value"] for h in first["history"]] == [2.0, 4.0, 0.0, 6.0]
+        assert service.forecast_fdi_trends(sector.id, horizon_months=4) == first
+        assert len(fitted_models) == 1
+
+        db_session.add(Investment(**sample_investment_data, sector_id=sector.id, date_received=date(2024, 2, 1)))
+        db_session.commit()
+        assert service.forecast_fdi_trends(sector.id, horizon_months=4)["data_points"] == 5
+        assert len(fitted_models) == 2
+
+    def test_no_data_returns_empty_forecast(self, db_session):
+        result = PredictiveAnalyticsService(db_session).forecast_fdi_trends()
+        assert result["predictions"] == [] and result["data_points"] == 0
+
+    def test_sector_forecasts_endpoint(self, client, db_session, sample_sector_data, sample_investment_data):
+        sector = Sector(**sample_sector_data)
+        db_session.add(sector)
+        db_session.flush()
+        for year in range(2018, 2024):
+            db_session.add(Investment(**sample_investment_data, sector_id=sector.id, date_received=date(year, 3, 1)))
+        db_session.commit()
+
+        response = client.get("/api/v1/analytics/fdi-forecast/sectors",
+                              params={"horizon": 4, "confidence": 0.8, "model": "ets", "columnar": True})
+        assert response.status_code == 200
+        (forecast,) = response.json()
+        assert forecast["sector"] == "MIN" and forecast["model"] == "ets"
+        assert len(forecast["predictions"]["value"]) == 4
+        assert client.get("/api/v1/analytics/fdi-forecast", params={"model": "prophet"}).status_code == 400
+        assert client.get("/api/v1/analytics/fdi-forecast",
+                          params={"sector": "MIN", "indicator": "fdi_inflow"}).status_code == 400
+
+    def test_forecast_many_fits_missing_models_in_parallel(self, db_session):
+        fitted_models.clear()
+        frames = {label: (pd.DataFrame({"period": range(12), "value": np.arange(12.0) * slope + 50}), "test")
+                  for label, slope in (("a", 1.0), ("b", 2.0), ("c", 3.0))}
+        results = PredictiveAnalyticsService(db_session).forecast_many(frames, horizon_months=3, model="linear")
+        assert len(fitted_models) == 3
+        assert results["c"]["predictions"][0]["value"] == pytest.approx(50 + 3.0 * 12, abs=0.01)
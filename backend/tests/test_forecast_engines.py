@@ -0,0 +1,33 @@
+"""Tests for the pluggable forecasting engines."""
+import numpy as np
+import pytest
+
+from app.ml.forecast_engines import ENGINES, fit_engine, holdout_errors, interval_z
+
+
+SERIES = np.linspace(100, 170, 24) + np.tile([6.0, -4.0, 2.0, -4.0], 6)
+
+
+class TestForecastEngines:
+    def test_interval_z_matches_normal_quantiles(self):
+        assert interval_z(0.95) == pytest.approx(1.959964, abs=1e-6)
+        assert interval_z(0.80) == pytest.approx(1.281552, abs=1e-6)
+
+    @pytest.mark.parametrize("name", list(ENGINES))
+    def test_engines_forecast_with_nonnegative_std(self, name):
+        mean, std = ENGINES[name]().fit(SERIES).forecast(6)
+        assert mean.shape == std.shape == (6,)
+        assert np.all(np.isfinite(mean)) and np.all(std >= 0)
+        assert mean[-1] > SERIES[0]
+
+    def test_auto_picks_lowest_holdout_error(self):
+        errors = holdout_errors(SERIES)
+        assert set(errors) == set(ENGINES)
+        assert fit_engine(SERIES, "auto").name == min(errors, key=errors.get)
+
+    def test_short_series_fall_back_to_linear(self):
+        assert fit_engine(np.array([1.0, 2.0, 3.0]), "arima").name == "linear"
+
+    def test_unknown_engine(self):
+        with pytest.raises(ValueError):
+            fit_engine(SERIES, "prophet")
@@ -0,0 +1,86 @@
+"""Tests for the columnar indicator store and the macro-indicator endpoint."""
+from datetime import date
+
+import pytest
+
+from app.models.indicator import MacroeconomicIndicator
+from app.services.indicator_store import indicator_store
+
+ROWS = [
+    ("gdp_growth", 4.8, date(2022, 12, 31)), ("gdp_growth", 5.5, date(2023, 12, 31)),
+    ("inflation_rate", 9.0, date(2023, 1, 31)), ("inflation_rate", 12.0, date(2023, 2, 28)),
+    ("inflation_rate", 6.0, date(2023, 4, 30)), ("inflation_rate", 3.0, date(2024, 1, 31)),
+]
+
+
+@pytest.fixture
+def seeded(db_session):
+    for name, value, period in ROWS:
+        db_session.add(MacroeconomicIndicator(indicator_name=name, value=value, period=period, source="ZIMSTAT"))
+    db_session.commit()
+    return db_session
+
+
+class TestIndicatorStore:
+    def test_series_and_date_range(self, seeded):
+        df = indicator_store.series(seeded, ["inflation_rate"], start=date(2023, 2, 1), end=date(2023, 12, 31))
+        assert df["value"].tolist() == [12.0, 6.0]
+        assert str(df["period"].dtype).startswith("datetime64") and df["value"].dtype == float
+
+    def test_resample(self, seeded):
+        wide = indicator_store.wide(seeded, ["inflation_rate"], freq="QE", how="mean")
+        assert wide["inflation_rate"].dropna().tolist() == [10.5, 6.0, 3.0]
+        summed = indicator_store.wide(seeded, ["inflation_rate"], freq="QE", how="sum")["inflation_rate"]
+        assert summed.isna().sum() == 2  # empty quarters stay missing
+        with pytest.raises(ValueError):
+            indicator_store.wide(seeded, freq="W")
+
+    def test_snapshot_reused_until_data_changes(self, seeded):
+        snapshot = indicator_store.snapshot(seeded)
+        assert indicator_store.snapshot(seeded) is snapshot
+        seeded.add(MacroeconomicIndicator(indicator_name="gdp_growth", value=1.0, period=date(2024, 12, 31)))
+        seeded.commit()
+        reloaded = indicator_store.snapshot(seeded)
+        assert reloaded is not snapshot
+        assert reloaded.wide.loc["2024-12-31", "gdp_growth"] == 1.0
+
+    def test_invalidated_on_commit_not_flush(self, seeded):
+        snapshot = indicator_store.snapshot(seeded)
+        row = seeded.query(MacroeconomicIndicator).filter_by(indicator_name="gdp_growth").first()
+        row.value = 7.5
+        seeded.flush()
+        assert indicator_store._snapshot is snapshot
+        seeded.rollback()
+        assert indicator_store.snapshot(seeded) is snapshot
+        row.value = 7.5
+        seeded.commit()
+        assert 7.5 in indicator_store.snapshot(seeded).tall["value"].tolist()
+
+    def test_signature_sees_updates_from_other_processes(self, seeded):
+        snapshot = indicator_store.snapshot(seeded)
+        # A bulk UPDATE skips the flush events, as a write from another process would.
+        seeded.query(MacroeconomicIndicator).filter_by(indicator_name="gdp_growth").update(
+            {"value": 9.9}, synchronize_session=False)
+        seeded.commit()
+        assert indicator_store.snapshot(seeded) is not snapshot
+
+
+class TestMacroIndicatorEndpoint:
+    def test_records_filtered(self, client, seeded):
+        rows = client.get("/api/v1/analytics/macro-indicators",
+                          params={"indicator": "inflation_rate", "start": "2023-02-01"}).json()
+        assert [r["value"] for r in rows] == [12.0, 6.0, 3.0]
+        assert rows[0]["source"] == "ZIMSTAT" and rows[0]["unit"] is None
+
+    def test_wide_resampled(self, client, seeded):
+        body = client.get("/api/v1/analytics/macro-indicators",
+                          params={"freq": "YE", "format": "wide"}).json()
+        assert body["periods"] == ["2022-12-31", "2023-12-31", "2024-12-31"]
+        assert body["indicators"]["gdp_growth"] == [4.8, 5.5, None]
+        assert body["indicators"]["inflation_rate"] == [None, 6.0, 3.0]
+        assert client.get("/api/v1/analytics/macro-indicators", params={"freq": "D"}).status_code == 400
+
+    def test_trend_decomposition_range(self, client, seeded):
+        body = client.get("/api/v1/analytics/trend-decomposition",
+                          params={"indicator": "inflation_rate", "end": "2023-12-31"}).json()
+        assert body["dates"] == ["2023-01-31", "2023-02-28", "2023-04-30"]
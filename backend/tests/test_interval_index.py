@@ -0,0 +1,67 @@
+"""Tests for the interval tree and size-overlap filters."""
+import numpy as np
+import pytest
+
+from app.ml.interval_index import IntervalIndex
+from app.models.investor import InvestorProfile, InvestmentOpportunity
+from app.services.size_index import parse_size_range
+
+
+def _scan(lo, hi, q_lo, q_hi):
+    return np.flatnonzero((lo <= q_hi) & (hi >= q_lo)).tolist()
+
+
+class TestIntervalIndex:
+    def test_overlaps_match_scan(self):
+        rng = np.random.default_rng(1)
+        lo = rng.uniform(0, 100, 2000).round()
+        hi = lo + rng.uniform(0, 20, 2000).round()
+        hi[:10] = np.inf
+        index = IntervalIndex(lo, hi)
+        for q_lo, q_hi in [(10, 12), (0, 100), (99, 200), (-5, -1), (50, 50), (37, 37.5), (130, np.inf)]:
+            found = index.overlapping(q_lo, q_hi)
+            assert len(found) == len(set(found.tolist()))
+            assert sorted(found.tolist()) == _scan(lo, hi, q_lo, q_hi)
+
+    def test_stabbing_and_empty(self):
+        index = IntervalIndex(np.array([1.0, 5.0, 2.0]), np.array([3.0, 6.0, 2.0]))
+        assert sorted(index.stabbing(2.0).tolist()) == [0, 2]
+        assert index.overlapping(4, 3).tolist() == []
+        assert IntervalIndex(np.array([]), np.array([])).overlapping(0, 1).tolist() == []
+
+    def test_parse_size_range(self):
+        assert parse_size_range("1e6:5e6") == (1e6, 5e6)
+        assert parse_size_range(":2000") == (0.0, 2000.0)
+        assert parse_size_range("10:") == (10.0, np.inf)
+        for bad in ("100", "a:b", "5:1"):
+            with pytest.raises(ValueError):
+                parse_size_range(bad)
+
+
+class TestSizeOverlapRoutes:
+    def test_listing_and_matching_filters(self, client, db_session):
+        small = InvestmentOpportunity(title="Small", status="available", minimum_investment=1e5, maximum_investment=1e6)
+        large = InvestmentOpportunity(title="Large", status="available", minimum_investment=5e7)
+        fund = InvestorProfile(company_name="Fund", investment_range_min=2e5, investment_range_max=2e6)
+        whale = InvestorProfile(company_name="Whale", investment_range_min=1e8)
+        db_session.add_all([small, large, fund, whale])
+        db_session.commit()
+
+        titles = [o["title"] for o in client.get("/api/v1/matching/opportunities",
+                                                 params={"size_overlap": "6e7:"}).json()]
+        assert titles == ["Large"]
+        titles = {o["title"] for o in client.get("/api/v1/matching/opportunities",
+                                                 params={"size_overlap": "1e6:5e7"}).json()}
+        assert titles == {"Small", "Large"}  # endpoints inclusive, missing maximum open-ended
+        names = [i["company_name"] for i in client.get("/api/v1/matching/investors",
+                                                      params={"size_overlap": ":5e5"}).json()]
+        assert names == ["Fund"]
+        assert client.get("/api/v1/matching/opportunities", params={"size_overlap": "x"}).status_code == 400
+
+        for retrieval in ("exact", "ann"):
+            ranked = client.post(f"/api/v1/matching/investor-to-opportunities/{fund.id}",
+                                 params={"size_overlap": True, "retrieval": retrieval}).json()
+            assert [r["id"] for r in ranked] == [small.id]
+        investors = client.post(f"/api/v1/matching/opportunity-to-investors/{large.id}",
+                                params={"size_overlap": True}).json()
+        assert [r["id"] for r in investors] == [whale.id]
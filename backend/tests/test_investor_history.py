@@ -0,0 +1,77 @@
+"""Tests for the collaborative sector-affinity signal."""
+import numpy as np
+import pytest
+
+from app.ml.collaborative import SectorAffinity
+from app.ml.recommender import InvestmentRecommender
+from app.models.investment import Investment
+from app.models.investor import InvestorProfile, InvestmentOpportunity
+from app.models.sector import Sector
+from app.services.investor_history import investor_history
+
+INTERACTIONS = [("country:china", "min", 3), ("country:china", "enr", 2), ("country:uk", "fin", 2),
+                ("country:uk", "ict", 1), ("type:dfi", "enr", 1), ("type:dfi", "agr", 2)]
+
+
+def _affinity(interactions=INTERACTIONS):
+    model = SectorAffinity()
+    for group, sector, count in interactions:
+        model.add(group, sector, count)
+    return model
+
+
+class TestSectorAffinity:
+    def test_incremental_gram_matches_recount(self):
+        model = _affinity()
+        model.add("country:china", "min", -3)
+        model.add("country:uk", "min", 1)
+        expected = _affinity([("country:china", "enr", 2), ("country:uk", "fin", 2), ("country:uk", "ict", 1),
+                              ("type:dfi", "enr", 1), ("type:dfi", "agr", 2), ("country:uk", "min", 1)])
+        order = [expected._sectors[s] for s in model._sectors]
+        assert np.allclose(model.similarities(), expected.similarities()[np.ix_(order, order)])
+
+    def test_affinity_follows_co_investment(self):
+        model = _affinity()
+        own, _ = model.affinity(["country:china"], "min")
+        related, _ = model.affinity(["country:uk"], "enr")
+        assert own > 0.5 and related == 0.0
+        assert model.affinity(["country:peru"], "min") is None
+        combined, evidence = model.affinity(["country:china", "type:dfi"], "enr")
+        assert evidence == 8 and 0 < combined <= 1
+
+    def test_recommender_shrinks_towards_prior(self):
+        strong = InvestmentRecommender(history=lambda inv, opp: (1.0, 95.0))
+        weak = InvestmentRecommender(history=lambda inv, opp: (1.0, 0.0))
+        assert strong._history_score({}, {}) == 9.75
+        assert weak._history_score({}, {}) == InvestmentRecommender()._history_score({}, {}) == 5.0
+
+
+class TestInvestorHistoryIndex:
+    def test_sync_and_match_score(self, client, db_session):
+        mining = Sector(name="Mining", code="MIN")
+        energy = Sector(name="Energy", code="ENR")
+        db_session.add_all([mining, energy])
+        db_session.flush()
+        for i in range(6):
+            db_session.add(Investment(project_name=f"P{i}", sector_id=mining.id, investment_amount_usd=1e7,
+                                      investor_country="China", investor_name="Sino Mining"))
+        db_session.add(InvestorProfile(company_name="Sino Mining", country_of_origin="China",
+                                       investor_type="corporate"))
+        opp = InvestmentOpportunity(title="Lithium", sector_id=mining.id, status="available")
+        db_session.add(opp)
+        db_session.commit()
+
+        model = investor_history.sync(db_session)
+        assert model.affinity(["country:china"], "min") == pytest.approx((1.0, 6.0))
+        assert model.affinity(["type:corporate"], "min") == pytest.approx((1.0, 6.0))
+
+        investor = db_session.query(InvestorProfile).one()
+        pair = client.get(f"/api/v1/matching/match-score/{investor.id}/{opp.id}").json()
+        assert pair["breakdown"]["historical_similarity"] > 7.0
+
+        moved = db_session.query(Investment).filter(Investment.project_name == "P0").one()
+        moved.sector_id = energy.id
+        db_session.commit()
+        model = investor_history.sync(db_session)
+        assert model.affinity(["country:china"], "min")[1] == 6.0
+        assert model._counts["country:china"] == {"min": 5.0, "enr": 1.0}
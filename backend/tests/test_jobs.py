@@ -0,0 +1,84 @@
+"""Tests for the background job queue endpoints."""
+import time
+
+import pytest
+from sqlalchemy.exc import IntegrityError
+
+from app.models.job import Job
+
+
+def wait_for(client, job_id, timeout=30):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        status = client.get(f"/api/v1/jobs/{job_id}").json()
+        if status["status"] in ("succeeded", "failed"):
+            return status
+        time.sleep(0.05)
+    raise AssertionError(f"job {job_id} did not finish")
+
+
+class TestJobEndpoints:
+    def test_monte_carlo_job_lifecycle(self, client):
+        response = client.post("/api/v1/jobs/monte-carlo",
+                               json={"investment_amount": 50000000, "sector": "MIN", "num_simulations": 500})
+        assert response.status_code == 202
+        job = response.json()
+        assert job["status"] in ("queued", "running", "succeeded")
+        status = wait_for(client, job["job_id"])
+        assert status["status"] == "succeeded"
+        result = client.get(status["result_url"]).json()
+        assert result["outcome_count"] == 500
+
+    def test_identical_submissions_are_deduplicated(self, client):
+        payload = {"investment_amount": 20000000, "sector": "AGR", "province": "Manicaland", "seed": 7}
+        first = client.post("/api/v1/jobs/comprehensive-report", json=payload).json()
+        wait_for(client, first["job_id"])
+        second = client.post("/api/v1/jobs/comprehensive-report", json=payload).json()
+        assert second["job_id"] == first["job_id"]
+        assert second["deduplicated"] is True
+        other = client.post("/api/v1/jobs/comprehensive-report", json={**payload, "province": "Harare"}).json()
+        assert other["job_id"] != first["job_id"]
+
+    def test_unseeded_results_are_not_reused(self, client):
+        payload = {"investment_amount": 4000000, "sector": "MIN", "num_simulations": 200}
+        first = client.post("/api/v1/jobs/monte-carlo", json=payload).json()
+        wait_for(client, first["job_id"])
+        second = client.post("/api/v1/jobs/monte-carlo", json=payload).json()
+        assert second["job_id"] != first["job_id"] and second["deduplicated"] is False
+
+    def test_one_live_job_per_fingerprint(self, db_session):
+        db_session.add(Job(kind="monte_carlo", fingerprint="f" * 64, params={}, live=True))
+        db_session.commit()
+        db_session.add(Job(kind="monte_carlo", fingerprint="f" * 64, params={}, live=True))
+        with pytest.raises(IntegrityError):
+            db_session.commit()
+        db_session.rollback()
+        db_session.add_all([Job(kind="monte_carlo", fingerprint="f" * 64, params={}, live=None) for _ in range(2)])
+        db_session.commit()
+
+    def test_export_job_returns_file(self, client):
+        job = client.post("/api/v1/jobs/export/excel", json={"investment_amount": 5000000, "sector": "TOU"}).json()
+        wait_for(client, job["job_id"])
+        response = client.get(f"/api/v1/jobs/{job['job_id']}/result")
+        assert response.status_code == 200
+        assert "spreadsheetml" in response.headers["content-type"]
+        assert response.content[:2] == b"PK"
+
+    def test_failed_job_reports_error(self, client):
+        job = client.post("/api/v1/jobs/monte-carlo",
+                          json={"investment_amount": 1000000, "sector": "MIN", "num_simulations": -5}).json()
+        status = wait_for(client, job["job_id"])
+        assert status["status"] == "failed"
+        assert client.get(f"/api/v1/jobs/{job['job_id']}/result").status_code == 409
+
+    def test_event_stream_ends_with_terminal_status(self, client):
+        job = client.post("/api/v1/jobs/monte-carlo",
+                          json={"investment_amount": 3000000, "sector": "ICT", "num_simulations": 200}).json()
+        response = client.get(f"/api/v1/jobs/{job['job_id']}/events", params={"poll_interval": 0.1})
+        assert response.status_code == 200
+        events = [line for line in response.text.splitlines() if line.startswith("data: ")]
+        assert '"status": "succeeded"' in events[-1]
+        assert client.get(f"/api/v1/jobs/{job['job_id']}/events", params={"poll_interval": 0}).status_code == 422
+
+    def test_unknown_job(self, client):
+        assert client.get("/api/v1/jobs/does-not-exist").status_code == 404
@@ -0,0 +1,53 @@
+"""Tests for login rate limiting and the password-hashing pool."""
+import pytest
+
+from app.api.routes.auth import account_limiter, ip_limiter
+from app.executor import password_executor
+from app.monitoring import REGISTRY
+from app.services.rate_limit import TokenBucketLimiter
+
+
+@pytest.fixture(autouse=True)
+def _reset_limiters():
+    account_limiter.reset()
+    ip_limiter.reset()
+    yield
+    account_limiter.reset()
+    ip_limiter.reset()
+
+
+class TestTokenBucket:
+    def test_burst_then_refill(self, monkeypatch):
+        clock = [100.0]
+        monkeypatch.setattr("app.services.rate_limit.time.monotonic", lambda: clock[0])
+        limiter = TokenBucketLimiter("test", capacity=3, per_minute=6)
+        assert [limiter.acquire("a")[0] for _ in range(4)] == [True, True, True, False]
+        assert limiter.acquire("a")[1] == pytest.approx(10.0)
+        assert limiter.acquire("b")[0]
+        clock[0] += 10
+        assert limiter.acquire("a") == (True, 0.0)
+        assert not limiter.acquire("a")[0]
+
+
+class TestLoginLimits:
+    def test_account_limit_returns_429(self, client):
+        body = {"email": "target@zida.co.zw", "password": "guess"}
+        for _ in range(int(account_limiter.capacity)):
+            assert client.post("/api/v1/auth/login", json=body).status_code == 401
+        response = client.post("/api/v1/auth/login", json=body)
+        assert response.status_code == 429
+        assert int(response.headers["Retry-After"]) >= 1
+        other = client.post("/api/v1/auth/login", json={**body, "email": "other@zida.co.zw"})
+        assert other.status_code == 401
+        assert REGISTRY.get("investiq_rate_limited_total", limiter="login_account") >= 1
+
+    def test_ip_limit_spans_accounts(self, client):
+        for i in range(int(ip_limiter.capacity)):
+            client.post("/api/v1/auth/login", json={"email": f"u{i}@zida.co.zw", "password": "x"})
+        assert client.post("/api/v1/auth/login", json={"email": "new@zida.co.zw", "password": "x"}).status_code == 429
+
+    def test_password_pool_reports_queue_depth(self):
+        assert password_executor.submit(str.upper, "ok", task="verify").result(timeout=5) == "OK"
+        password_executor.collect(REGISTRY)
+        assert REGISTRY.get("investiq_password_hash_queued", backend="thread") == 0
+        assert REGISTRY.get("investiq_password_hash_tasks_total", task="verify", status="ok") >= 1
@@ -0,0 +1,117 @@
+"""Tests for request instrumentation and the metrics registry."""
+import time
+
+import pytest
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import sessionmaker
+
+from app.monitoring import MetricsRegistry, InstrumentationMiddleware, SLOW_PROFILES, install_sql_instrumentation
+
+
+class TestMetricsRegistry:
+    def setup_method(self):
+        self.registry = MetricsRegistry()
+        self.registry.describe("jobs_total", "counter", "Jobs processed.")
+        self.registry.describe("latency_seconds", "histogram", "Latency.", (0.1, 1.0))
+
+    def test_counter_accumulates_per_label_set(self):
+        self.registry.inc("jobs_total", kind="a")
+        self.registry.inc("jobs_total", 2, kind="a")
+        self.registry.inc("jobs_total", kind="b")
+        assert self.registry.get("jobs_total", kind="a") == 3
+        assert self.registry.get("jobs_total", kind="b") == 1
+
+    def test_histogram_renders_cumulative_buckets(self):
+        self.registry.observe("latency_seconds", 0.05)
+        self.registry.observe("latency_seconds", 0.5)
+        self.registry.observe("latency_seconds", 5.0)
+        output = self.registry.render()
+        assert 'latency_seconds_bucket{le="0.1"} 1' in output
+        assert 'latency_seconds_bucket{le="1"} 2' in output
+        assert 'latency_seconds_bucket{le="+Inf"} 3' in output
+        assert "latency_seconds_count 3" in output
+        assert "# TYPE latency_seconds histogram" in output
+
+    def test_label_values_are_escaped(self):
+        self.registry.inc("jobs_total", kind='say "hi"')
+        assert 'jobs_total{kind="say \\"hi\\""} 1' in self.registry.render()
+
+    def test_collectors_run_before_render(self):
+        self.registry.add_collector(lambda r: r.set("queue_depth", 7))
+        assert "queue_depth 7" in self.registry.render()
+
+
+class TestInstrumentationMiddleware:
+    @pytest.fixture
+    def instrumented(self):
+        engine = create_engine("sqlite://")
+        Session = sessionmaker(bind=engine)
+        registry = MetricsRegistry()
+        app = FastAPI()
+        app.add_middleware(InstrumentationMiddleware, registry=registry, profile_threshold_ms=20)
+
+        def get_session():
+            session = Session()
+            try:
+                yield session
+            finally:
+                session.close()
+
+        @app.get("/items/{item_id}")
+        def read_item(item_id: int, db=Depends(get_session)):
+            for _ in range(3):
+                db.execute(text("SELECT 1"))
+            return {"id": item_id}
+
+        @app.get("/slow")
+        def slow():
+            deadline = time.perf_counter() + 0.1
+            while time.perf_counter() < deadline:
+                sum(range(1000))
+            return {}
+
+        with TestClient(app) as client:
+            yield client, registry
+
+    def test_counts_sql_statements_per_route_template(self, instrumented):
+        client, registry = instrumented
+        client.get("/items/1")
+        client.get("/items/2")
+        assert registry.get("investiq_sql_statements_total", route="/items/{item_id}") == 6
+        assert registry.get("investiq_http_requests_total", method="GET", route="/items/{item_id}", status="200") == 2
+        assert registry.get("investiq_sql_duration_seconds_total", route="/items/{item_id}") > 0
+
+    def test_unmatched_routes_share_one_label(self, instrumented):
+        client, registry = instrumented
+        client.get("/nope/1")
+        client.get("/nope/2")
+        assert registry.get("investiq_http_requests_total", method="GET", route="unmatched", status="404") == 2
+
+    def test_slow_requests_are_profiled(self, instrumented):
+        client, registry = instrumented
+        SLOW_PROFILES.clear()
+        client.get("/slow")
+        assert registry.get("investiq_slow_request_profiles_total", route="/slow") == 1
+        profile = SLOW_PROFILES[-1]
+        assert profile["route"] == "/slow"
+        assert profile["samples"] > 0
+        assert any("slow" in s["stack"] for s in profile["stacks"])
+
+
+def test_failed_statements_leave_no_timing_state():
+    install_sql_instrumentation()
+    with create_engine("sqlite://").connect() as conn:
+        for _ in range(3):
+            with pytest.raises(OperationalError):
+                conn.execute(text("SELECT * FROM missing"))
+        conn.execute(text("SELECT 1"))
+        assert "investiq_query_start" not in conn.info
+
+
+def test_metrics_endpoint(client):
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
@@ -86,3 +86,10 @@ class TestMultiplierModel:
             assert 1.0 <= multipliers["employment"] <= 5.0, (
                 f"{sector} employment multiplier out of range"
             )
+
+    def test_precomputed_intermediates_match(self):
+        impact = self.model.calculate_total_impact(80_000_000, "energy")
+        jobs = self.model.calculate_job_creation(80_000_000, "energy", impact=impact)
+        assert jobs == self.model.calculate_job_creation(80_000_000, "energy")
+        assert self.model.calculate_tax_revenue(80_000_000, "energy", jobs=jobs) == \
+            self.model.calculate_tax_revenue(80_000_000, "energy")
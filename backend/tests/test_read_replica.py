@@ -0,0 +1,91 @@
+"""Tests for read-replica routing and read-your-writes stickiness."""
+import asyncio
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from app.database import (ReadRouter, ReadYourWritesMiddleware, STICKY_COOKIE, _read_primary, read_router,
+                          request_committed_write, syncs_from_primary)
+from app.models.sector import Sector
+from tests.conftest import TestingSessionLocal, async_engine
+
+
+def _router(tmp_path, replica_url=None):
+    return ReadRouter(TestingSessionLocal, async_sessionmaker(async_engine),
+                      replica_url or f"sqlite:///{tmp_path / 'replica.db'}", health_check_seconds=60)
+
+
+def _app(router):
+    app = FastAPI()
+    app.add_middleware(ReadYourWritesMiddleware, sticky_seconds=30)
+
+    @app.get("/which")
+    async def which():
+        factory = await router.async_session_factory()
+        return {"async": "replica" if factory is router.async_replica else "primary",
+                "sync": "replica" if router.session_factory() is router.replica else "primary"}
+
+    @app.post("/write")
+    def write():
+        with TestingSessionLocal() as db:
+            db.add(Sector(name="Written", code="WRT"))
+            db.commit()
+        return {"pinned": request_committed_write()}
+
+    @app.post("/compute")
+    def compute():
+        with TestingSessionLocal() as db:
+            db.query(Sector).count()
+            db.commit()
+        factory = router.session_factory()
+        return {"pinned": request_committed_write(), "sync": "replica" if factory is router.replica else "primary"}
+
+    return app
+
+
+class TestReadRouter:
+    def test_routes_to_replica_and_falls_back(self, tmp_path):
+        router = _router(tmp_path)
+        assert router.session_factory() is router.replica
+        token = _read_primary.set(True)
+        try:
+            assert router.session_factory() is router.primary
+        finally:
+            _read_primary.reset(token)
+        down = _router(tmp_path, f"sqlite:///{tmp_path / 'missing' / 'replica.db'}")
+        assert down.session_factory() is down.primary
+        assert asyncio.run(down.async_session_factory()) is down.async_primary
+
+    def test_without_replica_uses_primary(self):
+        router = ReadRouter(TestingSessionLocal, async_sessionmaker(async_engine))
+        assert router.session_factory() is TestingSessionLocal
+        assert asyncio.run(router.async_session_factory()) is router.async_primary
+
+    def test_reads_stick_to_primary_after_write(self, tmp_path, db_session):
+        client = TestClient(_app(_router(tmp_path)))
+        assert client.get("/which").json() == {"async": "replica", "sync": "replica"}
+        response = client.post("/compute")
+        assert response.json() == {"pinned": False, "sync": "replica"}
+        assert STICKY_COOKIE not in response.cookies
+        response = client.post("/write")
+        assert response.json() == {"pinned": True}
+        assert STICKY_COOKIE in response.cookies
+        assert client.get("/which").json() == {"async": "primary", "sync": "primary"}
+        fresh = TestClient(_app(_router(tmp_path)))
+        assert fresh.get("/which", headers={"X-Read-Primary": "1"}).json()["sync"] == "primary"
+        assert fresh.get("/which", cookies={STICKY_COOKIE: "1"}).json()["sync"] == "replica"
+
+    def test_caches_sync_from_primary(self, tmp_path, monkeypatch):
+        router = _router(tmp_path)
+        monkeypatch.setattr(read_router, "replica_engine", router.replica_engine)
+        monkeypatch.setattr(read_router, "primary", TestingSessionLocal)
+
+        class Cache:
+            @syncs_from_primary
+            def sync(self, db):
+                return db.get_bind()
+
+        with router.replica() as replica_session, TestingSessionLocal() as primary_session:
+            assert Cache().sync(replica_session) is TestingSessionLocal.kw["bind"]
+            assert Cache().sync(primary_session) is TestingSessionLocal.kw["bind"]
@@ -0,0 +1,105 @@
+"""Tests for orjson responses, response compression and the columnar similarity network."""
+import gzip
+from datetime import date
+from decimal import Decimal
+
+import numpy as np
+import orjson
+import pandas as pd
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import StreamingResponse
+from fastapi.testclient import TestClient
+
+from app.models.investor import InvestmentOpportunity
+from app.models.sector import Sector
+from app.responses import CompressionMiddleware, FastJSONResponse, accepted_encodings, dumps
+
+PAYLOAD = {"values": list(range(2000))}
+
+
+def _app():
+    app = FastAPI(default_response_class=FastJSONResponse)
+    app.add_middleware(CompressionMiddleware, minimum_size=1024)
+
+    @app.get("/large")
+    def large():
+        return FastJSONResponse(PAYLOAD)
+
+    @app.get("/small")
+    def small():
+        return {"ok": True}
+
+    @app.get("/pdf")
+    def pdf():
+        return StreamingResponse(iter([b"%PDF" * 1000]), media_type="application/pdf")
+
+    @app.get("/stream")
+    def stream():
+        return StreamingResponse(iter([b"a" * 2000, b"b" * 2000]), media_type="text/plain")
+
+    return app
+
+
+def _raw(client, path, encoding):
+    with client.stream("GET", path, headers={"Accept-Encoding": encoding}) as response:
+        return response, b"".join(response.iter_raw())
+
+
+class TestSerialization:
+    def test_numpy_dates_and_nan(self):
+        content = {"array": np.array([1.5, np.nan]), "count": np.int64(3), "day": date(2024, 1, 31),
+                   "stamp": pd.Timestamp("2024-02-29"), "amount": Decimal("2.5"), "tags": np.array(["a"], dtype=object)}
+        assert orjson.loads(dumps(content)) == {"array": [1.5, None], "count": 3, "day": "2024-01-31",
+                                                "stamp": "2024-02-29T00:00:00", "amount": 2.5, "tags": ["a"]}
+
+    def test_accepted_encodings(self):
+        assert accepted_encodings("gzip, br;q=0") == {"gzip"}
+        assert accepted_encodings("BR;q=0.5, identity") == {"br", "identity"}
+
+
+class TestCompression:
+    def test_gzip_above_threshold_only(self):
+        client = TestClient(_app())
+        response, body = _raw(client, "/large", "gzip")
+        assert response.headers["content-encoding"] == "gzip"
+        assert "Accept-Encoding" in response.headers["vary"]
+        assert orjson.loads(gzip.decompress(body)) == PAYLOAD
+        assert int(response.headers["content-length"]) == len(body)
+        response, body = _raw(client, "/small", "gzip")
+        assert "content-encoding" not in response.headers and orjson.loads(body) == {"ok": True}
+        assert "content-encoding" not in _raw(client, "/large", "identity")[0].headers
+
+    def test_streams_and_skips_compressed_media(self):
+        client = TestClient(_app())
+        response, body = _raw(client, "/stream", "gzip")
+        assert response.headers["content-encoding"] == "gzip"
+        assert gzip.decompress(body) == b"a" * 2000 + b"b" * 2000
+        response, body = _raw(client, "/pdf", "gzip")
+        assert "content-encoding" not in response.headers and body == b"%PDF" * 1000
+
+    def test_brotli_preferred_when_available(self):
+        brotli = pytest.importorskip("brotli")
+        response, body = _raw(TestClient(_app()), "/large", "gzip, br")
+        assert response.headers["content-encoding"] == "br"
+        assert orjson.loads(brotli.decompress(body)) == PAYLOAD
+
+
+class TestSimilarityNetwork:
+    def test_columnar_matches_records(self, client, db_session):
+        mining = Sector(name="Mining", code="MIN")
+        db_session.add(mining)
+        db_session.flush()
+        db_session.add_all([InvestmentOpportunity(title=f"O{i}", sector_id=mining.id, status="available",
+                                                  maximum_investment=1e7 * (i + 1)) for i in range(3)])
+        db_session.commit()
+
+        records = client.get("/api/v1/matching/similarity-network").json()
+        columnar = client.get("/api/v1/matching/similarity-network", params={"columnar": True}).json()
+        nodes = columnar["nodes"]
+        assert [dict(zip(nodes, values)) for values in zip(*nodes.values())] == records["nodes"]
+        assert len(columnar["edges"]["source"]) == len(records["edges"]) == 3
+        assert [{"source": nodes["id"][s], "target": nodes["id"][t], "weight": w} for s, t, w in
+                zip(*columnar["edges"].values())] == records["edges"]
+        assert records["clusters"] == columnar["clusters"] == [
+            {"id": records["nodes"][0]["cluster"], "name": f"Cluster {records['nodes'][0]['cluster']}", "count": 3}]
@@ -0,0 +1,103 @@
+"""Tests for the content-addressed result cache."""
+import time
+
+from app.models.investment import SpecialEconomicZone
+from app.services.impact_calculator import InvestmentImpactCalculator
+from app.services.result_cache import ResultCache, cache_key, result_cache
+
+
+class TestResultCache:
+    def test_key_ignores_parameter_order(self):
+        assert cache_key("ns", {"a": 1, "b": 2}) == cache_key("ns", {"b": 2, "a": 1})
+        assert cache_key("ns", {"a": 1}) != cache_key("other", {"a": 1})
+
+    def test_get_or_compute_memoizes(self):
+        cache = ResultCache()
+        calls = []
+        compute = lambda: calls.append(1) or {"value": len(calls)}
+        assert cache.get_or_compute("ns", {"x": 1}, compute) == {"value": 1}
+        assert cache.get_or_compute("ns", {"x": 1}, compute) == {"value": 1}
+        assert len(calls) == 1
+
+    def test_hits_are_independent_copies(self):
+        cache = ResultCache()
+        first = cache.get_or_compute("ns", {"x": 1}, lambda: {"items": [1]})
+        first["items"].append(2)
+        assert cache.get_or_compute("ns", {"x": 1}, lambda: None) == {"items": [1]}
+
+    def test_lru_and_ttl_eviction(self):
+        cache = ResultCache(max_entries=2)
+        for i in range(3):
+            cache.set(cache_key("ns", {"i": i}), i)
+        assert len(cache) == 2
+        assert cache.get(cache_key("ns", {"i": 0})) == (False, None)
+
+        expiring = ResultCache(ttl_seconds=0.01)
+        expiring.set("k", 1)
+        time.sleep(0.02)
+        assert expiring.get("k") == (False, None)
+
+    def test_uncacheable_and_disabled_always_compute(self):
+        calls = []
+        for cache, cacheable in ((ResultCache(), False), (ResultCache(enabled=False), True)):
+            cache.get_or_compute("ns", {}, lambda: calls.append(1), cacheable=cacheable)
+            cache.get_or_compute("ns", {}, lambda: calls.append(1), cacheable=cacheable)
+        assert len(calls) == 4
+
+    def test_tag_invalidation(self):
+        cache = ResultCache()
+        cache.set("a", 1, tags=["sez:1"])
+        cache.set("b", 2, tags=["sez:2"])
+        cache.invalidate_tag("sez:1")
+        assert cache.get("a") == (False, None)
+        assert cache.get("b") == (True, 2)
+
+    def test_sqlite_store_is_shared(self, tmp_path):
+        path = str(tmp_path / "results.db")
+        ResultCache(sqlite_path=path).set("k", {"v": 1}, tags=["sez:9"])
+        other = ResultCache(sqlite_path=path)
+        assert other.get("k") == (True, {"v": 1})
+        other.invalidate_tag("sez:9")
+        assert ResultCache(sqlite_path=path).get("k") == (False, None)
+
+
+class TestCalculatorCaching:
+    def test_seeded_monte_carlo_is_reproducible_and_cached(self):
+        calc = InvestmentImpactCalculator(None)
+        first = calc.monte_carlo_statistics(10_000_000, "MIN", 500, seed=7)
+        assert calc.monte_carlo_statistics(10_000_000, "MIN", 500, seed=7) == first
+        assert result_cache.get(cache_key("monte_carlo", {
+            "amount": 10_000_000.0, "sector": "mining", "num_simulations": 500, "scenario": "base", "seed": 7,
+        }))[0]
+
+    def test_job_creation_echoes_requested_province(self):
+        calc = InvestmentImpactCalculator(None)
+        harare = calc.calculate_job_creation(5_000_000, "AGR", "Harare")
+        bulawayo = calc.calculate_job_creation(5_000_000, "AGR", "Bulawayo")
+        assert harare["province"] == "Harare" and bulawayo["province"] == "Bulawayo"
+        assert harare["total_jobs"] == bulawayo["total_jobs"]
+
+    def test_parallel_report_matches_serial(self):
+        result_cache.clear()
+        calc = InvestmentImpactCalculator(None)
+        serial = calc.generate_comprehensive_report(30_000_000, "ENR", "Matabeleland North", seed=3, parallel=False)
+        result_cache.clear()
+        parallel = calc.generate_comprehensive_report(30_000_000, "ENR", "Matabeleland North", seed=3, parallel=True)
+        assert parallel == serial
+
+    def test_sez_update_invalidates_cached_incentives(self, db_session):
+        sez = SpecialEconomicZone(name="Test SEZ", location_province="Harare",
+                                  incentive_package={"tax_holiday_years": 5})
+        db_session.add(sez)
+        db_session.commit()
+        calc = InvestmentImpactCalculator(db_session)
+        calc.calculate_sez_incentive_impact(20_000_000, sez.id, "manufacturing")
+        key = cache_key("sez_incentive", {"amount": 20_000_000.0, "sector": "manufacturing", "years": 10, "sez_id": sez.id,
+                                          "sez": calc.get_sez_snapshot(sez.id)})
+        assert result_cache.get(key)[0]
+
+        sez.incentive_package = {"tax_holiday_years": 10}
+        db_session.commit()
+        assert result_cache.get(key) == (False, None)
+        after = calc.calculate_sez_incentive_impact(20_000_000, sez.id, "manufacturing")
+        assert after["incentive_package"] == {"tax_holiday_years": 10}
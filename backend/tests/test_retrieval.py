@@ -0,0 +1,60 @@
+"""Tests for two-stage opportunity retrieval."""
+import numpy as np
+
+from app.ml.recommender import InvestmentRecommender
+from app.ml.retrieval import CandidateIndex
+from app.models.investor import InvestorProfile, InvestmentOpportunity
+
+SECTORS = ["min", "agr", "enr", "ict", "fin", "tou"]
+PROVINCES = ["Harare", "Midlands", "Manicaland", "Bulawayo"]
+
+
+def _catalog(n=2000, seed=0):
+    rng = np.random.default_rng(seed)
+    lo = rng.uniform(1e5, 5e7, n)
+    return [{
+        "id": str(i), "title": f"Opp {i}", "description": "", "sector_code": SECTORS[rng.integers(6)],
+        "province": PROVINCES[rng.integers(4)], "minimum_investment": lo[i], "maximum_investment": lo[i] * 4,
+        "expected_return_rate": 0, "risk_level": ["low", "medium", "high", None][rng.integers(4)],
+        "sez_id": "sez" if rng.random() < 0.2 else None, "jv_available": False, "tags": [],
+    } for i in range(n)]
+
+
+INVESTOR = {
+    "id": "inv", "sectors_of_interest": ["MIN"], "investment_range_min": 2e7, "investment_range_max": 6e7,
+    "risk_appetite": "high", "geographic_preferences": ["Midlands"], "sez_interest": True,
+    "previous_zimbabwe_investments": False, "inquiry_text": "",
+}
+
+
+class TestRetrieval:
+    def test_proxy_reproduces_partial_scores(self):
+        records = _catalog(300)
+        index = CandidateIndex(records)
+        recommender = InvestmentRecommender()
+        proxy = index.features @ index.query_vector(INVESTOR) + index.size_scores(INVESTOR, np.arange(300))
+        exact = [sum(getattr(recommender, f)(INVESTOR, r) for f in
+                     ("_sector_score", "_size_score", "_risk_score", "_geo_score", "_sez_score")) for r in records]
+        offsets = np.array(exact) - proxy
+        assert np.allclose(offsets, offsets[0])
+
+    def test_candidates_contain_exact_top_n(self):
+        records = _catalog()
+        recommender = InvestmentRecommender()
+        exact = recommender.rank_opportunities(INVESTOR, records)[:10]
+        candidates = CandidateIndex(records).candidates(INVESTOR, 100)
+        assert len(candidates) == 100
+        approx = recommender.rank_opportunities(INVESTOR, candidates)[:10]
+        assert [r["overall_score"] for r in approx] == [r["overall_score"] for r in exact]
+
+    def test_ann_route(self, client, db_session):
+        investor = InvestorProfile(company_name="Fund", investment_range_min=1e6, investment_range_max=5e6)
+        db_session.add(investor)
+        db_session.add_all([InvestmentOpportunity(title=f"O{i}", status="available", minimum_investment=1e6 * i,
+                                                  maximum_investment=2e6 * i) for i in range(1, 6)])
+        db_session.commit()
+        url = f"/api/v1/matching/investor-to-opportunities/{investor.id}"
+        exact = client.post(url, params={"retrieval": "exact"}).json()
+        ann = client.post(url, params={"retrieval": "ann", "top_n": 3}).json()
+        assert [r["id"] for r in ann] == [r["id"] for r in exact[:3]]
+        assert client.post(url, params={"retrieval": "fuzzy"}).status_code == 400
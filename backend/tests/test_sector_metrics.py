@@ -0,0 +1,96 @@
+"""Tests for the vectorized sector risk-return metrics."""
+from datetime import date
+
+import numpy as np
+import pytest
+from sqlalchemy import event
+
+from app.ml.risk_scorer import RiskScorer, downside_deviation, rolling_sharpe
+from app.models.investment import Investment
+from app.models.sector import Sector
+from app.services.predictive_analytics import PredictiveAnalyticsService
+from tests.conftest import engine
+
+
+class TestSectorMetrics:
+    def test_columnar_matches_records(self):
+        scorer = RiskScorer()
+        returns, risks = np.array([0.18, 0.12, 0.05]), np.array([65.0, 40.0, 0.0])
+        columns = scorer.sector_metrics(returns, risks)
+        records = scorer.calculate_sector_metrics(
+            [{"avg_return_rate": r, "risk_score": k} for r, k in zip(returns, risks)])
+        assert [r["sharpe_ratio"] for r in records] == columns["sharpe_ratio"].tolist()
+        assert columns["volatility"].tolist() == [0.195, 0.12, 0.0]
+        # Zero volatility: no downside when the return beats the risk-free rate, a sure shortfall otherwise.
+        assert columns["downside_deviation"][2] == pytest.approx(0.03)
+
+    def test_downside_deviation_matches_simulation(self):
+        sample = np.random.default_rng(0).normal(0.1, 0.2, 1_000_000)
+        expected = np.sqrt(np.mean(np.minimum(sample - 0.08, 0) ** 2))
+        assert downside_deviation(np.array([0.1]), np.array([0.2]), 0.08)[0] == pytest.approx(expected, rel=0.01)
+
+    def test_rolling_sharpe_matches_loop(self):
+        history = np.random.default_rng(1).normal(0.05, 0.1, size=(10, 3))
+        result = rolling_sharpe(history, 4, 0.08)
+        rf = 1.08 ** 0.25 - 1
+        window = history[3:7, 1] - rf
+        assert result.shape == (7, 3)
+        assert result[3, 1] == pytest.approx(window.mean() / window.std(ddof=1) * 2)
+        assert rolling_sharpe(history[:3], 4, 0.08).shape == (0, 3)
+
+
+class TestSectorMetricEndpoints:
+    def _seed(self, db_session):
+        for code, ret, risk, province in (("MIN", 0.18, 65.0, "Midlands"), ("AGR", 0.12, 40.0, "Manicaland")):
+            sector = Sector(name=code, code=code, avg_return_rate=ret, risk_score=risk)
+            db_session.add(sector)
+            db_session.flush()
+            for quarter in range(6):
+                db_session.add(Investment(project_name=f"{code}-{quarter}", sector_id=sector.id, province=province,
+                                          investment_amount_usd=1e6 * (quarter + 1),
+                                          date_received=date(2023 + quarter // 4, quarter % 4 * 3 + 1, 1)))
+        db_session.commit()
+
+    def test_sector_and_province_profiles(self, client, db_session):
+        self._seed(db_session)
+        columns = client.get("/api/v1/analytics/sector-risk-return", params={"columnar": True}).json()
+        assert columns["sector_code"] == ["AGR", "MIN"] and columns["investment_count"] == [6, 6]
+        assert len(columns["rolling_sharpe"]) == 2 and len(columns["rolling_sharpe"][0]) == 2
+
+        records = client.get("/api/v1/analytics/sector-risk-return").json()
+        assert records[1]["sortino_ratio"] == columns["sortino_ratio"][1]
+
+        provinces = client.get("/api/v1/analytics/sector-risk-return", params={"group": "province"}).json()
+        assert {p["province"]: p["avg_return"] for p in provinces} == {"Manicaland": 0.12, "Midlands": 0.18}
+
+        summary = client.get("/api/v1/analytics/dashboard-summary").json()
+        assert summary["sector_risk_return"]["sector_code"] == ["AGR", "MIN"]
+
+    def test_dashboard_top_investors_in_one_query(self, db_session):
+        self._seed(db_session)
+        service = PredictiveAnalyticsService(db_session)
+        statements = []
+
+        def listener(conn, cursor, statement, *args):
+            statements.append(statement)
+
+        event.listen(engine, "before_cursor_execute", listener)
+        try:
+            summary = service.get_dashboard_summary()
+        finally:
+            event.remove(engine, "before_cursor_execute", listener)
+        assert sorted(i["sector"] for i in summary["top_investors"]) == ["AGR"] * 5 + ["MIN"] * 5
+        assert not any("WHERE sectors.id =" in s for s in statements)  # no sector lookup per investor
+
+    def test_return_series_cached_until_investments_change(self, db_session, monkeypatch):
+        self._seed(db_session)
+        service = PredictiveAnalyticsService(db_session)
+        loads = []
+        load = service._load_sector_return_series
+        monkeypatch.setattr(service, "_load_sector_return_series", lambda: loads.append(1) or load())
+        first = service.compute_sector_risk_return()
+        assert service.compute_sector_risk_return() == first and len(loads) == 1
+        investment = db_session.query(Investment).filter(Investment.project_name == "MIN-5").one()
+        investment.investment_amount_usd = 9e6
+        db_session.commit()
+        assert service.compute_sector_risk_return() != first and len(loads) == 2
@@ -0,0 +1,62 @@
+"""Tests for the TF-IDF opportunity index and semantic match scores."""
+from app.ml.text_index import TextIndex
+from app.models.investor import InvestorProfile, InvestmentOpportunity
+from app.services.semantic_index import opportunity_index
+
+DOCS = {
+    "solar": "Utility scale solar photovoltaic plant with battery storage",
+    "lithium": "Lithium mine expansion and spodumene concentrate processing",
+    "tobacco": "Tobacco curing and agro-processing for export markets",
+}
+
+
+class TestTextIndex:
+    def test_ranks_relevant_document_highest(self):
+        index = TextIndex()
+        index.upsert(DOCS)
+        scores = index.scores("Investor seeking solar energy and battery storage projects")
+        assert max(scores, key=scores.get) == "solar"
+        assert scores["tobacco"] == 0.0
+
+    def test_incremental_updates_keep_document_frequencies(self):
+        index = TextIndex()
+        index.upsert(DOCS)
+        index.upsert({"solar": "Lithium refinery"})
+        index.remove(["tobacco"])
+        fresh = TextIndex()
+        fresh.upsert({"solar": "Lithium refinery", "lithium": DOCS["lithium"]})
+        assert len(index) == 2
+        assert (index._df == fresh._df).all()
+        assert index.scores("lithium") == fresh.scores("lithium")
+        assert index.similarity_to("missing", ["lithium"]).tolist() == [0.0]
+
+
+class TestSemanticMatching:
+    def _seed(self, db_session):
+        solar = InvestmentOpportunity(title="Hwange Solar Park", description=DOCS["solar"], status="available",
+                                      tags=["greenfield"])
+        farm = InvestmentOpportunity(title="Tobacco Processing Hub", description=DOCS["tobacco"], status="available")
+        investor = InvestorProfile(company_name="SunCap", inquiry_text="We fund solar photovoltaic and storage")
+        db_session.add_all([solar, farm, investor])
+        db_session.commit()
+        return solar, farm, investor
+
+    def test_sync_tracks_changes(self, db_session):
+        solar, farm, _ = self._seed(db_session)
+        assert set(opportunity_index.scores(db_session, "solar")) == {solar.id, farm.id}
+        farm.description = "Solar irrigation for tobacco farms"
+        db_session.commit()
+        assert opportunity_index.scores(db_session, "solar")[farm.id] > 0
+        db_session.delete(solar)
+        db_session.commit()
+        assert set(opportunity_index.scores(db_session, "solar")) == {farm.id}
+
+    def test_match_scores_use_inquiry_similarity(self, client, db_session):
+        solar, farm, investor = self._seed(db_session)
+        ranked = client.post(f"/api/v1/matching/investor-to-opportunities/{investor.id}").json()
+        semantic = {r["id"]: r["score_breakdown"]["semantic_match"] for r in ranked}
+        assert semantic[solar.id] > 5.0 > semantic[farm.id] == 0.0
+        pair = client.get(f"/api/v1/matching/match-score/{investor.id}/{solar.id}").json()
+        assert pair["breakdown"]["semantic_match"] == semantic[solar.id]
+        investors = client.post(f"/api/v1/matching/opportunity-to-investors/{solar.id}").json()
+        assert investors[0]["score_breakdown"]["semantic_match"] == semantic[solar.id]
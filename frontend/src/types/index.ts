@@ -17,7 +17,7 @@ export interface SEZ {
 }
 export interface MacroIndicator { id: string; indicator_name: string; value: number; period: string; source: string; unit: string; }
 export interface ForecastPoint { date: string; value: number; lower_bound?: number; upper_bound?: number; is_forecast: boolean; }
-export interface SectorRiskReturn { sector_name: string; sector_code: string; avg_return: number; volatility: number; sharpe_ratio: number; beta: number; total_investment: number; investment_count: number; }
+export interface SectorRiskReturn { sector_name: string; sector_code: string; avg_return: number; volatility: number; sharpe_ratio: number; beta: number; downside_deviation: number; sortino_ratio: number; total_investment: number; investment_count: number; rolling_sharpe?: number[]; }
 export interface AllocationItem { sector: string; sector_code: string; amount: number; percentage: number; expected_return: number; }
 export interface DashboardSummary { total_fdi_ytd: number; active_investments: number; total_jobs: number; pending_inquiries: number; sector_breakdown: Array<{name: string; value: number; count: number}>; monthly_trend: Array<{month: string; value: number}>; top_investors: Array<{name: string; country: string; amount: number; sector: string}>; province_distribution: Array<{province: string; value: number; count: number}>; }
 export interface JobCreationResult { direct_jobs: number; indirect_jobs: number; induced_jobs: number; total_jobs: number; skills_distribution: Record<string, number>; gender_split: {male: number; female: number}; construction_phase: number; operational_phase: number; }